@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+import _paths  # pylint: disable=unused-import # noqa: F401
+
+# pylint: disable=wrong-import-order
+from classes.generated.definitions import Target
+from classes.generated.windfile import WindFile
+
+
+class BatchItem(BaseModel):
+    """
+    A windfile and the targets it is generated for, the id is returned with the results.
+    """
+
+    id: Optional[str] = None
+    windfile: WindFile
+    targets: List[Target]
+
+
+class BatchPayload(BaseModel):
+    items: List[BatchItem]
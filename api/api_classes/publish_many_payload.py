@@ -0,0 +1,24 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+import _paths  # pylint: disable=unused-import # noqa: F401
+
+# pylint: disable=wrong-import-order
+from classes.generated.windfile import WindFile
+
+
+class PublishManyItem(BaseModel):
+    """
+    A windfile to publish, the id is returned with its result.
+    """
+
+    id: str
+    windfile: WindFile
+
+
+class PublishManyPayload(BaseModel):
+    items: List[PublishManyItem]
+    url: Optional[str] = None
+    username: Optional[str] = None
+    token: Optional[str] = None
@@ -0,0 +1,158 @@
+import asyncio
+import collections
+import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Deque, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS, HTTP_504_GATEWAY_TIMEOUT
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """
+    Runs blocking work on a thread pool, so it does not block the event loop. At most max_workers
+    calls run at the same time and at most max_queue calls wait for a free worker, further calls are
+    rejected with 429. A call that takes longer than timeout seconds is answered with 504, the worker
+    finishes the call in the background and stays occupied until then.
+    """
+
+    max_workers: int
+    max_queue: int
+    timeout: Optional[float]
+    pending: int
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: Optional[float]):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.pending = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aeolus-api")
+
+    def release(self, _: Future) -> None:
+        """
+        Frees the slot of a finished call.
+        :param _: finished call
+        """
+        with self._lock:
+            self.pending -= 1
+
+    def try_reserve(self) -> bool:
+        """
+        Reserves a slot for one call if there is room for it right now.
+        :return: True if a slot was reserved
+        """
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                return False
+            self.pending += 1
+            return True
+
+    def start(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """
+        Starts the given call in a reserved slot, the slot is freed when the call finishes.
+        :param func: blocking function to call
+        :param args: positional arguments of the function
+        :param kwargs: keyword arguments of the function
+        :return: Future of the call
+        """
+        try:
+            future: Future[T] = self._pool.submit(functools.partial(func, *args, **kwargs))
+        except RuntimeError:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self.release)
+        return future
+
+    def submit(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """
+        Submits the given call to the pool if there is room for it.
+        :param func: blocking function to call
+        :param args: positional arguments of the function
+        :param kwargs: keyword arguments of the function
+        :return: Future of the call
+        """
+        if not self.try_reserve():
+            raise HTTPException(
+                status_code=HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, try again later",
+                headers={"Retry-After": "1"},
+            )
+        return self.start(func, *args, **kwargs)
+
+    def run_all(
+        self, func: Callable[..., T], arguments: List[Tuple[Any, ...]]
+    ) -> AsyncIterator[Tuple[int, T | HTTPException]]:
+        """
+        Runs one call per entry of arguments, at most max_workers of them at the same time, so batches of any
+        size are accepted without taking over the queue. The next call is submitted as soon as one of the calls
+        finished and the pool has room, calls that exceed the timeout are yielded as 504. The first call is
+        submitted right away, so the batch is rejected with 429 if the pool is full right now.
+        :param func: blocking function to call
+        :param arguments: positional arguments of every call
+        :return: index of the arguments and result of the call, in the order the calls finish
+        """
+        waiting: Deque[Tuple[int, Tuple[Any, ...]]] = collections.deque(enumerate(arguments))
+        first: Optional[Future[T]] = self.submit(func, *waiting.popleft()[1]) if waiting else None
+
+        async def results() -> AsyncIterator[Tuple[int, T | HTTPException]]:
+            running: dict[asyncio.Future, int] = {}
+            if first is not None:
+                running[asyncio.ensure_future(self.result(first))] = 0
+            while waiting or running:
+                while waiting and len(running) < self.max_workers and self.try_reserve():
+                    index, args = waiting.popleft()
+                    running[asyncio.ensure_future(self.result(self.start(func, *args)))] = index
+                if not running:
+                    # other requests occupy the whole pool, wait until they free a slot
+                    await asyncio.sleep(0.05)
+                    continue
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = running.pop(task)
+                    try:
+                        yield index, task.result()
+                    except HTTPException as exc:
+                        yield index, exc
+
+        return results()
+
+    async def result(self, future: "Future[T]") -> T:
+        """
+        Waits for the result of the given call, at most timeout seconds.
+        :param future: Future of the call
+        :return: result of the call
+        """
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError as exc:
+            raise HTTPException(status_code=HTTP_504_GATEWAY_TIMEOUT, detail="Generation timed out") from exc
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs the given blocking function on the pool and waits for its result.
+        :param func: blocking function to call
+        :param args: positional arguments of the function
+        :param kwargs: keyword arguments of the function
+        :return: result of the function
+        """
+        return await self.result(self.submit(func, *args, **kwargs))
+
+
+def executor_from_environment() -> BoundedExecutor:
+    """
+    Creates the executor of the api. It is configured with AEOLUS_API_WORKERS,
+    AEOLUS_API_QUEUE_SIZE and AEOLUS_API_TIMEOUT (in seconds, 0 disables the timeout).
+    :return: executor
+    """
+    timeout: float = float(os.getenv("AEOLUS_API_TIMEOUT", "120"))
+    return BoundedExecutor(
+        max_workers=int(os.getenv("AEOLUS_API_WORKERS", str(min(32, (os.cpu_count() or 1) + 4)))),
+        max_queue=int(os.getenv("AEOLUS_API_QUEUE_SIZE", "64")),
+        timeout=timeout if timeout > 0 else None,
+    )
@@ -1,24 +1,32 @@
+import atexit
+import copy
+import functools
 import json
 import os
+import shutil
+import tempfile
 import time
 import warnings
-from typing import Optional, Dict, Any
+from typing import Annotated, Optional, Dict, Any, AsyncIterator, List, Tuple
 
 import yaml
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
-from starlette.responses import PlainTextResponse
+from starlette.responses import PlainTextResponse, StreamingResponse
 from starlette.status import HTTP_401_UNAUTHORIZED
 
 import _paths  # pylint: disable=unused-import # noqa: F401
+from api_classes.batch_payload import BatchItem, BatchPayload
+from api_classes.publish_many_payload import PublishManyPayload
 from api_classes.publish_payload import PublishPayload
 from api_classes.result_format import ResultFormat
 from api_classes.translate_payload import TranslatePayload
 from api_utils import utils
+from api_utils.executor import BoundedExecutor, executor_from_environment
 
 # pylint: disable=wrong-import-order
-from api_utils.utils import dump_yaml
+from classes.bulk_publisher import FAILED, BulkPublisher, PublishResult, summary
 from classes.ci_credentials import CICredentials
 from classes.generated.definitions import Target
 from classes.generated.windfile import WindFile
@@ -26,17 +34,20 @@ from classes.input_settings import InputSettings
 from classes.merger import Merger
 from classes.output_settings import OutputSettings
 from classes.pass_metadata import PassMetadata
+from classes.translation_field import TranslationField
 from classes.translator import BambooTranslator
 from classes.validator import Validator
 from classes.yaml_dumper import YamlDumper
 from cli_utils import logger
-from cli_utils.utils import TemporaryFileWithContent
-from generators.bamboo import BambooGenerator
+from generators.bamboo import BambooGenerator, generation_metrics
 from generators.cli import CliGenerator
 from generators.jenkins import JenkinsGenerator
 
 app = FastAPI()
 
+# blocking work like merging and generating runs here, so it does not block the event loop
+executor: BoundedExecutor = executor_from_environment()
+
 origins = ["http://localhost", "http://localhost:3000", "http://localhost:9000"]
 
 app.add_middleware(
@@ -114,6 +125,49 @@ async def healthz() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics() -> dict[str, dict[str, dict[str, float]]]:
+    """
+    Metrics endpoint, returns how often and how long the Bamboo YAML Spec files
+    were generated through the generator api, docker or java.
+    :return: metrics per generation path
+    """
+    return {"bamboo_generation": generation_metrics.snapshot()}
+
+
+@functools.lru_cache(maxsize=None)
+def api_base_directory() -> str:
+    """
+    Returns the directory relative file actions of the windfiles are resolved against. It is set with
+    AEOLUS_API_BASE_DIRECTORY, otherwise an empty temporary directory is used, so windfiles sent to the
+    api can not read files of the server.
+    :return: path of the directory
+    """
+    configured: Optional[str] = os.getenv("AEOLUS_API_BASE_DIRECTORY")
+    if configured:
+        return configured
+    directory: str = tempfile.mkdtemp(prefix="aeolus-api-")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return directory
+
+
+def in_memory_input_settings(windfile: WindFile, target: Optional[Target] = None) -> InputSettings:
+    """
+    Creates the input settings for a windfile that was already validated by the api, so it does not
+    need to be written to disk and read again. Relative file actions are resolved against the base
+    directory of the api.
+    :param windfile: validated windfile
+    :param target: Target to generate for
+    :return: input settings of the windfile
+    """
+    return InputSettings(
+        file_path="windfile.yaml",
+        target=target,
+        windfile=windfile,
+        base_directory=api_base_directory(),
+    )
+
+
 @app.post("/validate")
 async def validate(windfile: WindFile) -> WindFile | dict[str, str] | None:
     """
@@ -148,11 +202,10 @@ async def validate(windfile: WindFile) -> WindFile | dict[str, str] | None:
       ]
     }
     """
-    with TemporaryFileWithContent(content=dump_yaml(content=windfile)) as file:
-        input_settings: InputSettings = InputSettings(file=file, file_path=file.name)
-        output_settings: OutputSettings = OutputSettings(verbose=True, debug=True, emoji=True)
-        validator: Validator = Validator(output_settings=output_settings, input_settings=input_settings)
-        return validator.validate_wind_file()
+    input_settings: InputSettings = in_memory_input_settings(windfile=windfile)
+    output_settings: OutputSettings = OutputSettings(verbose=True, debug=True, emoji=True)
+    validator: Validator = Validator(output_settings=output_settings, input_settings=input_settings)
+    return validator.validate_wind_file()
 
 
 @app.post("/generate/{target}/yaml")
@@ -166,6 +219,16 @@ async def generate_from_yaml(request: Request, target: Target) -> Optional[Dict[
     :return: Generated script
     """
     raw_body = await request.body()
+    return await executor.run(generate_from_yaml_body, raw_body=raw_body, target=target)
+
+
+def generate_from_yaml_body(raw_body: bytes, target: Target) -> Optional[Dict[str, str | None]]:
+    """
+    Parses the given yaml windfile and generates it for the given target.
+    :param raw_body: yaml windfile
+    :param target: Target to generate for
+    :return: Generated script
+    """
     try:
         data: WindFile = WindFile(**yaml.safe_load(raw_body))
         return generate_target_script(windfile=data, target=target)
@@ -173,6 +236,68 @@ async def generate_from_yaml(request: Request, target: Target) -> Optional[Dict[
         raise HTTPException(status_code=422, detail="Invalid YAML") from exc
 
 
+def merge_windfile(
+    windfile: WindFile, input_settings: InputSettings, output_settings: OutputSettings
+) -> Optional[Tuple[WindFile, PassMetadata]]:
+    """
+    Merges the given windfile, the merged windfile can be generated for every target.
+    :param windfile: Windfile to merge
+    :param input_settings: Input settings of the windfile
+    :param output_settings: Output settings
+    :return: Merged windfile and its metadata or None if the windfile could not be merged
+    """
+    metadata: PassMetadata = PassMetadata()
+    merger: Merger = Merger(
+        windfile=windfile, input_settings=input_settings, output_settings=output_settings, metadata=metadata
+    )
+    start: float = time.time()
+    merged: Optional[WindFile] = merger.merge()
+    end: float = time.time()
+    logger.info("⏰", f"Merged windfile in {end - start}", output_settings.emoji)
+    if not merged:
+        return None
+    return merged, merger.metadata
+
+
+def render_target(
+    windfile: WindFile, metadata: PassMetadata, target: Target, output_settings: OutputSettings
+) -> Dict[str, str | None]:
+    """
+    Generates the given merged windfile for the given target.
+    :param windfile: Merged windfile, it is modified during the generation
+    :param metadata: Metadata of the merged windfile
+    :param target: Target to generate for
+    :param output_settings: Output settings
+    :return: Generated script and key or the error
+    """
+    input_settings: InputSettings = in_memory_input_settings(windfile=windfile, target=target)
+    generator: Optional[CliGenerator | JenkinsGenerator | BambooGenerator] = None
+    if target == Target.cli:
+        generator = CliGenerator(
+            input_settings=input_settings,
+            output_settings=output_settings,
+            windfile=windfile,
+            metadata=metadata,
+        )
+    if target == Target.bamboo:
+        generator = BambooGenerator(
+            input_settings=input_settings,
+            output_settings=output_settings,
+            windfile=windfile,
+            metadata=metadata,
+        )
+    if target == Target.jenkins:
+        generator = JenkinsGenerator(
+            input_settings=input_settings,
+            output_settings=output_settings,
+            windfile=windfile,
+            metadata=metadata,
+        )
+    if generator:
+        return {"result": generator.generate(), "key": generator.key}
+    return {"detail": "Unknown target"}
+
+
 def generate_target_script(
     windfile: WindFile, target: Target, credentials: Optional[CICredentials] = None
 ) -> Optional[Dict[str, str | None]]:
@@ -183,45 +308,78 @@ def generate_target_script(
     :param target: Target to generate for
     :return:
     """
-    with TemporaryFileWithContent(content=dump_yaml(content=windfile)) as file:
-        input_settings: InputSettings = InputSettings(file=file, file_path=file.name, target=target)
-        output_settings: OutputSettings = OutputSettings(verbose=True, debug=True, emoji=True)
-        output_settings.ci_credentials = credentials
-        metadata: PassMetadata = PassMetadata()
-        merger: Merger = Merger(
-            windfile=windfile, input_settings=input_settings, output_settings=output_settings, metadata=metadata
+    input_settings: InputSettings = in_memory_input_settings(windfile=windfile, target=target)
+    output_settings: OutputSettings = OutputSettings(verbose=True, debug=True, emoji=True)
+    output_settings.ci_credentials = credentials
+    merged: Optional[Tuple[WindFile, PassMetadata]] = merge_windfile(
+        windfile=windfile, input_settings=input_settings, output_settings=output_settings
+    )
+    if merged is None:
+        return None
+    return render_target(windfile=merged[0], metadata=merged[1], target=target, output_settings=output_settings)
+
+
+def generate_batch_item(index: int, item: BatchItem) -> Dict[str, Any]:
+    """
+    Merges the windfile of the given batch item once and generates it for all requested targets.
+    Every target works on its own copy of the merged windfile, as the generators modify it.
+    :param index: Position of the item in the batch
+    :param item: Batch item to generate
+    :return: Results per target, or the error if the windfile could not be merged
+    """
+    result: Dict[str, Any] = {"index": index, "id": item.id, "results": {}}
+    output_settings: OutputSettings = OutputSettings(verbose=False, debug=True, emoji=True)
+    try:
+        merged: Optional[Tuple[WindFile, PassMetadata]] = merge_windfile(
+            windfile=item.windfile,
+            input_settings=in_memory_input_settings(windfile=item.windfile),
+            output_settings=output_settings,
         )
-        start: float = time.time()
-        merged: Optional[WindFile] = merger.merge()
-        end: float = time.time()
-        logger.info("⏰", f"Merged windfile in {end - start}", output_settings.emoji)
-        if not merged:
-            return None
-        generator: Optional[CliGenerator | JenkinsGenerator | BambooGenerator] = None
-        if target == Target.cli:
-            generator = CliGenerator(
-                input_settings=input_settings,
-                output_settings=output_settings,
-                windfile=merged,
-                metadata=merger.metadata,
-            )
-        if target == Target.bamboo:
-            generator = BambooGenerator(
-                input_settings=input_settings,
-                output_settings=output_settings,
-                windfile=merged,
-                metadata=merger.metadata,
-            )
-        if target == Target.jenkins:
-            generator = JenkinsGenerator(
-                input_settings=input_settings,
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.error("🚨", f"Failed to merge batch item {index}: {exc}", output_settings.emoji)
+        result["detail"] = str(exc)
+        return result
+    if merged is None:
+        result["detail"] = "merging failed, check api logs"
+        return result
+    for target in dict.fromkeys(item.targets):
+        try:
+            result["results"][target.value] = render_target(
+                windfile=merged[0].model_copy(deep=True),
+                metadata=copy.deepcopy(merged[1]),
+                target=target,
                 output_settings=output_settings,
-                windfile=merged,
-                metadata=merger.metadata,
             )
-        if generator:
-            return {"result": generator.generate(), "key": generator.key}
-        return {"detail": "Unknown target"}
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("🚨", f"Failed to generate batch item {index} for {target.value}: {exc}", output_settings.emoji)
+            result["results"][target.value] = {"detail": str(exc)}
+    return result
+
+
+@app.post("/generate/batch")
+async def generate_batch(payload: BatchPayload) -> StreamingResponse:
+    """
+    Generates many windfiles for many targets in one request. The items are generated in parallel on the
+    worker pool of the api, at most AEOLUS_API_WORKERS at a time, so batches of any size are accepted.
+    The batch is only rejected with 429 if the pool and its queue are full when it arrives.
+    Every finished item is streamed as one line of json, so the lines are not in the order of the items.
+    A line looks like this
+    {"index": 0, "id": "item-id", "results": {"cli": {"result": "...", "key": null}}}
+    An item that is not done within AEOLUS_API_TIMEOUT seconds only has a detail instead of results.
+    :param payload: Items with a windfile and the targets to generate it for
+    :return: Stream of newline delimited json results
+    """
+    results: AsyncIterator[Tuple[int, Dict[str, Any] | HTTPException]] = executor.run_all(
+        generate_batch_item, list(enumerate(payload.items))
+    )
+
+    async def stream() -> AsyncIterator[str]:
+        async for index, result in results:
+            if isinstance(result, HTTPException):
+                result = {"index": index, "id": payload.items[index].id, "detail": result.detail}
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 @app.post("/generate/{target}")
@@ -232,17 +390,15 @@ async def generate(windfile: WindFile, target: Target) -> Optional[Dict[str, str
     :param target: Target to generate for
     :return:
     """
-    return generate_target_script(windfile=windfile, target=target)
+    return await executor.run(generate_target_script, windfile=windfile, target=target)
 
 
-@app.post("/publish/{target}")
-def publish(payload: PublishPayload, target: Target) -> Dict[str, Optional[str]]:
+def fill_server_credentials(payload: PublishPayload | PublishManyPayload, target: Target) -> None:
     """
-    Publishes the given windfile for the given target using the provided credentials.
-    :param payload: Payload with credentials and windfile
+    If the api needs authentication, missing credentials are taken from the environment of the api.
+    :param payload: Payload with the credentials of the request
     :param target: Target to publish for
     """
-    windfile: Optional[WindFile] = None
     if needs_auth():
         if target == Target.cli:
             raise HTTPException(status_code=422, detail="CLI does not support publishing")
@@ -254,6 +410,65 @@ def publish(payload: PublishPayload, target: Target) -> Dict[str, Optional[str]]
             payload.url = payload.url or os.getenv("JENKINS_URL")
             payload.username = payload.username or os.getenv("JENKINS_USERNAME")
             payload.token = payload.token or os.getenv("JENKINS_TOKEN")
+
+
+@app.post("/publish-many/{target}")
+async def publish_many(payload: PublishManyPayload, target: Target) -> StreamingResponse:
+    """
+    Publishes many windfiles for the given target. The windfiles are published in parallel on the worker pool
+    of the api, at most AEOLUS_API_WORKERS at a time, so requests of any size are accepted. A request is only
+    rejected with 429 if the pool and its queue are full when it arrives. At most AEOLUS_PUBLISH_RATE windfiles
+    per second are published to one server.
+    Every finished windfile is streamed as one line of json, the last line is the summary, e.g.
+    {"summary": {"published": 10, "unchanged": 490, "submitted": 0, "failed": 0, "duration": 42.1}}
+    :param payload: Payload with credentials and windfiles
+    :param target: Target to publish for
+    :return: Stream of newline delimited json results
+    """
+    fill_server_credentials(payload=payload, target=target)
+    if target == Target.cli:
+        raise HTTPException(status_code=422, detail="CLI does not support publishing")
+    if not payload.url or not payload.token:
+        raise HTTPException(status_code=422, detail="missing credentials")
+    publisher: BulkPublisher = BulkPublisher(
+        target=target,
+        credentials=CICredentials(url=payload.url, username=payload.username, token=payload.token),
+        workers=executor.max_workers,
+        rate=float(os.getenv("AEOLUS_PUBLISH_RATE", "0")),
+        emoji=True,
+    )
+    started: float = time.monotonic()
+    results: AsyncIterator[Tuple[int, PublishResult | HTTPException]] = executor.run_all(
+        publisher.publish_one,
+        [(item.id, in_memory_input_settings(windfile=item.windfile, target=target)) for item in payload.items],
+    )
+
+    async def stream() -> AsyncIterator[str]:
+        finished: List[PublishResult] = []
+        async for index, result in results:
+            if isinstance(result, HTTPException):
+                result = PublishResult(
+                    name=payload.items[index].id,
+                    status=FAILED,
+                    duration=time.monotonic() - started,
+                    detail=result.detail,
+                )
+            finished.append(result)
+            yield json.dumps(result.to_dict()) + "\n"
+        yield json.dumps({"summary": summary(results=finished, duration=time.monotonic() - started)}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/publish/{target}")
+def publish(payload: PublishPayload, target: Target) -> Dict[str, Optional[str]]:
+    """
+    Publishes the given windfile for the given target using the provided credentials.
+    :param payload: Payload with credentials and windfile
+    :param target: Target to publish for
+    """
+    windfile: Optional[WindFile] = None
+    fill_server_credentials(payload=payload, target=target)
     try:
         windfile = WindFile(**yaml.safe_load(payload.windfile))
     except yaml.YAMLError:
@@ -278,12 +493,13 @@ def publish(payload: PublishPayload, target: Target) -> Dict[str, Optional[str]]
 
 
 @app.put("/translate/{source}/{build_plan_id}")
-def translate(
+def translate(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     payload: TranslatePayload,
     source: Target,
     build_plan_id: str,
     result_format: ResultFormat = ResultFormat.JSON,
     exclude_repositories: bool = False,
+    fields: Annotated[Optional[List[TranslationField]], Query()] = None,
 ) -> Optional[WindFile | str]:
     """
     Translates the build plan id to a target.
@@ -292,6 +508,7 @@ def translate(
     :param build_plan_id: Build plan id to translate
     :param result_format: Format to return the windfile in
     :param exclude_repositories: Whether to exclude the repositories from the windfile or not
+    :param fields: Parts of the windfile to translate, e.g. only the metadata of a large plan, all if not given
     :return: Windfile with the translated target
     """
     if needs_auth():
@@ -308,7 +525,9 @@ def translate(
         input_settings=input_settings, output_settings=output_settings, credentials=ci_credentials
     )
     try:
-        windfile: Optional[WindFile] = translator.translate(plan_key=build_plan_id)
+        windfile: Optional[WindFile] = translator.translate(
+            plan_key=build_plan_id, fields=set(fields) if fields else None
+        )
         if exclude_repositories and windfile:
             windfile.repositories = None
         if result_format == ResultFormat.JSON:
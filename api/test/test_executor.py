@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+import typing
+import unittest
+
+from fastapi import HTTPException
+
+from api_utils.executor import BoundedExecutor
+
+
+class BoundedExecutorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executor: BoundedExecutor = BoundedExecutor(max_workers=2, max_queue=1, timeout=5)
+        self.running: int = 0
+        self.most_running: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    def work(self, value: int) -> int:
+        with self.lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        return value * 2
+
+    def collect(
+        self, arguments: typing.List[typing.Tuple[typing.Any, ...]], func: typing.Optional[typing.Callable] = None
+    ) -> dict[int, typing.Any]:
+        async def run() -> dict[int, typing.Any]:
+            return {index: result async for index, result in self.executor.run_all(func or self.work, arguments)}
+
+        return asyncio.run(run())
+
+    def test_runs_batches_larger_than_the_pool_and_its_queue(self) -> None:
+        results: dict[int, typing.Any] = self.collect([(value,) for value in range(20)])
+        self.assertEqual(results, {value: value * 2 for value in range(20)})
+        self.assertLessEqual(self.most_running, 2)
+        self.assertEqual(self.executor.pending, 0)
+
+    def test_rejects_batches_while_the_pool_is_full(self) -> None:
+        release: threading.Event = threading.Event()
+        for _ in range(3):
+            self.executor.submit(release.wait)
+        with self.assertRaises(HTTPException) as context:
+            self.collect([(1,)])
+        self.assertEqual(context.exception.status_code, 429)
+        release.set()
+
+    def test_reports_timed_out_calls(self) -> None:
+        self.executor.timeout = 0.05
+        results: dict[int, typing.Any] = self.collect([(0.5,)], func=time.sleep)
+        self.assertIsInstance(results[0], HTTPException)
+        self.assertEqual(results[0].status_code, 504)
+
+
+if __name__ == "__main__":
+    unittest.main()
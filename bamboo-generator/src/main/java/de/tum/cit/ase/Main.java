@@ -38,6 +38,7 @@ public class Main {
 
     private static final String FILE_INPUT_ARGUMENT = "--file";
     private static final String API_ARGUMENT = "--api";
+    private static final String WORKER_ARGUMENT = "--worker";
     private static final String STDIN_ARGUMENT = "--stdin";
     private static final String JSON_ARGUMENT = "--json";
     private static final String BASE64_ARGUMENT = "--base64";
@@ -84,6 +85,9 @@ public class Main {
         if (Arrays.asList(args).contains(GET_YAML_ARGUMENT)) {
             return Mode.FETCH_YAML;
         }
+        if (Arrays.asList(args).contains(WORKER_ARGUMENT)) {
+            return Mode.WORKER;
+        }
         return Mode.GENERATION;
     }
 
@@ -95,7 +99,7 @@ public class Main {
      */
     private static WindFile getInput(String[] args) {
         if (args.length < 1) {
-            System.err.println("Usage: java -jar bamboo-generator.jar " + API_ARGUMENT + "|" + FILE_INPUT_ARGUMENT + "|" + STDIN_ARGUMENT + "|" + JSON_ARGUMENT + "|" + BASE64_ARGUMENT + "|" + GET_YAML_ARGUMENT + " [path|json|base64|buildplankey]" + "--publish --server <bamboo-server-url> --token <bamboo-token>");
+            System.err.println("Usage: java -jar bamboo-generator.jar " + API_ARGUMENT + "|" + WORKER_ARGUMENT + "|" + FILE_INPUT_ARGUMENT + "|" + STDIN_ARGUMENT + "|" + JSON_ARGUMENT + "|" + BASE64_ARGUMENT + "|" + GET_YAML_ARGUMENT + " [path|json|base64|buildplankey]" + "--publish --server <bamboo-server-url> --token <bamboo-token>");
             System.exit(1);
         }
         String source = args[0];
@@ -204,6 +208,7 @@ public class Main {
             }
             case FETCH_YAML -> getYAML(args);
             case API -> SpringApplication.run(Main.class, args);
+            case WORKER -> Worker.start();
         }
     }
 }
@@ -3,5 +3,6 @@ package de.tum.cit.ase;
 public enum Mode {
     GENERATION,
     FETCH_YAML,
-    API
+    API,
+    WORKER
 }
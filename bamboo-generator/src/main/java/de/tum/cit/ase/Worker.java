@@ -0,0 +1,88 @@
+package de.tum.cit.ase;
+
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.node.ObjectNode;
+import de.tum.cit.ase.classes.WindFile;
+import de.tum.cit.ase.generator.Generator;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+
+/**
+ * Long-running worker mode of the bamboo-generator, started with --worker. The worker reads one json request per
+ * line from stdin and answers every request with one json line on stdout, so the python cli can keep a warm JVM
+ * instead of starting a new one for every windfile. A request looks like
+ * {"id": "1", "windfile": "json of the windfile", "url": "bamboo url", "token": "bamboo token"}, url and token are
+ * only needed to publish the plan. The answer is either {"id": "1", "result": "yaml specs", "key": "plan key"} or
+ * {"id": "1", "error": "message"}. Everything else, including the logs of the generation, is printed to stderr.
+ */
+public class Worker {
+
+    private final ObjectMapper mapper = new ObjectMapper();
+    private final InputStream input;
+    private final PrintStream protocol;
+
+    public Worker(InputStream input, PrintStream protocol) {
+        this.input = input;
+        this.protocol = protocol;
+    }
+
+    /**
+     * Generates (and publishes) the windfile of the given request.
+     *
+     * @param line the request
+     * @return the answer to the request
+     */
+    private ObjectNode handle(String line) {
+        ObjectNode answer = mapper.createObjectNode();
+        try {
+            JsonNode request = mapper.readTree(line);
+            answer.set("id", request.get("id"));
+            WindFile windFile = WindFile.fromJson(request.path("windfile").asText());
+            String url = request.path("url").asText(null);
+            String token = request.path("token").asText(null);
+            boolean publish = url != null && token != null;
+            Generator generator = new Generator(publish, url, token);
+            generator.generateBuildPlan(windFile);
+            generator.publish();
+            answer.put("result", generator.getResult());
+            answer.put("key", generator.getKey());
+        } catch (Exception e) {
+            e.printStackTrace();
+            answer.put("error", e.getClass().getSimpleName() + ": " + e.getMessage());
+        }
+        return answer;
+    }
+
+    /**
+     * Answers requests until the input is closed.
+     */
+    public void run() {
+        try (BufferedReader reader = new BufferedReader(new InputStreamReader(input, StandardCharsets.UTF_8))) {
+            String line;
+            while ((line = reader.readLine()) != null) {
+                if (line.isBlank()) {
+                    continue;
+                }
+                protocol.println(handle(line).toString());
+                protocol.flush();
+            }
+        } catch (IOException e) {
+            e.printStackTrace();
+            System.exit(2);
+        }
+    }
+
+    public static void start() {
+        // stdout is reserved for the answers, the generation logs to System.out, so we redirect it to stderr
+        PrintStream protocol = new PrintStream(System.out, true, StandardCharsets.UTF_8);
+        System.setOut(System.err);
+        System.err.println("✅ bamboo-generator worker ready");
+        new Worker(System.in, protocol).run();
+    }
+}
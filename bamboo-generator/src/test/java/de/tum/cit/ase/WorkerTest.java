@@ -0,0 +1,49 @@
+package de.tum.cit.ase;
+
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.node.ObjectNode;
+import org.junit.jupiter.api.Test;
+
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class WorkerTest {
+
+    private static final String WINDFILE = """
+            {"api": "v0.0.1",
+             "metadata": {"name": "example", "id": "EXAMPLE-PLAN", "description": "example", "author": "aeolus"},
+             "actions": [{"name": "hello", "script": "echo hello"}]}
+            """;
+
+    private final ObjectMapper mapper = new ObjectMapper();
+
+    @Test
+    void answersEveryRequestWithOneLine() throws IOException {
+        ObjectNode request = mapper.createObjectNode();
+        request.put("id", "1");
+        request.put("windfile", WINDFILE);
+        String input = request + "\n\n" + "{\"id\": \"2\", \"windfile\": \"not a windfile\"}\n";
+        ByteArrayOutputStream output = new ByteArrayOutputStream();
+
+        new Worker(new ByteArrayInputStream(input.getBytes(StandardCharsets.UTF_8)),
+                new PrintStream(output, true, StandardCharsets.UTF_8)).run();
+
+        String[] lines = output.toString(StandardCharsets.UTF_8).strip().split("\n");
+        assertEquals(2, lines.length);
+        JsonNode generated = mapper.readTree(lines[0]);
+        assertEquals("1", generated.path("id").asText());
+        assertFalse(generated.has("error"), generated.toString());
+        assertTrue(generated.path("result").asText().contains("echo hello"));
+        JsonNode failed = mapper.readTree(lines[1]);
+        assertEquals("2", failed.path("id").asText());
+        assertTrue(failed.has("error"));
+    }
+}
@@ -0,0 +1,85 @@
+"""
+Throughput benchmark for the conversion of task conditions into lifecycles. Compares the previous conversion
+(pattern compiled and every fragment looked up for every condition) with the cached parser, for the conditions
+alone and for extract_action over all tasks of the recorded specs in test/bamboo_definitions.py scaled to 500 jobs.
+Run from the cli directory: python -m benchmarks.bamboo_conditions
+"""
+import re
+import timeit
+import typing
+from unittest import mock
+
+from benchmarks.bamboo_specs import specs_with_jobs
+from classes import translator
+from classes.bamboo_client import parse_plan_code
+from classes.bamboo_specs import BambooJob, BambooSpecs, BambooTask
+from classes.generated.definitions import Lifecycle, Target
+from classes.generated.environment import EnvironmentSchema
+from classes.output_settings import OutputSettings
+from cli_utils import utils
+
+JOBS: int = 500
+
+
+def parse_lifecycles_before(condition: str) -> typing.Tuple[Lifecycle, ...]:
+    """
+    Conversion as it was done inline in extract_action before.
+    :param condition: value of the condition
+    :return: lifecycles the condition matches
+    """
+    regex = re.compile(r"[^a-zA-Z |_]")
+    return tuple(Lifecycle[entry] for entry in regex.sub("", condition).split("|"))
+
+
+def measure(function: typing.Callable[[], typing.Any], count: int, number: int = 5) -> float:
+    """
+    Returns the best throughput of the given function.
+    :param function: function that processes count items
+    :param count: number of items processed per call
+    :param number: number of calls per repetition
+    :return: items per second
+    """
+    return count * number / min(timeit.repeat(function, number=number, repeat=3))
+
+
+def main() -> None:
+    """
+    Runs the benchmark over all tasks of the scaled plan.
+    """
+    specs: BambooSpecs = parse_plan_code(code=specs_with_jobs(JOBS))[0]
+    environment: typing.Optional[EnvironmentSchema] = utils.get_ci_environment(
+        target=Target.bamboo, output_settings=OutputSettings()
+    )
+    assert environment is not None
+    tasks: list[typing.Tuple[BambooJob, BambooTask]] = [
+        (job, task)
+        for stage in specs.stages.values()
+        for job in stage.jobs.values()
+        for task in job.tasks
+        if isinstance(task, BambooTask)
+    ]
+    conditions: list[str] = [
+        value
+        for _, task in tasks
+        if task.condition is not None
+        for variable in task.condition.variables
+        for value in variable.matches.values()
+    ]
+
+    def extract_all() -> None:
+        for job, task in tasks:
+            translator.extract_action(job=job, task=task, environment=environment)
+
+    print(f"{len(tasks)} tasks, {len(conditions)} conditions")
+    print(f"{'':<16}{'before':>18}{'after':>18}")
+    before: float = measure(lambda: [parse_lifecycles_before(value) for value in conditions], len(conditions))
+    after: float = measure(lambda: [translator.parse_lifecycles(value) for value in conditions], len(conditions))
+    print(f"{'conditions':<16}{before:>14,.0f} /s{after:>14,.0f} /s")
+    with mock.patch.object(translator, "parse_lifecycles", parse_lifecycles_before):
+        before = measure(extract_all, len(tasks))
+    after = measure(extract_all, len(tasks))
+    print(f"{'extract_action':<16}{before:>14,.0f} /s{after:>14,.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark for parsing and translating Bamboo specs. Compares the pure Python YAML loader with libyaml and
+the previous translation (specs parsed twice with the pure Python loader) with the current one (parsed once),
+for the recorded specs in test/bamboo_definitions.py scaled to plans with 10, 100 and 500 jobs.
+Run from the cli directory: python -m benchmarks.bamboo_specs
+"""
+import copy
+import timeit
+import typing
+from unittest import mock
+from test.bamboo_definitions import BAMBOO_SPECS
+
+import yaml
+
+from classes.bamboo_client import parse_plan_code
+from classes.ci_credentials import CICredentials
+from classes.input_settings import InputSettings
+from classes.output_settings import OutputSettings
+from classes.translator import BambooTranslator
+from cli_utils import utils
+
+JOBS: list[int] = [10, 100, 500]
+
+
+def specs_with_jobs(jobs: int) -> str:
+    """
+    Scales the recorded specs to a plan with the given number of jobs in its stage.
+    :param jobs: number of jobs
+    :return: specs as returned by the specs API
+    """
+    documents: list[str] = BAMBOO_SPECS.split("\n---\n")
+    plan: dict[str, typing.Any] = yaml.safe_load(documents[0])
+    job: dict[str, typing.Any] = plan.pop("Default Job")
+    names: list[str] = [f"Job {index}" for index in range(jobs)]
+    plan["stages"][0]["Default Stage"]["jobs"] = names
+    for index, name in enumerate(names):
+        plan[name] = copy.deepcopy(job)
+        plan[name]["key"] = f"JOB{index}"
+    return yaml.safe_dump(plan, sort_keys=False) + "\n---\n" + documents[1]
+
+
+def measure(function: typing.Callable[[], typing.Any], number: int = 3) -> float:
+    """
+    Returns the best time per call in milliseconds.
+    :param function: function to measure
+    :param number: number of calls per repetition
+    :return: time per call in milliseconds
+    """
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1000
+
+
+def main() -> None:
+    """
+    Runs the benchmark for all plan sizes.
+    """
+    translator: BambooTranslator = BambooTranslator(
+        input_settings=InputSettings(file_path="benchmark"),
+        output_settings=OutputSettings(),
+        credentials=CICredentials(url="http://localhost", username=None, token="benchmark"),
+    )
+
+    def translate(code: str) -> None:
+        translator.convert(plan_key="COURSE-EXERCISE", specs=parse_plan_code(code=code)[0])
+
+    def translate_before(code: str) -> None:
+        with mock.patch.object(utils, "load_yaml", yaml.safe_load):
+            translate(code)
+        yaml.safe_load(code.split("\n---\n")[0])
+
+    print(f"{'jobs':<6}{'size':>10}{'parse (python)':>17}{'parse (libyaml)':>17}{'before':>12}{'after':>12}")
+    for jobs in JOBS:
+        code: str = specs_with_jobs(jobs)
+        specs: str = code.split("\n---\n")[0]
+        python: float = measure(lambda: yaml.load(specs, Loader=yaml.SafeLoader))  # pylint: disable=cell-var-from-loop
+        libyaml: float = measure(lambda: utils.load_yaml(specs))  # pylint: disable=cell-var-from-loop
+        before: float = measure(lambda: translate_before(code))  # pylint: disable=cell-var-from-loop
+        after: float = measure(lambda: translate(code))  # pylint: disable=cell-var-from-loop
+        print(
+            f"{jobs:<6}{len(code) / 1024:>7.0f} KB{python:>14.1f} ms{libyaml:>14.1f} ms"
+            f"{before:>9.1f} ms{after:>9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Memory benchmark for the converted Bamboo specs. Translating a whole Bamboo instance keeps the specs of
+many plans alive, this measures the memory retained per plan with tracemalloc. The previous, unslotted
+classes are emulated by copying every object into a SimpleNamespace, which has a __dict__ like they had.
+Run from the cli directory: python -m benchmarks.bamboo_specs_memory
+"""
+import dataclasses
+import gc
+import tracemalloc
+import types
+import typing
+
+from benchmarks.bamboo_specs import specs_with_jobs
+from classes.bamboo_client import parse_plan_code
+from classes.bamboo_specs import BambooSpecs
+
+JOBS: list[int] = [10, 100, 500]
+
+PLANS: int = 20
+
+
+def unslotted(value: typing.Any) -> typing.Any:
+    """
+    Copies the given specs into objects with a __dict__, as the classes were before they were slotted.
+    :param value: specs or a part of them
+    :return: copy with SimpleNamespace objects instead of dataclasses
+    """
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return types.SimpleNamespace(
+            **{field.name: unslotted(getattr(value, field.name)) for field in dataclasses.fields(value)}
+        )
+    if isinstance(value, typing.Mapping):
+        return {key: unslotted(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [unslotted(item) for item in value]
+    return value
+
+
+def retained(code: str, convert: typing.Callable[[BambooSpecs], typing.Any]) -> float:
+    """
+    Returns the memory that the converted specs of one plan retain in KB, averaged over PLANS plans.
+    :param code: specs of the plan
+    :param convert: conversion of the parsed specs into the objects that are kept
+    :return: memory per plan in KB
+    """
+    gc.collect()
+    tracemalloc.start()
+    kept: list[typing.Any] = []
+    for _ in range(PLANS):
+        specs: BambooSpecs = parse_plan_code(code=code)[0]
+        for stage in specs.stages.values():
+            _ = list(stage.jobs.values())
+        kept.append(convert(specs))
+        del specs
+    gc.collect()
+    current: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return current / PLANS / 1024
+
+
+def main() -> None:
+    """
+    Runs the benchmark for all plan sizes.
+    """
+    print(f"{'jobs':<6}{'before':>14}{'after':>14}{'saved':>8}")
+    for jobs in JOBS:
+        code: str = specs_with_jobs(jobs)
+        before: float = retained(code, unslotted)
+        after: float = retained(code, lambda specs: specs)
+        print(f"{jobs:<6}{before:>8.0f} KB/plan{after:>8.0f} KB/plan{1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
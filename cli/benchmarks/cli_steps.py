@@ -0,0 +1,107 @@
+"""
+Benchmark for the per step overhead of the generated CLI scripts. Compares the previous invocation of every
+step (re-sourcing the whole script in a new bash) with running every step in a ( fn ) subshell,
+for windfiles with 5, 50 and 200 steps that do nothing.
+Run from the cli directory: python -m benchmarks.cli_steps
+"""
+import os
+import re
+import subprocess
+import tempfile
+import time
+
+from classes.generated.definitions import Target
+from classes.generated.windfile import WindFile
+from classes.input_settings import InputSettings
+from classes.output_settings import OutputSettings
+from classes.pass_metadata import PassMetadata
+from cli_utils.utils import validate_content
+from generators.cli import CliGenerator
+
+STEPS: list[int] = [5, 50, 200]
+
+SUBSHELL: re.Pattern = re.compile(r"^  \( (\w+) \)$", re.MULTILINE)
+
+
+def windfile_with_steps(steps: int) -> WindFile:
+    """
+    Creates a windfile with the given number of steps and some environment variables.
+    :param steps: number of steps
+    :return: windfile
+    """
+    lines: list[str] = [
+        "api: v0.0.1",
+        "metadata:",
+        "  name: benchmark",
+        "  description: windfile with many steps",
+        "  author: benchmark",
+        "environment:",
+    ]
+    lines += [f"  VARIABLE_{index}: value-{index}" for index in range(20)]
+    lines.append("actions:")
+    for index in range(steps):
+        lines += [f"  - name: step{chr(ord('a') + index % 26)}{index}", "    script: ':'"]
+    return validate_content(filetype=WindFile, content="\n".join(lines))
+
+
+def generate(steps: int) -> str:
+    """
+    Generates the CLI script for a windfile with the given number of steps.
+    :param steps: number of steps
+    :return: bash script
+    """
+    output_settings: OutputSettings = OutputSettings()
+    return CliGenerator(
+        windfile=windfile_with_steps(steps),
+        input_settings=InputSettings(file_path=os.getcwd(), target=Target.cli),
+        output_settings=output_settings,
+        metadata=PassMetadata(),
+    ).generate()
+
+
+def resourcing(script: str) -> str:
+    """
+    Rewrites the steps of the given script to the previous invocation, which sources the script again per step.
+    :param script: generated script
+    :return: script that re-sources itself for every step
+    """
+    # the sourced script must not run main again
+    guard: str = '  if [[ "${1}" == "aeolus_sourcing" ]]; then\n    return 0\n  fi\n'
+    script = script.replace("main () {\n", "main () {\n" + guard, 1)
+    return SUBSHELL.sub(r'  bash -c "source ${BASH_SOURCE[0]:-$0} aeolus_sourcing; \1"', script)
+
+
+def measure(script: str, repeat: int = 5) -> float:
+    """
+    Returns the best wall-clock time of running the given script in milliseconds.
+    :param script: bash script
+    :param repeat: number of runs
+    :return: time in milliseconds
+    """
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".sh", delete=False) as file:
+        file.write(script)
+    timings: list[float] = []
+    try:
+        for _ in range(repeat):
+            started: float = time.perf_counter()
+            subprocess.run(["bash", file.name], check=True, stdout=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - started)
+    finally:
+        os.unlink(file.name)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    """
+    Runs the benchmark for all step counts.
+    """
+    print(f"{'steps':<8}{'before (source)':>18}{'after (subshell)':>18}{'per step':>22}")
+    for steps in STEPS:
+        script: str = generate(steps)
+        before: float = measure(resourcing(script))
+        after: float = measure(script)
+        print(f"{steps:<8}{before:>15.1f} ms{after:>15.1f} ms{before / steps:>9.2f} → {after / steps:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
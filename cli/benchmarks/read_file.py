@@ -0,0 +1,66 @@
+"""
+Micro-benchmark for the validation in cli_utils.utils.read_file. Compares the previous validation
+(new TypeAdapter and pure Python YAML loader for every call) with the shared adapters,
+for YAML and for JSON input.
+Run from the cli directory: python -m benchmarks.read_file
+"""
+import functools
+import json
+import os
+import timeit
+import typing
+
+import pydantic
+import yaml
+
+from classes.generated.actionfile import ActionFile
+from classes.generated.windfile import WindFile
+from cli_utils.utils import validate_content
+
+FILES: dict[str, typing.Any] = {
+    "valid-windfile.yml": WindFile,
+    "windfile-with-external-action.yml": WindFile,
+    "windfile-with-file-action.yml": WindFile,
+    "simple-action.yml": ActionFile,
+}
+
+
+def validate_without_registry(filetype: typing.Any, content: str) -> typing.Any:
+    """
+    Validation as it was done before the adapter registry existed.
+    :param filetype: Type to validate
+    :param content: YAML content
+    :return: Validated object
+    """
+    return pydantic.TypeAdapter(filetype).validate_python(yaml.safe_load(content))
+
+
+def measure(function: typing.Callable[[], typing.Any], number: int) -> float:
+    """
+    Returns the best time per call in microseconds.
+    :param function: function to measure
+    :param number: number of calls per repetition
+    :return: time per call in microseconds
+    """
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1_000_000
+
+
+def main(number: int = 200) -> None:
+    """
+    Runs the benchmark for all example files in test/files.
+    :param number: number of calls per repetition
+    """
+    directory: str = os.path.join(os.path.dirname(__file__), "..", "test", "files")
+    print(f"{'file':<36}{'before (yaml)':>16}{'after (yaml)':>16}{'after (json)':>16}")
+    for name, filetype in FILES.items():
+        with open(os.path.join(directory, name), encoding="utf-8") as file:
+            content: str = file.read()
+        as_json: str = json.dumps(yaml.safe_load(content))
+        before: float = measure(functools.partial(validate_without_registry, filetype, content), number)
+        after: float = measure(functools.partial(validate_content, filetype, content), number)
+        after_json: float = measure(functools.partial(validate_content, filetype, as_json), number)
+        print(f"{name:<36}{before:>13.1f} µs{after:>13.1f} µs{after_json:>13.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+On-disk cache for template actions that are pulled from git repositories. Checkouts are keyed by the
+repository url and the commit the requested reference resolves to, so repeated merges of the same
+template action only cost a directory lookup instead of a clone.
+"""
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import typing
+from typing import Iterator, Optional
+
+from git import Git, Repo
+from git.exc import GitCommandError
+
+from cli_utils import logger
+
+COMMIT_PATTERN: re.Pattern = re.compile(r"^[0-9a-f]{40}$")
+
+
+def split_reference(slug: str) -> typing.Tuple[str, Optional[str]]:
+    """
+    Splits the given template action slug into the repository and the requested reference,
+    e.g. "action@v1" or "https://github.com/ls1intum/action.git@main".
+    :param slug: slug of the template action
+    :return: Tuple of the repository and the reference, the reference is None if none is given
+    """
+    if "@" not in slug:
+        return slug, None
+    repository, reference = slug.rsplit("@", 1)
+    if not repository or not reference or ":" in reference:
+        return slug, None
+    if not repository.endswith(".git") and ("/" in repository or "/" in reference):
+        # e.g. git@github.com:ls1intum/action.git, the @ belongs to the url
+        return slug, None
+    return repository, reference
+
+
+def directory_size(path: str) -> int:
+    """
+    Returns the size of all files in the given directory in bytes.
+    :param path: directory to measure
+    :return: size in bytes
+    """
+    size: int = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            file_path: str = os.path.join(root, file)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+    return size
+
+
+class ActionCache:
+    """
+    On-disk cache for pulled template actions. Every cached checkout lives in
+    <directory>/<hash of the url>/<commit>. Branches and tags are resolved to a commit
+    at most once per ttl, least recently used checkouts are evicted once the cache
+    grows beyond max_size.
+    """
+
+    directory: str
+    max_size: int
+    ttl: float
+    refs: dict[str, dict[str, typing.Any]]
+
+    def __init__(self, directory: str, max_size: int, ttl: float):
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl = ttl
+        self.refs = {}
+        self._lock: threading.Lock = threading.Lock()
+        # lock of every entry that is in use and the number of threads using it
+        self._entry_locks: dict[str, typing.Tuple[threading.Lock, int]] = {}
+        os.makedirs(self.directory, exist_ok=True)
+        self.refs = self.read_refs()
+
+    def refs_file(self) -> str:
+        """
+        Returns the path of the file that stores the resolved references.
+        :return: path of the references file
+        """
+        return os.path.join(self.directory, "refs.json")
+
+    def read_refs(self) -> dict[str, dict[str, typing.Any]]:
+        """
+        Reads the resolved references from disk.
+        :return: resolved references
+        """
+        try:
+            with open(self.refs_file(), "r", encoding="utf-8") as file:
+                refs: typing.Any = json.load(file)
+                return refs if isinstance(refs, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def write_refs(self) -> None:
+        """
+        Writes the resolved references to disk, the file is replaced atomically.
+        """
+        file_descriptor, path = tempfile.mkstemp(dir=self.directory, prefix=".refs-")
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            json.dump(self.refs, file)
+        os.replace(path, self.refs_file())
+
+    def entry_path(self, url: str, commit: str) -> str:
+        """
+        Returns the path of the checkout of the given commit of the given repository.
+        :param url: url of the repository
+        :param commit: commit of the checkout
+        :return: path of the checkout
+        """
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest()[:16], commit)
+
+    def resolve(self, url: str, reference: Optional[str]) -> Optional[str]:
+        """
+        Resolves the given reference of the given repository to a commit. Commits are returned as is,
+        branches and tags are looked up with ls-remote at most once per ttl.
+        :param url: url of the repository
+        :param reference: branch, tag or commit, None for the default branch
+        :return: resolved commit or None if the reference could not be resolved
+        """
+        if reference is not None and COMMIT_PATTERN.match(reference):
+            return reference
+        ref: str = reference if reference else "HEAD"
+        key: str = f"{url}@{ref}"
+        with self._lock:
+            known: Optional[dict[str, typing.Any]] = self.refs.get(key)
+        if known and time.time() - known["resolved_at"] < self.ttl:
+            return known["commit"]
+        try:
+            output: str = Git().ls_remote(url, ref)
+        except GitCommandError:
+            # we rather use a stale commit than failing if the remote is not reachable
+            return known["commit"] if known else None
+        lines: list[list[str]] = [line.split("\t") for line in output.splitlines() if "\t" in line]
+        if not lines:
+            return None
+        # annotated tags are listed twice, the peeled entry (^{}) points to the actual commit
+        peeled: list[list[str]] = [line for line in lines if line[1].endswith("^{}")]
+        commit: str = peeled[0][0] if peeled else lines[0][0]
+        with self._lock:
+            self.refs[key] = {"commit": commit, "resolved_at": time.time()}
+            self.write_refs()
+        return commit
+
+    @contextlib.contextmanager
+    def entry_lock(self, path: str) -> Iterator[None]:
+        """
+        Holds the lock of the given entry, the lock is dropped once no thread uses the entry anymore.
+        :param path: path of the entry
+        """
+        with self._lock:
+            lock, users = self._entry_locks.get(path, (threading.Lock(), 0))
+            self._entry_locks[path] = (lock, users + 1)
+        lock.acquire()  # pylint: disable=consider-using-with
+        try:
+            yield
+        finally:
+            self.release_entry(path=path)
+
+    def release_entry(self, path: str) -> None:
+        """
+        Releases the lock of the given entry and drops it if no other thread waits for it.
+        :param path: path of the entry
+        """
+        with self._lock:
+            lock, users = self._entry_locks[path]
+            if users > 1:
+                self._entry_locks[path] = (lock, users - 1)
+            else:
+                del self._entry_locks[path]
+        lock.release()
+
+    def get(self, url: str, reference: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the path of a checkout of the given repository at the given reference.
+        The checkout is only fetched if it is not cached yet. Use checkout() if the entry
+        is read afterwards, the returned path may be evicted by other threads.
+        :param url: url of the repository
+        :param reference: branch, tag or commit, None for the default branch
+        :return: path of the checkout or None if the repository could not be fetched
+        """
+        with self.checkout(url=url, reference=reference) as path:
+            return path
+
+    @contextlib.contextmanager
+    def checkout(self, url: str, reference: Optional[str] = None) -> Iterator[Optional[str]]:
+        """
+        Yields the path of a checkout of the given repository at the given reference, the checkout
+        is not evicted until the context is left. It is only fetched if it is not cached yet.
+        :param url: url of the repository
+        :param reference: branch, tag or commit, None for the default branch
+        :return: path of the checkout or None if the repository could not be fetched
+        """
+        commit: Optional[str] = self.resolve(url=url, reference=reference)
+        if commit is None:
+            logger.error("❌ ", f"could not resolve {reference or 'HEAD'} of {url}", False)
+            yield None
+            return
+        path: str = self.entry_path(url=url, commit=commit)
+        with self.entry_lock(path=path):
+            if os.path.isdir(path):
+                logger.debug("📦 ", f"using cached {url} at {commit}", False)
+                # the modification time is used to find the least recently used entries
+                os.utime(path)
+                yield path
+                return
+            fetched: Optional[str] = self.fetch(url=url, commit=commit, path=path)
+            if fetched is not None:
+                self.evict(keep=fetched)
+            yield fetched
+
+    def fetch(self, url: str, commit: str, path: str) -> Optional[str]:
+        """
+        Fetches the given commit into the given path. If another commit of the same repository
+        is already cached, it is used as a base, so only the missing objects are fetched.
+        Otherwise, a shallow fetch of the single commit is done.
+        :param url: url of the repository
+        :param commit: commit to fetch
+        :param path: path of the new cache entry
+        :return: path of the cache entry or None if the commit could not be fetched
+        """
+        parent: str = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+        staging: str = tempfile.mkdtemp(dir=parent, prefix=".staging-")
+        try:
+            base: Optional[str] = self.latest_entry(parent=parent)
+            repo: Repo
+            if base is not None:
+                logger.debug("📦 ", f"updating {url} to {commit} based on {os.path.basename(base)}", False)
+                shutil.copytree(base, staging, symlinks=True, dirs_exist_ok=True)
+                repo = Repo(staging)
+            else:
+                logger.debug("📦 ", f"fetching {url} at {commit}", False)
+                repo = Repo.init(staging)
+                repo.create_remote("origin", url)
+            repo.git.fetch("origin", commit, depth=1)
+            repo.git.checkout("--force", "--detach", "FETCH_HEAD")
+            repo.close()
+            os.rename(staging, path)
+        except (GitCommandError, OSError) as error:
+            shutil.rmtree(staging, ignore_errors=True)
+            if os.path.isdir(path):
+                # another process was faster
+                return path
+            logger.error("❌ ", f"could not fetch {url} at {commit}: {error}", False)
+            return None
+        return path
+
+    def latest_entry(self, parent: str) -> Optional[str]:
+        """
+        Returns the most recently used cache entry in the given directory.
+        :param parent: directory of a cached repository
+        :return: path of the most recently used entry or None
+        """
+        entries: list[os.DirEntry] = [
+            entry for entry in os.scandir(parent) if entry.is_dir() and not entry.name.startswith(".")
+        ]
+        if not entries:
+            return None
+        return max(entries, key=lambda entry: entry.stat().st_mtime).path
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """
+        Removes the least recently used entries until the cache is smaller than max_size,
+        entries that are in use are skipped.
+        :param keep: entry that must not be removed
+        """
+        entries: list[typing.Tuple[float, str, int]] = []
+        for repository in os.scandir(self.directory):
+            if not repository.is_dir():
+                continue
+            for entry in os.scandir(repository.path):
+                if entry.is_dir() and not entry.name.startswith("."):
+                    entries.append((entry.stat().st_mtime, entry.path, directory_size(entry.path)))
+        total: int = sum(entry[2] for entry in entries)
+        for _, path, size in sorted(entries):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            with self._lock:
+                if path in self._entry_locks:
+                    # the entry is being read or fetched
+                    continue
+                # claim the entry, so it is not handed out while it is removed
+                lock: threading.Lock = threading.Lock()
+                lock.acquire()  # pylint: disable=consider-using-with
+                self._entry_locks[path] = (lock, 1)
+            try:
+                logger.debug("🧹 ", f"evicting {path} from the action cache", False)
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+            finally:
+                self.release_entry(path=path)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_action_cache() -> Optional[ActionCache]:
+    """
+    Returns the action cache shared by all merges in this process. It is configured with
+    AEOLUS_ACTION_CACHE_DIR, AEOLUS_ACTION_CACHE_MAX_SIZE (in MB, 0 disables the cache)
+    and AEOLUS_ACTION_CACHE_TTL (in seconds).
+    :return: action cache or None if caching is disabled
+    """
+    cache_home: str = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    directory: str = os.getenv("AEOLUS_ACTION_CACHE_DIR", os.path.join(cache_home, "aeolus", "actions"))
+    max_size: int = int(os.getenv("AEOLUS_ACTION_CACHE_MAX_SIZE", "512")) * 1024 * 1024
+    ttl: float = float(os.getenv("AEOLUS_ACTION_CACHE_TTL", "300"))
+    if max_size <= 0:
+        return None
+    try:
+        return ActionCache(directory=directory, max_size=max_size, ttl=ttl)
+    except OSError as error:
+        logger.error("❌ ", f"action cache disabled, {directory} is not usable: {error}", False)
+        return None
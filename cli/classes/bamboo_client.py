@@ -3,10 +3,12 @@ Client for the Bamboo REST API. As bamboo does not provide a complete CRUD API,
 of using the specs API to get the YAML representation of a plan. We take the YAML representation and convert
 it into a defined structure that we can work with to translate it into Aeolus.
 """
+import collections
+import os
+import threading
 from typing import Optional, Tuple, Any, List
 
 import requests
-import yaml
 
 from classes.bamboo_specs import (
     BambooSpecs,
@@ -21,8 +23,11 @@ from classes.bamboo_specs import (
     BambooDockerConfig,
     BambooSpecialTask,
     BambooArtifact,
+    LazyMapping,
 )
 from classes.ci_credentials import CICredentials
+from cli_utils import utils
+from cli_utils.http_client import create_session
 
 
 def handle_final_tasks(
@@ -37,15 +42,14 @@ def handle_final_tasks(
     """
     # think about final tasks management in aeolus
     # for now, add them at the end, and always execute them
-    tmp: list[dict[str, Any]] = final_tasks
     tasks: list[dict[str, Any]] = []
-    for item in tmp:
+    for item in final_tasks:
         old_key: str = list(item.keys())[0]
         task_type: str = item[old_key]["type"] if "type" in item[old_key] else old_key
-        if "type" in item[old_key]:
-            del item[old_key]["type"]
-        item[old_key]["always_execute"] = True
-        tasks.append({task_type: item[old_key]})
+        # the parsed specs are shared with the caller, so the task is copied instead of changed
+        task: dict[str, Any] = {key: value for key, value in item[old_key].items() if key != "type"}
+        task["always_execute"] = True
+        tasks.append({task_type: task})
     return tasks
 
 
@@ -204,71 +208,98 @@ def convert_artifacts(
     return bamboo_artifacts
 
 
-def convert_stages(plan_specs: dict[str, Any]) -> dict[str, BambooStage]:
+def job_tasks(job_dict: dict[str, Any]) -> Optional[list[dict[str, Any]]]:
+    """
+    Returns the tasks of the given job, its final tasks are appended and always executed.
+    :param job_dict: job from the Bamboo API with fixed keys
+    :return: tasks of the job or None if the job has no tasks
+    """
+    tasks: Any = job_dict.get("tasks")
+    if not isinstance(tasks, list):
+        return None
+    if isinstance(job_dict.get("final_tasks"), list):
+        tasks = tasks + handle_final_tasks(final_tasks=job_dict["final_tasks"])
+    if len(tasks) > 0 and isinstance(tasks[0], dict):
+        return tasks
+    return None
+
+
+def convert_job(plan_specs: dict[str, Any], job_list: list[str], job_name: str) -> BambooJob:
+    """
+    We convert the given job from the API response into a structured object. A job without docker
+    configuration or artifacts uses the ones of the job before it, so the jobs before it are looked at as well.
+    :param plan_specs: Response from the Bamboo API
+    :param job_list: names of all jobs of the stage, in order
+    :param job_name: name of the job to convert
+    :return: BambooJob object including BambooTask objects
+    """
+    docker_dict: Optional[dict[str, Any]] = None
+    artifacts_list: Optional[Any] = None
+    for name in job_list[: job_list.index(job_name) + 1]:
+        previous: dict[str, Any] = plan_specs[name]
+        if isinstance(previous.get("docker"), dict):
+            docker_dict = previous["docker"]
+        if "artifacts" in previous:
+            artifacts_list = previous["artifacts"]
+    bamboo_docker: Optional[BambooDockerConfig] = None
+    if docker_dict is not None:
+        # we handle docker "tasks" differently (in the metadata rather than a job)
+        bamboo_docker = BambooDockerConfig(
+            image=str(docker_dict["image"]),
+            volumes=docker_dict["volumes"] if isinstance(docker_dict["volumes"], dict) else {},
+            docker_run_arguments=docker_dict["docker-run-arguments"]
+            if isinstance(docker_dict["docker-run-arguments"], list)
+            else [],
+        )
+    job_dict: dict[str, Any] = fix_keys(dictionary=plan_specs[job_name])
+    tasks_dict: Optional[list[dict[str, Any]]] = job_tasks(job_dict=job_dict)
+    tasks: list[BambooCheckoutTask | BambooTask | BambooSpecialTask] = handle_tasks(job_dict=tasks_dict or [])
+    return BambooJob(
+        key=str(job_dict["key"]),
+        tasks=tasks,
+        artifacts=convert_artifacts(artifacts=artifacts_list) if artifacts_list is not None else None,
+        artifact_subscriptions=job_dict["artifact_subscriptions"]
+        if isinstance(job_dict["artifact_subscriptions"], list)
+        else [],
+        docker=bamboo_docker,
+        other=job_dict["other"] if isinstance(job_dict.get("other"), dict) else None,
+    )
+
+
+def convert_stage(plan_specs: dict[str, Any], stage_dict: dict[str, Any]) -> BambooStage:
+    """
+    We convert the given stage from the API response into a structured object.
+    A job is only converted when it is accessed, jobs without tasks are left out.
+    :param plan_specs: Response from the Bamboo API
+    :param stage_dict: stage from the Bamboo API
+    :return: BambooStage object including BambooJob and BambooTask objects
+    """
+    job_list: list[str] = stage_dict["jobs"]
+    job_names: list[str] = [
+        job_name for job_name in job_list if job_tasks(job_dict=fix_keys(dictionary=plan_specs[job_name])) is not None
+    ]
+    jobs: LazyMapping[BambooJob] = LazyMapping(
+        keys=job_names,
+        factory=lambda job_name: convert_job(plan_specs=plan_specs, job_list=job_list, job_name=job_name),
+    )
+    return BambooStage(**{**stage_dict, "jobs": jobs})
+
+
+def convert_stages(plan_specs: dict[str, Any]) -> LazyMapping[BambooStage]:
     """
     We convert the stages from the API response into structured
-    objects that are easier to work with.
+    objects that are easier to work with. A stage is only converted when it is accessed.
     :param plan_specs: Response from the Bamboo API
-    :return: dict of BambooStage objects including BambooJob and BambooTask objects
-    """
-    stages: dict[str, BambooStage] = {}
-    dictionary: list[dict[str, Any]] = plan_specs["stages"]
-
-    for stage_dict in dictionary:
-        stage_name = list(stage_dict.keys())[0]
-        job_list: list[str] = stage_dict[stage_name]["jobs"]
-        stage_dict[stage_name]["jobs"] = {}
-        bamboo_docker: Optional[BambooDockerConfig] = None
-        stage: BambooStage = BambooStage(**stage_dict[stage_name])
-        artifacts: Optional[List[BambooArtifact]] = None
-        for job_name in job_list:
-            job_dict: dict[str, Optional[int | bool | str | dict[str, Any] | list[Any]]] = plan_specs[job_name]
-            job_dict = fix_keys(dictionary=job_dict)
-            if "docker" in job_dict and isinstance(job_dict["docker"], dict):
-                # we handle docker "tasks" differently (in the metadata rather than a job), so we remove them here
-                # to make the creation of the BambooSpecs object easier
-                bamboo_docker = BambooDockerConfig(
-                    image=str(job_dict["docker"]["image"]),
-                    volumes=job_dict["docker"]["volumes"] if isinstance(job_dict["docker"]["volumes"], dict) else {},
-                    docker_run_arguments=job_dict["docker"]["docker-run-arguments"]
-                    if isinstance(job_dict["docker"]["docker-run-arguments"], list)
-                    else [],
-                )
-            if (
-                "final_tasks" in job_dict
-                and isinstance(job_dict["final_tasks"], list)
-                and isinstance(job_dict["tasks"], list)
-            ):
-                for final in handle_final_tasks(final_tasks=job_dict["final_tasks"]):
-                    job_dict["tasks"].append(final)
-                del job_dict["final_tasks"]
-            if "artifacts" in job_dict:
-                artifacts = convert_artifacts(artifacts=job_dict["artifacts"])
-            if "other" not in job_dict:
-                job_dict["other"] = None
-            tasks_dict: Optional[list[dict[str, Any]]] = None
-            if (
-                isinstance(job_dict["tasks"], list)
-                and len(job_dict["tasks"]) > 0
-                and isinstance(job_dict["tasks"][0], dict)
-            ):
-                tasks_dict = job_dict["tasks"]
-            if tasks_dict is None:
-                continue
-            tasks: list[BambooCheckoutTask | BambooTask | BambooSpecialTask] = handle_tasks(job_dict=tasks_dict)
-            job: BambooJob = BambooJob(
-                key=str(job_dict["key"]),
-                tasks=tasks,
-                artifacts=artifacts,
-                artifact_subscriptions=job_dict["artifact_subscriptions"]
-                if isinstance(job_dict["artifact_subscriptions"], list)
-                else [],
-                docker=bamboo_docker,
-                other=job_dict["other"] if isinstance(job_dict["other"], dict) else None,
-            )
-            stage.jobs[job_name] = job
-        stages[stage_name] = stage
-    return stages
+    :return: BambooStage objects including BambooJob and BambooTask objects by name
+    """
+    stage_dicts: dict[str, dict[str, Any]] = {}
+    for stage_dict in plan_specs["stages"]:
+        stage_name: str = list(stage_dict.keys())[0]
+        stage_dicts[stage_name] = stage_dict[stage_name]
+    return LazyMapping(
+        keys=list(stage_dicts.keys()),
+        factory=lambda name: convert_stage(plan_specs=plan_specs, stage_dict=stage_dicts[name]),
+    )
 
 
 def extract_code(response: dict[str, dict[str, str]]) -> Optional[str]:
@@ -283,17 +314,185 @@ def extract_code(response: dict[str, dict[str, str]]) -> Optional[str]:
     return None
 
 
+def parse_plan_code(code: str) -> Tuple[BambooSpecs, dict[str, Any]]:
+    """
+    Converts the YAML code of the specs of a plan into a defined structure.
+    :param code: YAML code as returned by the specs API
+    :return: structured specs and the YAML representation of the plan
+    """
+    specs: str = code.split("\n---\n")[0]
+    # permissions: str = code.split("\n---\n")[1]
+    # the specs are only parsed once, the conversion must not change the parsed document as it is returned as well
+    dictionary: dict[str, Any] = utils.load_yaml(specs)
+    plan: dict[str, Any] = fix_keys(dictionary=dictionary["plan"])
+    stages: LazyMapping[BambooStage] = convert_stages(plan_specs=dictionary)
+    repositories: dict[str, BambooRepository] = {}
+    for repo_dict in dictionary["repositories"]:
+        repo_name = list(repo_dict.keys())[0]
+        repo: dict[str, int | bool | str] = repo_dict[repo_name]
+        repo = fix_keys(dictionary=repo)
+        if repo["type"] == "bitbucket-server":
+            repo["url"] = str(repo["clone_url"]).replace("ssh://", "https://").replace("git@", "")
+        if repo["type"] == "github":
+            repo["url"] = str(repo["base_url"]) + str(repo["user"]) + "/" + str(repo["repository"])
+            repo["shared_credentials"] = str(repo["password"])
+        repositories[repo_name] = BambooRepository(
+            repo_type=str(repo["type"] if "type" in repo else "git"),
+            url=str(repo["url"]),
+            branch=str(repo["branch"]),
+            shared_credentials=str(repo["shared_credentials"] if "shared_credentials" in repo else ""),
+            command_timeout_minutes=str(repo["command_timeout_minutes"]),
+            lfs=bool(repo["lfs"]),
+            verbose_logs=bool(repo["verbose_logs"]),
+            use_shallow_clones=bool(repo["use_shallow_clones"]),
+            cache_on_agents=bool(repo["cache_on_agents"]),
+            submodules=bool(repo["submodules"]),
+            ssh_key_applies_to_submodules=bool(repo["ssh_key_applies_to_submodules"]),
+            fetch_all=bool(repo["fetch_all"]),
+        )
+    sanitized: dict = {
+        "version": dictionary["version"],
+        "plan": BambooPlan(**plan),
+        "stages": stages,
+        "variables": dictionary["variables"] if "variables" in dictionary else {},
+        "triggers": dictionary["triggers"],
+        "repositories": repositories,
+    }
+    bamboo_specs: BambooSpecs = BambooSpecs(**sanitized)
+    return bamboo_specs, dictionary
+
+
+class BambooApiError(Exception):
+    """
+    Raised if the Bamboo REST API answers with an unexpected status code.
+    """
+
+    status_code: int
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def create_bamboo_session(retries: Optional[int] = None, pool_size: int = 10) -> requests.Session:
+    """
+    Creates a session for the Bamboo REST API that keeps connections alive and retries
+    connection errors, 429 and 5xx responses with an exponential backoff.
+    :param retries: number of retries per request, defaults to BAMBOO_API_RETRIES
+    :param pool_size: number of connections kept alive
+    :return: session
+    """
+    return create_session(
+        retries=retries if retries is not None else int(os.getenv("BAMBOO_API_RETRIES", "3")),
+        backoff_factor=float(os.getenv("BAMBOO_API_BACKOFF", "0.5")),
+        pool_size=pool_size,
+        status_forcelist=(429, 500, 502, 503, 504),
+    )
+
+
 class BambooClient:
     """
     Client for the Bamboo REST API. As bamboo does not provide a complete CRUD API, we create this workaround
     of using the specs API to get the YAML representation of a plan. We take the YAML representation and convert
     it into a defined structure that we can work with and translate it into Aeolus.
+    All requests go through the session of the client, so connections are reused and failed requests retried.
+    Another session, e.g. one that talks to a stub server, can be plugged in for testing. If Bamboo answers with
+    an ETag or Last-Modified header, the document is remembered and only fetched again if it changed. At most
+    max_documents documents are remembered, the least recently used ones are forgotten first.
     """
 
     credentials: CICredentials
+    session: requests.Session
+    timeout: Tuple[float, float]
+    max_documents: int
+    documents: collections.OrderedDict[str, Tuple[Optional[str], Optional[str], Any]]
 
-    def __init__(self, credentials: CICredentials):
+    def __init__(
+        self,
+        credentials: CICredentials,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[Tuple[float, float]] = None,
+        max_documents: Optional[int] = None,
+    ):
         self.credentials = credentials
+        self.session = session if session is not None else create_bamboo_session()
+        self.timeout = (
+            timeout
+            if timeout is not None
+            else (
+                float(os.getenv("BAMBOO_API_CONNECT_TIMEOUT", "5")),
+                float(os.getenv("BAMBOO_API_READ_TIMEOUT", "30")),
+            )
+        )
+        self.max_documents = (
+            max_documents if max_documents is not None else int(os.getenv("BAMBOO_API_MAX_DOCUMENTS", "128"))
+        )
+        self.documents = collections.OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_json(self, path: str, params: dict[str, str | int]) -> Any:
+        """
+        Get the json document at the given path of the REST API. Known documents are requested
+        conditionally and reused if Bamboo answers with 304 Not Modified.
+        :param path: path below the REST API, e.g. plan/PROJECT-PLAN/specs
+        :param params: query parameters
+        :return: json document
+        """
+        url: str = f"{self.credentials.url}/rest/api/latest/{path}"
+        cache_key: str = f"{url}?{sorted(params.items())}"
+        headers: dict[str, str] = {"Authorization": f"Bearer {self.credentials.token}", "Accept": "application/json"}
+        with self._lock:
+            known: Optional[Tuple[Optional[str], Optional[str], Any]] = self.documents.get(cache_key)
+            if known is not None:
+                self.documents.move_to_end(cache_key)
+        if known is not None:
+            if known[0] is not None:
+                headers["If-None-Match"] = known[0]
+            if known[1] is not None:
+                headers["If-Modified-Since"] = known[1]
+        response: requests.Response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and known is not None:
+            return known[2]
+        if response.status_code != 200:
+            raise BambooApiError(
+                f"Bamboo answered {response.status_code} for {path}: {response.text}", status_code=response.status_code
+            )
+        document: Any = response.json()
+        etag: Optional[str] = response.headers.get("ETag")
+        last_modified: Optional[str] = response.headers.get("Last-Modified")
+        if self.max_documents > 0 and (etag is not None or last_modified is not None):
+            with self._lock:
+                self.documents[cache_key] = (etag, last_modified, document)
+                self.documents.move_to_end(cache_key)
+                while len(self.documents) > self.max_documents:
+                    self.documents.popitem(last=False)
+        return document
+
+    def get_plan_keys(self, project_key: str, page_size: int = 100) -> List[str]:
+        """
+        Get the keys of all plans of the given project by using the REST API.
+        :param project_key: key of the project
+        :param page_size: number of plans requested at once
+        :return: keys of the plans
+        """
+        keys: List[str] = []
+        while True:
+            plans: dict[str, Any] = self.get_json(
+                path=f"project/{project_key}",
+                params={"expand": "plans", "start-index": len(keys), "max-result": page_size},
+            )["plans"]
+            keys.extend(str(plan["key"]) for plan in plans["plan"])
+            if not plans["plan"] or len(keys) >= int(plans["size"]):
+                return keys
+
+    def get_plan_code(self, plan_key: str) -> Optional[str]:
+        """
+        Get the YAML code of the specs of the given plan by using the REST API.
+        :param plan_key: key of the plan
+        :return: YAML code of the specs or None if Bamboo returned no specs
+        """
+        document: dict[str, dict[str, str]] = self.get_json(path=f"plan/{plan_key}/specs", params={"format": "yaml"})
+        return extract_code(response=document)
 
     def get_plan_yaml(self, plan_key: str) -> Optional[Tuple[BambooSpecs, dict[str, str]]]:
         """
@@ -301,56 +500,25 @@ class BambooClient:
         :param plan_key:
         :return: YAML representation of the plan
         """
-        response = requests.get(
-            f"{self.credentials.url}/rest/api/latest/plan/{plan_key}/specs",
-            params={"format": "yaml"},
-            headers={"Authorization": f"Bearer {self.credentials.token}", "Accept": "application/json"},
-            timeout=30,
-        )
-        if response.status_code != 200:
-            raise Exception(  # pylint: disable=broad-exception-raised
-                f"Could not get plan {plan_key} from Bamboo: {response.text}"
-            )
-        document: dict[str, dict[str, str]] = response.json()
-        code: Optional[str] = extract_code(response=document)
+        code: Optional[str] = self.get_plan_code(plan_key=plan_key)
         if code is not None:
-            specs: str = code.split("\n---\n")[0]
-            # permissions: str = code.split("\n---\n")[1]
-            dictionary: dict[str, Any] = yaml.safe_load(specs)
-            dictionary["plan"] = fix_keys(dictionary=dictionary["plan"])
-            stages: dict[str, BambooStage] = convert_stages(plan_specs=dictionary)
-            repositories: dict[str, BambooRepository] = {}
-            for repo_dict in dictionary["repositories"]:
-                repo_name = list(repo_dict.keys())[0]
-                repo: dict[str, int | bool | str] = repo_dict[repo_name]
-                repo = fix_keys(dictionary=repo)
-                if repo["type"] == "bitbucket-server":
-                    repo["url"] = str(repo["clone_url"]).replace("ssh://", "https://").replace("git@", "")
-                if repo["type"] == "github":
-                    repo["url"] = str(repo["base_url"]) + str(repo["user"]) + "/" + str(repo["repository"])
-                    repo["shared_credentials"] = str(repo["password"])
-                repositories[repo_name] = BambooRepository(
-                    repo_type=str(repo["type"] if "type" in repo else "git"),
-                    url=str(repo["url"]),
-                    branch=str(repo["branch"]),
-                    shared_credentials=str(repo["shared_credentials"] if "shared_credentials" in repo else ""),
-                    command_timeout_minutes=str(repo["command_timeout_minutes"]),
-                    lfs=bool(repo["lfs"]),
-                    verbose_logs=bool(repo["verbose_logs"]),
-                    use_shallow_clones=bool(repo["use_shallow_clones"]),
-                    cache_on_agents=bool(repo["cache_on_agents"]),
-                    submodules=bool(repo["submodules"]),
-                    ssh_key_applies_to_submodules=bool(repo["ssh_key_applies_to_submodules"]),
-                    fetch_all=bool(repo["fetch_all"]),
-                )
-            sanitized: dict = {
-                "version": dictionary["version"],
-                "plan": BambooPlan(**dictionary["plan"]),
-                "stages": stages,
-                "variables": dictionary["variables"] if "variables" in dictionary else {},
-                "triggers": dictionary["triggers"],
-                "repositories": repositories,
-            }
-            bamboo_specs: BambooSpecs = BambooSpecs(**sanitized)
-            return bamboo_specs, yaml.safe_load(specs)
+            return parse_plan_code(code=code)
         return None
+
+
+_clients: dict[Tuple[str, Optional[str], str], BambooClient] = {}
+_clients_lock: threading.Lock = threading.Lock()
+
+
+def get_bamboo_client(credentials: CICredentials) -> BambooClient:
+    """
+    Returns the shared client for the server and user of the given credentials, so connections and
+    remembered documents are reused across translations, e.g. across the requests of the api.
+    :param credentials: credentials of the Bamboo server
+    :return: client
+    """
+    key: Tuple[str, Optional[str], str] = (credentials.url, credentials.username, credentials.token)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = BambooClient(credentials=credentials)
+        return _clients[key]
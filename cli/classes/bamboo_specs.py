@@ -1,147 +1,123 @@
 """
 This file contains a simplified view of the Bamboo Specs, as returned by the Bamboo REST API.
 """
-# pylint: disable=too-many-arguments
 # pylint: disable=too-many-instance-attributes
-from typing import Optional, Any, List
+from dataclasses import dataclass, field
+from typing import Optional, Any, List, Callable, Generic, Iterator, Mapping, TypeVar
 
 
 # This file contains a simplified view of the Bamboo Specs, as returned by the Bamboo REST API.
 # We only use the fields that help us in crafting a working Aeolus spec file.
+# A translation of a whole Bamboo instance keeps many of these objects alive, so they are slotted.
 
+V = TypeVar("V")
 
+
+class LazyMapping(Mapping[str, V], Generic[V]):
+    """
+    Read-only mapping whose values are only created when they are accessed for the first time,
+    so parts of a large plan that are never looked at are never converted.
+    """
+
+    __slots__ = ("_keys", "_factory", "_values")
+
+    def __init__(self, keys: List[str], factory: Callable[[str], V]) -> None:
+        self._keys: List[str] = list(dict.fromkeys(keys))
+        self._factory: Optional[Callable[[str], V]] = factory
+        self._values: dict[str, V] = {}
+
+    def __getitem__(self, key: str) -> V:
+        if key not in self._values:
+            if key not in self._keys or self._factory is None:
+                raise KeyError(key)
+            self._values[key] = self._factory(key)
+            if len(self._values) == len(self._keys):
+                # the factory usually holds on to the raw specs, which are not needed anymore
+                self._factory = None
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def materialized(self) -> int:
+        """
+        Returns the number of values that were created so far.
+        :return: number of created values
+        """
+        return len(self._values)
+
+
+@dataclass(frozen=True, slots=True)
 class BambooPlan:
     """
     BambooPlan represents a Bamboo plan as returned by the Bamboo REST API.
     """
 
-    def __init__(self, project_key: str, key: str, name: str, description: str) -> None:
-        self.project_key = project_key
-        self.key = key
-        self.name = name
-        self.description = description
-
     project_key: str
     key: str
     name: str
     description: str
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class BambooCheckoutTask:
     """
     BambooCheckoutTask represents a Bamboo checkout task as returned by the Bamboo REST API.
     """
 
-    def __init__(
-        self, repository: str, force_clean_build: bool, path: Optional[str] = None, description: Optional[str] = None
-    ) -> None:
-        self.repository = repository
-        self.force_clean_build = force_clean_build
-        self.path = path if path is not None else "."
-        self.description = description
-
     repository: str
-    path: str
     force_clean_build: bool
-    description: Optional[str]
+    path: str = "."
+    description: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.path is None:
+            object.__setattr__(self, "path", ".")
 
 
+@dataclass(frozen=True, slots=True)
 class BambooConditionVariable:
     """
     BambooConditionVariable represents a Bamboo condition variable as returned by the Bamboo REST API.
     """
 
-    def __init__(self, matches: dict[str, str]) -> None:
-        self.matches = matches
-
     matches: dict[str, str]
 
 
+@dataclass(frozen=True, slots=True)
 class BambooCondition:
     """
     BambooCondition represents a Bamboo condition as returned by the Bamboo REST API.
     """
 
-    def __init__(self, variables: list[BambooConditionVariable]) -> None:
-        self.variables = variables
-
     variables: list[BambooConditionVariable]
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class BambooTask:
     """
     BambooTask represents a Bamboo task as returned by the Bamboo REST API.
     """
 
-    def __init__(
-        self,
-        interpreter: Optional[str],
-        scripts: List[str],
-        workdir: Optional[str],
-        environment: dict[Any, int | str | float | bool | list | None],
-        description: str,
-        condition: Optional[BambooCondition],
-        arguments: Optional[list[str]] = None,
-        always_execute: bool = False,
-    ) -> None:
-        if arguments is None:
-            arguments = []
-        self.interpreter = interpreter
-        self.scripts = scripts
-        self.workdir = workdir
-        self.environment = environment
-        self.description = description
-        self.condition = condition
-        self.arguments = arguments
-        self.always_execute = always_execute
-
     interpreter: Optional[str]
     scripts: list[str]
     workdir: Optional[str]
     environment: dict[Any, int | str | float | bool | list | None]
     description: str
     condition: Optional[BambooCondition]
-    arguments: list[str]
-    always_execute: bool
+    arguments: list[str] = field(default_factory=list)
+    always_execute: bool = False
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class BambooSpecialTask(BambooTask):
     """
     SpecialBambooTask represents a special Bamboo task as returned by the Bamboo REST API.
     """
 
-    def __init__(
-        self,
-        executable: Optional[str],
-        jdk: Optional[str],
-        goal: Optional[str],
-        tests: Optional[str],
-        interpreter: Optional[str],
-        workdir: Optional[str],
-        scripts: list[str],
-        parameters: dict[Any, int | str | float | bool | list | None],
-        environment: dict[Any, int | str | float | bool | list | None],
-        description: str,
-        condition: Optional[BambooCondition],
-        always_execute: bool,
-        task_type: str,
-    ) -> None:
-        super().__init__(
-            interpreter=interpreter,
-            scripts=scripts,
-            workdir=workdir,
-            environment=environment,
-            description=description,
-            condition=condition,
-            always_execute=always_execute,
-        )
-        self.task_type = task_type
-        self.parameters = parameters
-        self.executable = executable
-        self.jdk = jdk
-        self.goal = goal
-        self.tests = tests
-
     executable: Optional[str]
     jdk: Optional[str]
     goal: Optional[str]
@@ -150,36 +126,23 @@ class BambooSpecialTask(BambooTask):
     task_type: str
 
 
+@dataclass(frozen=True, slots=True)
 class BambooDockerConfig:
     """
     BambooDockerConfig represents the docker configuration of a Bamboo job as returned by the Bamboo REST API.
     """
 
-    def __init__(self, image: str, volumes: dict[str, str], docker_run_arguments: list[str]) -> None:
-        self.image = image
-        self.volumes = volumes
-        self.docker_run_arguments = docker_run_arguments
-
     image: str
     volumes: dict[str, str]
     docker_run_arguments: list[str]
 
 
+@dataclass(frozen=True, slots=True)
 class BambooArtifact:
     """
     BambooArtifact represents a Bamboo artifact as returned by the Bamboo REST API.
     """
 
-    def __init__(
-        self, name: str, location: str, pattern: str, exclusion: Optional[str], shared: bool, required: bool
-    ) -> None:
-        self.name = name
-        self.location = location
-        self.pattern = pattern
-        self.exclusion = exclusion
-        self.shared = shared
-        self.required = required
-
     name: str
     location: str
     pattern: str
@@ -188,27 +151,12 @@ class BambooArtifact:
     required: bool
 
 
+@dataclass(frozen=True, slots=True)
 class BambooJob:
     """
     BambooJob represents a Bamboo job as returned by the Bamboo REST API.
     """
 
-    def __init__(
-        self,
-        key: str,
-        tasks: List[BambooCheckoutTask | BambooTask | BambooSpecialTask],
-        artifacts: Optional[List[BambooArtifact]],
-        artifact_subscriptions: List[Any],
-        docker: Optional[BambooDockerConfig],
-        other: Optional[dict[str, Any]],
-    ) -> None:
-        self.key = key
-        self.tasks = tasks
-        self.artifacts = artifacts
-        self.artifact_subscriptions = artifact_subscriptions
-        self.docker = docker
-        self.other = other
-
     key: str
     tasks: list[BambooCheckoutTask | BambooTask]
     artifacts: Optional[List[BambooArtifact]]
@@ -217,59 +165,28 @@ class BambooJob:
     other: Optional[dict[str, Any]]
 
 
+@dataclass(frozen=True, slots=True)
 class BambooStage:
     """
     BambooStage represents a Bamboo stage as returned by the Bamboo REST API.
     """
 
-    def __init__(self, manual: bool, final: bool, jobs: dict[str, BambooJob]) -> None:
-        self.manual = manual
-        self.final = final
-        self.jobs = jobs
-
     manual: bool
     final: bool
-    jobs: dict[str, BambooJob]
+    jobs: Mapping[str, BambooJob]
 
 
+@dataclass(frozen=True, slots=True)
 class BambooRepository:
     """
     BambooRepository represents a Bamboo repository as returned by the Bamboo REST API.
     """
 
-    def __init__(
-        self,
-        repo_type: str,
-        url: str,
-        branch: str,
-        shared_credentials: str,
-        command_timeout_minutes: str,
-        lfs: bool,
-        verbose_logs: bool,
-        use_shallow_clones: bool,
-        cache_on_agents: bool,
-        submodules: bool,
-        ssh_key_applies_to_submodules: bool,
-        fetch_all: bool,
-    ) -> None:
-        self.repo_type = repo_type
-        self.url = url
-        self.branch = branch
-        self.shared_credentials = shared_credentials
-        self.command_timeout_minutes = command_timeout_minutes
-        self.lfs = lfs
-        self.verbose_logs = verbose_logs
-        self.use_shallow_clones = use_shallow_clones
-        self.cache_on_agents = cache_on_agents
-        self.submodules = submodules
-        self.ssh_key_applies_to_submodules = ssh_key_applies_to_submodules
-        self.fetch_all = fetch_all
-
     repo_type: str
     url: str
     branch: str
     shared_credentials: str
-    command_timout_minutes: str
+    command_timeout_minutes: str
     lfs: bool
     verbose_logs: bool
     use_shallow_clones: bool
@@ -279,31 +196,15 @@ class BambooRepository:
     fetch_all: bool
 
 
+@dataclass(frozen=True, slots=True)
 class BambooSpecs:
     """
     BambooSpecs represents the specs of a Bamboo plan as returned by the Bamboo REST API.
     """
 
-    def __init__(
-        self,
-        version: int,
-        plan: BambooPlan,
-        stages: dict[str, BambooStage],
-        variables: dict[str, str],
-        triggers: list[Any],
-        repositories: dict[str, BambooRepository],
-    ) -> None:
-        super().__init__()
-        self.version = version
-        self.plan = plan
-        self.stages = stages
-        self.variables = variables
-        self.triggers = triggers
-        self.repositories = repositories
-
     version: int
     plan: BambooPlan
-    stages: dict[str, BambooStage]
+    stages: Mapping[str, BambooStage]
     variables: dict[str, str]
     triggers: list[Any]
     repositories: dict[str, BambooRepository]
@@ -0,0 +1,226 @@
+"""
+Publishes many windfiles to one CI server, e.g. all exercises of a course at the start of the semester.
+The windfiles are merged, generated and published concurrently, the calls to the server are rate limited.
+"""
+import concurrent.futures
+import functools
+import os
+import time
+import traceback
+import typing
+from typing import Optional
+
+from classes.ci_credentials import CICredentials
+from classes.generated.definitions import Target
+from classes.generated.windfile import WindFile
+from classes.input_settings import InputSettings
+from classes.merger import Merger
+from classes.output_settings import OutputSettings
+from classes.pass_metadata import PassMetadata
+from cli_utils import logger, utils
+from cli_utils.http_client import RateLimiter, get_rate_limiter
+from generators.bamboo import BambooGenerator
+from generators.base import BaseGenerator
+from generators.jenkins import JenkinsGenerator
+
+PUBLISHERS: dict[Target, typing.Type[BaseGenerator]] = {
+    Target.jenkins: JenkinsGenerator,
+    Target.bamboo: BambooGenerator,
+}
+
+PUBLISHED: str = "published"
+UNCHANGED: str = "unchanged"
+# published to a target that cannot tell whether the job changed, e.g. bamboo
+SUBMITTED: str = "submitted"
+FAILED: str = "failed"
+
+STATUSES: typing.Tuple[str, ...] = (PUBLISHED, UNCHANGED, SUBMITTED, FAILED)
+
+
+class PublishResult:
+    """
+    Outcome of publishing one windfile.
+    """
+
+    name: str
+    status: str
+    key: Optional[str]
+    detail: Optional[str]
+    duration: float
+
+    def __init__(
+        self, name: str, status: str, duration: float, key: Optional[str] = None, detail: Optional[str] = None
+    ):
+        self.name = name
+        self.status = status
+        self.duration = duration
+        self.key = key
+        self.detail = detail
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """
+        Returns the result as a json serializable dictionary.
+        :return: result
+        """
+        return {
+            "name": self.name,
+            "status": self.status,
+            "key": self.key,
+            "detail": self.detail,
+            "duration": round(self.duration, 3),
+        }
+
+
+def collect_windfiles(source: str) -> typing.List[str]:
+    """
+    Collects the windfiles to publish. The source is either a directory, all .yaml and .yml files in it and its
+    subdirectories are used, or a manifest that lists the windfiles, one per line or as a YAML list, relative
+    to the manifest.
+    :param source: directory or manifest
+    :return: paths of the windfiles
+    """
+    if os.path.isdir(source):
+        found: typing.List[str] = []
+        for directory, _, files in os.walk(source):
+            found.extend(os.path.join(directory, file) for file in files if file.endswith((".yaml", ".yml")))
+        return sorted(found)
+    content: Optional[str] = utils.get_content_of(os.path.abspath(source))
+    if content is None:
+        raise ValueError(f"{source} is neither a directory nor a manifest")
+    listed: typing.Any = utils.load_yaml(content)
+    entries: typing.List[str] = listed if isinstance(listed, list) else content.splitlines()
+    base: str = os.path.dirname(os.path.abspath(source))
+    return [os.path.join(base, str(entry).strip()) for entry in entries if str(entry).strip()]
+
+
+def summary(results: typing.List[PublishResult], duration: float) -> dict[str, typing.Any]:
+    """
+    Counts the results per status.
+    :param results: results of all windfiles
+    :param duration: wall-clock time of the whole run in seconds
+    :return: number of published, unchanged, submitted and failed windfiles and the duration
+    """
+    counts: dict[str, typing.Any] = {
+        status: sum(1 for result in results if result.status == status) for status in STATUSES
+    }
+    counts["duration"] = round(duration, 3)
+    return counts
+
+
+def summary_table(results: typing.List[PublishResult], duration: float) -> str:
+    """
+    Formats the results as a table, followed by the number of windfiles per status.
+    :param results: results of all windfiles
+    :param duration: wall-clock time of the whole run in seconds
+    :return: table
+    """
+    width: int = max([len("windfile")] + [len(result.name) for result in results])
+    lines: typing.List[str] = [f"{'windfile':<{width}}  {'status':<10}{'duration':>10}  key / detail"]
+    for result in sorted(results, key=lambda item: item.name):
+        lines.append(
+            f"{result.name:<{width}}  {result.status:<10}{result.duration:>9.2f}s  "
+            f"{result.detail if result.status == FAILED else result.key or ''}"
+        )
+    counts: dict[str, typing.Any] = summary(results=results, duration=duration)
+    lines.append(", ".join(f"{counts[status]} {status}" for status in STATUSES) + f" in {duration:.2f}s")
+    return "\n".join(lines)
+
+
+class BulkPublisher:
+    """
+    Publishes windfiles to one CI server with a bounded number of workers. Every publication waits
+    for the rate limiter of the server, which is shared with all other publishers of the same server.
+    """
+
+    target: Target
+    credentials: CICredentials
+    workers: int
+    emoji: bool
+    rate_limiter: RateLimiter
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, target: Target, credentials: CICredentials, workers: int, rate: float, emoji: bool = False
+    ):
+        if target not in PUBLISHERS:
+            raise ValueError(f"Publishing is not supported for {target.value}")
+        self.target = target
+        self.credentials = credentials
+        self.workers = workers
+        self.emoji = emoji
+        self.rate_limiter = get_rate_limiter(server=credentials.url, rate=rate)
+
+    def publish_one(self, name: str, input_settings: InputSettings) -> PublishResult:
+        """
+        Merges, generates and publishes one windfile.
+        :param name: name of the windfile in the results
+        :param input_settings: input settings of the windfile, either a file or an already validated windfile
+        :return: result of the publication
+        """
+        started: float = time.monotonic()
+        output_settings: OutputSettings = OutputSettings(emoji=self.emoji, ci_credentials=self.credentials)
+        input_settings.target = self.target
+        try:
+            metadata: PassMetadata = PassMetadata()
+            windfile: Optional[WindFile] = Merger(
+                windfile=None, input_settings=input_settings, output_settings=output_settings, metadata=metadata
+            ).merge()
+            if windfile is None:
+                return PublishResult(
+                    name=name, status=FAILED, duration=time.monotonic() - started, detail="merging failed"
+                )
+            generator: BaseGenerator = PUBLISHERS[self.target](
+                windfile=windfile, input_settings=input_settings, output_settings=output_settings, metadata=metadata
+            )
+            self.rate_limiter.acquire()
+            generator.generate()
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            logger.error("❌", f"Publishing {name} failed: {exception}", self.emoji)
+            logger.debug("❌", traceback.format_exc(), self.emoji)
+            return PublishResult(name=name, status=FAILED, duration=time.monotonic() - started, detail=str(exception))
+        return PublishResult(
+            name=name,
+            status=SUBMITTED if generator.changed is None else PUBLISHED if generator.changed else UNCHANGED,
+            duration=time.monotonic() - started,
+            key=generator.key,
+        )
+
+    def publish_file(self, path: str) -> PublishResult:
+        """
+        Publishes the windfile at the given path.
+        :param path: path of the windfile
+        :return: result of the publication
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return self.publish_one(name=path, input_settings=InputSettings(file_path=path, file=file))
+        except OSError as error:
+            return PublishResult(name=path, status=FAILED, duration=0.0, detail=str(error))
+
+    def run(self, calls: typing.Iterable[typing.Callable[[], PublishResult]]) -> typing.Iterator[PublishResult]:
+        """
+        Runs the given publications concurrently and yields the results as soon as they are done.
+        :param calls: publications to run
+        :return: results in the order they finish
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="aeolus-publish"
+        ) as executor:
+            futures: typing.List[concurrent.futures.Future] = [executor.submit(call) for call in calls]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+
+    def publish(self, items: typing.Iterable[typing.Tuple[str, InputSettings]]) -> typing.Iterator[PublishResult]:
+        """
+        Publishes the given windfiles concurrently.
+        :param items: names and input settings of the windfiles
+        :return: results in the order they finish
+        """
+        return self.run(functools.partial(self.publish_one, name, input_settings) for name, input_settings in items)
+
+    def publish_files(self, paths: typing.Iterable[str]) -> typing.Iterator[PublishResult]:
+        """
+        Publishes the windfiles at the given paths concurrently.
+        :param paths: paths of the windfiles
+        :return: results in the order they finish
+        """
+        return self.run(functools.partial(self.publish_file, path) for path in paths)
@@ -0,0 +1,194 @@
+"""
+Translates many Bamboo build plans into windfiles, e.g. to migrate a whole Bamboo instance to another CI system.
+The specs are fetched concurrently over one pooled session, every windfile is written as soon as it is translated.
+Windfiles that already exist in the output directory are skipped, so an interrupted run can simply be started again.
+"""
+import concurrent.futures
+import os
+import tempfile
+import time
+import traceback
+import typing
+from typing import Optional
+
+from classes.bamboo_client import BambooClient, create_bamboo_session
+from classes.ci_credentials import CICredentials
+from classes.generated.definitions import Target
+from classes.generated.windfile import WindFile
+from classes.input_settings import InputSettings
+from classes.output_settings import OutputSettings
+from classes.translation_cache import PLAN_KEY_PATTERN
+from classes.translator import BambooTranslator, windfile_to_yaml
+from cli_utils import logger
+from cli_utils.http_client import RateLimiter, get_rate_limiter
+
+TRANSLATED: str = "translated"
+SKIPPED: str = "skipped"
+FAILED: str = "failed"
+
+
+class TranslationResult:
+    """
+    Outcome of translating one build plan.
+    """
+
+    plan_key: str
+    status: str
+    path: Optional[str]
+    detail: Optional[str]
+    duration: float
+
+    def __init__(
+        self, plan_key: str, status: str, duration: float, path: Optional[str] = None, detail: Optional[str] = None
+    ):
+        self.plan_key = plan_key
+        self.status = status
+        self.duration = duration
+        self.path = path
+        self.detail = detail
+
+
+def write_atomically(path: str, content: str) -> None:
+    """
+    Writes the given content to a temporary file next to the path and renames it afterwards,
+    so an interrupted run never leaves a partial windfile behind that would be skipped on resume.
+    :param path: path of the file
+    :param content: content to write
+    """
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def summary_table(results: typing.List[TranslationResult], duration: float) -> str:
+    """
+    Formats the failed plans as a table, followed by the number of plans per status.
+    :param results: results of all plans
+    :param duration: wall-clock time of the whole run in seconds
+    :return: table
+    """
+    failed: typing.List[TranslationResult] = sorted(
+        (result for result in results if result.status == FAILED), key=lambda item: item.plan_key
+    )
+    lines: typing.List[str] = [f"{result.plan_key}  {result.detail}" for result in failed]
+    counts: dict[str, int] = {
+        status: sum(1 for result in results if result.status == status) for status in (TRANSLATED, SKIPPED, FAILED)
+    }
+    lines.append(
+        f"{counts[TRANSLATED]} translated, {counts[SKIPPED]} skipped, {counts[FAILED]} failed in {duration:.2f}s"
+    )
+    return "\n".join(lines)
+
+
+class BulkTranslator:
+    """
+    Translates build plans with a bounded number of workers. All workers share one session with
+    retries and the rate limiter of the server, the translated windfiles are written to
+    <output_directory>/<plan key>.yaml.
+    """
+
+    output_directory: str
+    workers: int
+    overwrite: bool
+    emoji: bool
+    client: BambooClient
+    translator: BambooTranslator
+    rate_limiter: RateLimiter
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        credentials: CICredentials,
+        output_directory: str,
+        workers: int,
+        rate: float,
+        retries: int,
+        *,
+        overwrite: bool = False,
+        emoji: bool = False,
+    ):
+        self.output_directory = output_directory
+        self.workers = workers
+        self.overwrite = overwrite
+        self.emoji = emoji
+        # every plan is fetched once, remembering the specs of all plans would only keep them in memory
+        self.client = BambooClient(
+            credentials=credentials, session=create_bamboo_session(retries=retries, pool_size=workers), max_documents=0
+        )
+        self.translator = BambooTranslator(
+            input_settings=InputSettings(file_path=output_directory, target=Target.bamboo),
+            output_settings=OutputSettings(emoji=emoji),
+            credentials=credentials,
+            client=self.client,
+        )
+        self.rate_limiter = get_rate_limiter(server=credentials.url, rate=rate)
+
+    def output_path(self, plan_key: str) -> str:
+        """
+        Returns the path the windfile of the given plan is written to. The key becomes part of the path,
+        so keys that are no valid Bamboo plan keys, e.g. "../PLAN", are rejected.
+        :param plan_key: key of the build plan
+        :return: path of the windfile
+        """
+        if not PLAN_KEY_PATTERN.match(plan_key):
+            raise ValueError(f"{plan_key} is not a valid plan key")
+        return os.path.join(self.output_directory, f"{plan_key}.yaml")
+
+    def plan_keys(self, project_key: str) -> typing.List[str]:
+        """
+        Returns the keys of all plans of the given project.
+        :param project_key: key of the project
+        :return: keys of the plans
+        """
+        self.rate_limiter.acquire()
+        return self.client.get_plan_keys(project_key=project_key)
+
+    def translate_one(self, plan_key: str) -> TranslationResult:
+        """
+        Translates one build plan and writes its windfile, unless it was already translated.
+        :param plan_key: key of the build plan
+        :return: result of the translation
+        """
+        started: float = time.monotonic()
+        try:
+            path: str = self.output_path(plan_key=plan_key)
+        except ValueError as exception:
+            logger.error("❌", f"Translating {plan_key} failed: {exception}", self.emoji)
+            return TranslationResult(plan_key=plan_key, status=FAILED, duration=0.0, detail=str(exception))
+        if not self.overwrite and os.path.exists(path):
+            return TranslationResult(plan_key=plan_key, status=SKIPPED, duration=0.0, path=path)
+        try:
+            self.rate_limiter.acquire()
+            windfile: Optional[WindFile] = self.translator.to_windfile(plan_key=plan_key)
+            if windfile is None:
+                return TranslationResult(
+                    plan_key=plan_key, status=FAILED, duration=time.monotonic() - started, detail="no specs found"
+                )
+            write_atomically(path=path, content=windfile_to_yaml(windfile=windfile))
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            logger.error("❌", f"Translating {plan_key} failed: {exception}", self.emoji)
+            logger.debug("❌", traceback.format_exc(), self.emoji)
+            return TranslationResult(
+                plan_key=plan_key, status=FAILED, duration=time.monotonic() - started, detail=str(exception)
+            )
+        return TranslationResult(plan_key=plan_key, status=TRANSLATED, duration=time.monotonic() - started, path=path)
+
+    def translate(self, plan_keys: typing.Iterable[str]) -> typing.Iterator[TranslationResult]:
+        """
+        Translates the given build plans concurrently.
+        :param plan_keys: keys of the build plans
+        :return: results in the order they finish
+        """
+        os.makedirs(self.output_directory, exist_ok=True)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="aeolus-translate"
+        ) as executor:
+            futures: typing.List[concurrent.futures.Future] = [
+                executor.submit(self.translate_one, plan_key) for plan_key in dict.fromkeys(plan_keys)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
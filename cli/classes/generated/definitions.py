@@ -6,7 +6,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field, RootModel, constr
+from pydantic import BaseModel, ConfigDict, Field, RootModel, conint, constr
 
 
 class Model(RootModel):
@@ -99,6 +99,20 @@ class Repository(BaseModel):
     path: str = Field(
         ..., description='The path where the content of the repository should be checked out', examples=['.', 'tests']
     )
+    depth: Optional[conint(ge=1)] = Field(
+        None, description='Number of commits to fetch, omit it to fetch the full history', examples=[1]
+    )
+    reference: Optional[str] = Field(
+        None,
+        description='Path to a local mirror of the repository on the agent, objects that are available there are not downloaded again',
+        examples=['/var/cache/git/aeolus.git'],
+    )
+    noTags: Optional[bool] = Field(None, description='If this is set to true, tags are not fetched')
+    sparseCheckout: Optional[List[str]] = Field(
+        None,
+        description='Paths to check out, omit it to check out the whole repository',
+        examples=[['src', 'build.gradle']],
+    )
 
 
 class GitCredentials(BaseModel):
@@ -147,6 +161,11 @@ class FileAction(BaseModel):
     results: Optional[List[Result]] = Field(
         None, description='The results of the action. For the CI system to keep/publish.'
     )
+    needs: Optional[List[str]] = Field(
+        None,
+        description='Names of the actions that need to be finished before this action starts. If any action sets this, independent actions can run in parallel. Actions without it wait for the action before them.',
+        examples=[['build']],
+    )
 
 
 class PlatformAction(BaseModel):
@@ -214,6 +233,11 @@ class ScriptAction(BaseModel):
     results: Optional[List[Result]] = Field(
         None, description='The results of the action. For the CI system to keep/publish.'
     )
+    needs: Optional[List[str]] = Field(
+        None,
+        description='Names of the actions that need to be finished before this action starts. If any action sets this, independent actions can run in parallel. Actions without it wait for the action before them.',
+        examples=[['build']],
+    )
 
 
 class TemplateAction(BaseModel):
@@ -247,6 +271,11 @@ class TemplateAction(BaseModel):
     results: Optional[List[Result]] = Field(
         None, description='The results of the action. For the CI system to keep/publish.'
     )
+    needs: Optional[List[str]] = Field(
+        None,
+        description='Names of the actions that need to be finished before this action starts. If any action sets this, independent actions can run in parallel. Actions without it wait for the action before them.',
+        examples=[['build']],
+    )
 
 
 class WindfileMetadata(BaseModel):
@@ -1,22 +1,45 @@
 """
 Settings for the input.
 """
+import os
 from io import TextIOWrapper
 from typing import Optional
 
 from classes.generated.definitions import Target
+from classes.generated.windfile import WindFile
 
 
 class InputSettings:
     """
-    Settings for the input file.
+    Settings for the input file. Instead of a file, an already validated windfile can be given,
+    e.g. by the api. Relative file actions are then resolved against the given base directory.
     """
 
     file_path: str
     file: Optional[TextIOWrapper]
     target: Optional[Target]
+    windfile: Optional[WindFile]
+    base_directory: Optional[str]
 
-    def __init__(self, file_path: str, target: Optional[Target] = None, file: Optional[TextIOWrapper] = None):
+    def __init__(
+        self,
+        file_path: str,
+        target: Optional[Target] = None,
+        file: Optional[TextIOWrapper] = None,
+        windfile: Optional[WindFile] = None,
+        base_directory: Optional[str] = None,
+    ):  # pylint: disable=too-many-arguments
         self.file_path = file_path
         self.target = target
         self.file = file
+        self.windfile = windfile
+        self.base_directory = base_directory
+
+    def working_directory(self) -> str:
+        """
+        Returns the directory relative paths in the input are resolved against.
+        :return: base directory if set, otherwise the directory of the input file
+        """
+        if self.base_directory is not None:
+            return os.path.abspath(self.base_directory)
+        return os.path.dirname(os.path.abspath(self.file_path))
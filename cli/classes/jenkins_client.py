@@ -0,0 +1,158 @@
+"""
+Shared client for a Jenkins server. Publishing many pipelines to the same server reuses one connection,
+remembers the folders that already exist for a while and skips jobs whose pipeline did not change.
+"""
+import hashlib
+import os
+import threading
+import time
+import typing
+from typing import Optional
+from xml.dom.minidom import Document, Element, parseString
+
+import jenkins  # type: ignore
+
+from classes.ci_credentials import CICredentials
+
+PIPELINE_CONFIG: str = """
+    <flow-definition plugin="workflow-job">
+        <description/>
+        <keepDependencies>false</keepDependencies>
+        <definition class="org.jenkinsci.plugins.workflow.cps.CpsFlowDefinition" plugin="workflow-cps">
+        <script/>
+        <sandbox>true</sandbox>
+        </definition>
+        <triggers/>
+        <disabled>false</disabled>
+        <properties>
+        <hudson.security.AuthorizationMatrixProperty>
+            <inheritanceStrategy class="org.jenkinsci.plugins.matrixauth.inheritance.InheritParentStrategy"/>
+        </hudson.security.AuthorizationMatrixProperty>
+        </properties>
+    </flow-definition>
+"""
+
+
+def script_hash(script: str) -> str:
+    """
+    Returns the hash of the given pipeline script.
+    :param script: pipeline script
+    :return: hex digest
+    """
+    return hashlib.sha256(script.encode("utf-8")).hexdigest()
+
+
+class JenkinsClient:
+    """
+    Connection to one Jenkins server. The folders that exist and the hashes of the published pipelines
+    are remembered for ttl seconds, so publishing an unchanged pipeline again does not send any request.
+    Afterwards, the folders and jobs are checked on the server again, so jobs that were deleted or edited
+    on the server are corrected. If a job is not known, its configuration is only updated if the
+    pipeline script differs.
+    """
+
+    server: jenkins.Jenkins
+    ttl: float
+    folders: dict[str, float]
+    published: dict[str, typing.Tuple[str, float]]
+
+    def __init__(self, server: jenkins.Jenkins, ttl: Optional[float] = None):
+        self.server = server
+        self.ttl = ttl if ttl is not None else float(os.getenv("JENKINS_PUBLISH_CACHE_TTL", "300"))
+        self.folders = {}
+        self.published = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def is_fresh(self, remembered_at: Optional[float]) -> bool:
+        """
+        Checks whether something remembered at the given time can still be trusted.
+        :param remembered_at: monotonic time it was remembered at, None if it is not known
+        :return: True if it is younger than the ttl
+        """
+        return remembered_at is not None and time.monotonic() - remembered_at < self.ttl
+
+    def folders_of(self, job_name: str) -> typing.List[str]:
+        """
+        Returns the folders of the given job, outermost first.
+        :param job_name: name of the job, folders are separated by /
+        :return: names of the folders
+        """
+        path: typing.List[str] = job_name.split("/")
+        return ["/".join(path[:index]) for index in range(1, len(path))]
+
+    def create_folders(self, job_name: str) -> None:
+        """
+        Creates the folders of the given job that are not known yet.
+        :param job_name: name of the job, folders are separated by /
+        """
+        for folder in self.folders_of(job_name):
+            with self._lock:
+                if self.is_fresh(self.folders.get(folder)):
+                    continue
+            self.server.create_folder(folder, ignore_failures=True)
+            with self._lock:
+                self.folders[folder] = time.monotonic()
+
+    def forget(self, job_name: str) -> None:
+        """
+        Forgets the given job and its folders, so they are checked on the server the next time.
+        :param job_name: name of the job, folders are separated by /
+        """
+        with self._lock:
+            self.published.pop(job_name, None)
+            for folder in self.folders_of(job_name):
+                self.folders.pop(folder, None)
+
+    def publish(self, job_name: str, script: str) -> bool:
+        """
+        Creates or updates the pipeline job with the given script.
+        :param job_name: name of the job, folders are separated by /
+        :param script: pipeline script
+        :return: True if the job was created or updated, False if it was unchanged
+        """
+        digest: str = script_hash(script)
+        with self._lock:
+            known: Optional[typing.Tuple[str, float]] = self.published.get(job_name)
+            if known is not None and known[0] == digest and self.is_fresh(known[1]):
+                return False
+        self.create_folders(job_name)
+        exists: bool = self.server.job_exists(job_name)
+        config_xml: Document = parseString(self.server.get_job_config(job_name) if exists else PIPELINE_CONFIG)
+        element: Element = config_xml.getElementsByTagName("script")[0]
+        current: str = "".join(node.data for node in element.childNodes if node.nodeType == node.TEXT_NODE)
+        changed: bool = not exists or current != script
+        if changed:
+            for child in list(element.childNodes):
+                element.removeChild(child)
+            element.appendChild(config_xml.createTextNode(script))
+            try:
+                if exists:
+                    self.server.reconfig_job(job_name, config_xml.toxml())
+                else:
+                    self.server.create_job(job_name, config_xml.toxml())
+            except jenkins.JenkinsException:
+                # a folder might have been deleted on the server, so it is created again next time
+                self.forget(job_name)
+                raise
+        with self._lock:
+            self.published[job_name] = (digest, time.monotonic())
+        return changed
+
+
+_clients: dict[typing.Tuple[str, Optional[str], str], JenkinsClient] = {}
+_clients_lock: threading.Lock = threading.Lock()
+
+
+def get_jenkins_client(credentials: CICredentials) -> JenkinsClient:
+    """
+    Returns the shared client for the server and user of the given credentials.
+    :param credentials: credentials of the Jenkins server
+    :return: client
+    """
+    key: typing.Tuple[str, Optional[str], str] = (credentials.url, credentials.username, credentials.token)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = JenkinsClient(
+                server=jenkins.Jenkins(credentials.url, username=credentials.username, password=credentials.token)
+            )
+        return _clients[key]
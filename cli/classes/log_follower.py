@@ -0,0 +1,145 @@
+"""
+Follows the output of a running CI job line by line and hands every line to a set of sinks.
+The "⚙️ executing <step>" markers printed by the generated scripts are used to time every step,
+steps that run in parallel additionally print "⚙️ finished <step>" when they end.
+"""
+import codecs
+import re
+import threading
+import time
+import typing
+from typing import Callable, List, Optional, TextIO
+
+from docker.errors import DockerException  # type: ignore
+from docker.models.containers import Container  # type: ignore
+
+STEP_MARKER: re.Pattern = re.compile(r"⚙️ executing (\S+)")
+FINISHED_MARKER: re.Pattern = re.compile(r"⚙️ finished (\S+)")
+
+LogSink = Callable[[str], None]
+
+
+def stdout_sink(line: str) -> None:
+    """
+    Prints the given line.
+    :param line: line of the log
+    """
+    print(line, flush=True)
+
+
+class FileSink:
+    """
+    Appends every line of the log to a file.
+    """
+
+    file: TextIO
+
+    def __init__(self, path: str):
+        self.file = open(path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def __call__(self, line: str) -> None:
+        self.file.write(line + "\n")
+
+    def close(self) -> None:
+        """
+        Closes the file.
+        """
+        self.file.close()
+
+
+class LogFollower:
+    """
+    Decodes the output of a CI job incrementally, so multibyte characters and lines that are split
+    across chunks stay intact, and hands every complete line to the sinks.
+    """
+
+    sinks: List[LogSink]
+    timings: dict[str, float]
+    exit_code: Optional[int]
+
+    def __init__(self, sinks: List[LogSink]):
+        self.sinks = sinks
+        self.timings = {}
+        self.exit_code = None
+        self._decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer: str = ""
+        # start of every running step and its end if it is only known from the start of a later step
+        self._running_steps: dict[str, typing.Tuple[float, Optional[float]]] = {}
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Adds a chunk of the output, all lines that are complete afterwards are emitted.
+        :param chunk: raw output
+        """
+        self._buffer += self._decoder.decode(chunk)
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            self.emit(line.rstrip("\r"))
+
+    def flush(self) -> None:
+        """
+        Emits the remaining output and finishes the timing of the steps that are still running.
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        if self._buffer:
+            self.emit(self._buffer.rstrip("\r"))
+            self._buffer = ""
+        now: float = time.monotonic()
+        for name, (_, ended) in list(self._running_steps.items()):
+            self.finish_step(name=name, now=ended if ended is not None else now)
+
+    def emit(self, line: str) -> None:
+        """
+        Hands the given line to all sinks and starts or finishes the timing of a step if the line marks one.
+        Sequential steps end when the next step starts, unless they print their own end marker,
+        so the output of parallel steps can interleave.
+        :param line: complete line of the log
+        """
+        started: Optional[re.Match] = STEP_MARKER.search(line)
+        finished: Optional[re.Match] = FINISHED_MARKER.search(line)
+        if started is not None:
+            now: float = time.monotonic()
+            for name, (start, ended) in self._running_steps.items():
+                if ended is None:
+                    self._running_steps[name] = (start, now)
+            self._running_steps[started.group(1)] = (now, None)
+        elif finished is not None:
+            self.finish_step(name=finished.group(1), now=time.monotonic())
+        for sink in self.sinks:
+            sink(line)
+
+    def finish_step(self, name: str, now: float) -> None:
+        """
+        Records the duration of the given step.
+        :param name: name of the step
+        :param now: end of the step
+        """
+        if name not in self._running_steps:
+            return
+        started, _ = self._running_steps.pop(name)
+        self.timings[name] = self.timings.get(name, 0.0) + now - started
+
+    def follow(self, container: Container) -> Optional[int]:
+        """
+        Follows the output of the given container until it exits. The exit code is awaited in a
+        background thread, so following the logs does not need to poll the state of the container.
+        :param container: running container
+        :return: exit code of the container or None if it could not be determined
+        """
+        waiter: threading.Thread = threading.Thread(target=self.wait, args=(container,), daemon=True)
+        waiter.start()
+        for chunk in container.logs(stream=True, follow=True, stdout=True, stderr=True):
+            self.feed(chunk)
+        self.flush()
+        waiter.join()
+        return self.exit_code
+
+    def wait(self, container: Container) -> None:
+        """
+        Waits for the given container to exit and stores its exit code.
+        :param container: running container
+        """
+        try:
+            self.exit_code = container.wait()["StatusCode"]
+        except DockerException:
+            self.exit_code = None
@@ -8,7 +8,9 @@ import typing
 from typing import List, Optional
 import yaml
 from git import Repo
+from git.exc import GitCommandError
 
+from classes.action_cache import ActionCache, shared_action_cache, split_reference
 from classes.generated.actionfile import ActionFile
 from classes.generated.definitions import (
     Parameters,
@@ -28,7 +30,7 @@ from classes.pass_metadata import PassMetadata
 from classes.output_settings import OutputSettings
 from classes.pass_settings import PassSettings
 from classes.validator import (
-    read_action_file,
+    read_action_file_from_path,
     get_platform_actions,
     get_template_actions,
     get_file_actions,
@@ -188,7 +190,7 @@ class Merger(PassSettings):
         if not action.use:
             logger.error("❌ ", f"{action.use} not found", self.output_settings.emoji)
             return None
-        slug: str = action.use
+        slug, reference = split_reference(slug=action.use)
         if "/" not in slug:
             # we default to the ls1intum organization on GitHub
             slug = f"https://github.com/ls1intum/{slug}.git"
@@ -196,20 +198,47 @@ class Merger(PassSettings):
             logger.error("❌ ", f"{slug} is not a git repository", self.output_settings.emoji)
             return None
         logger.info("📄 ", f"pulling {slug}", self.output_settings.emoji)
+        cache: Optional[ActionCache] = shared_action_cache()
+        if cache is not None:
+            with cache.checkout(url=slug, reference=reference) as cached:
+                if not cached:
+                    logger.error(
+                        "❌ ", f"{slug} could not be cloned, make sure it is public", self.output_settings.emoji
+                    )
+                    return None
+                return self.convert_pulled_action(slug=slug, directory=cached)
         with tempfile.TemporaryDirectory() as tmp:
-            repo: Repo = Repo.clone_from(url=slug, to_path=tmp)
-            if not repo:
+            try:
+                repo: Repo = Repo.clone_from(url=slug, to_path=tmp, depth=1)
+                if reference:
+                    # branches, tags and commits can all be fetched by name, cloning only accepts the first two
+                    repo.git.fetch("origin", reference, depth=1)
+                    repo.git.checkout("--force", "--detach", "FETCH_HEAD")
+                repo.close()
+            except GitCommandError:
                 logger.error("❌ ", f"{slug} could not be cloned, make sure it is public", self.output_settings.emoji)
                 return None
-            default_name: str = "action.yaml"
-            if not os.path.exists(os.path.join(tmp, default_name)):
-                logger.error("❌ ", f"{slug} does not contain an action.yaml", self.output_settings.emoji)
-                return None
-            actionfile: Optional[ActionFile] = self.read_external_action_file(path=os.path.join(tmp, default_name))
-            if not actionfile:
-                logger.error("❌ ", f"{slug} does not contain an action.yaml", self.output_settings.emoji)
-                return None
-            return self.convert_actionfile_to_script_actions(actionfile=actionfile, absolute_path=tmp)
+            return self.convert_pulled_action(slug=slug, directory=tmp)
+
+    def convert_pulled_action(
+        self, slug: str, directory: str
+    ) -> Optional[typing.Tuple[typing.List[str], typing.List[Action]]]:
+        """
+        Reads the action.yaml of the given pulled repository and converts it to internal actions.
+        :param slug: Url of the pulled repository
+        :param directory: Directory the repository was pulled to
+        :return: Tuple of the original types and the converted actions
+        """
+        default_name: str = "action.yaml"
+        path: str = os.path.join(directory, default_name)
+        if not os.path.exists(path):
+            logger.error("❌ ", f"{slug} does not contain an action.yaml", self.output_settings.emoji)
+            return None
+        actionfile: Optional[ActionFile] = self.read_external_action_file(path=path)
+        if not actionfile:
+            logger.error("❌ ", f"{slug} does not contain an action.yaml", self.output_settings.emoji)
+            return None
+        return self.convert_actionfile_to_script_actions(actionfile=actionfile, absolute_path=path)
 
     def set_original_names(self, names: List[str]) -> None:
         """
@@ -250,8 +279,7 @@ class Merger(PassSettings):
         if not os.path.exists(path):
             logger.error("❌ ", f"{path} does not exist", self.output_settings.emoji)
             return None
-        with open(path, encoding="utf-8") as file:
-            return read_action_file(file=file, output_settings=self.output_settings)
+        return read_action_file_from_path(path=path, output_settings=self.output_settings)
 
     def traverse_external_actions(
         self,
@@ -362,6 +390,9 @@ class Merger(PassSettings):
                 action,
             )
             merge_docker(self.windfile.metadata.docker, action)
+            if index == 0 and isinstance(action.root, ScriptAction):
+                # the inlined actions run one after another, so only the first one waits for the needs
+                action.root.needs = getattr(self.windfile.actions[original_index].root, "needs", None)
             logger.info(
                 "➕",
                 f"adding action {action}",
@@ -417,6 +448,7 @@ class Merger(PassSettings):
                             platform=internals.root.platform,
                             docker=internals.root.docker,
                             runAlways=internals.root.runAlways,
+                            needs=None,
                         )
                     )
 
@@ -466,6 +498,7 @@ class Merger(PassSettings):
                             platform=internals.root.platform,
                             docker=internals.root.docker,
                             runAlways=internals.root.runAlways,
+                            needs=None,
                         )
                     )
                 if internal:
@@ -493,9 +526,35 @@ class Merger(PassSettings):
             self.output_settings.emoji,
         )
 
+        original_types: List[str] = []
+        actions: typing.List[Action] = []
+        if isinstance(action, TemplateAction):
+            logger.info(
+                "📄 ",
+                f"reading external action {absolute_path}",
+                self.output_settings.emoji,
+            )
+            actionfile: Optional[ActionFile] = read_action_file_from_path(
+                path=absolute_path, output_settings=self.output_settings
+            )
+            if not actionfile:
+                return None
+            external_converted: Optional[
+                typing.Tuple[
+                    typing.List[str],
+                    typing.List[Action],
+                ]
+            ] = self.convert_actionfile_to_script_actions(
+                actionfile=actionfile,
+                absolute_path=absolute_path,
+            )
+            if not external_converted:
+                return None
+            original_types.extend(external_converted[0])
+            actions.extend(external_converted[1])
+            return original_types, actions
+
         with open(absolute_path, encoding="utf-8") as file:
-            original_types: List[str] = []
-            actions: typing.List[Action] = []
             if isinstance(action, FileAction):
                 original_types.append("file")
                 actions.append(
@@ -511,6 +570,7 @@ class Merger(PassSettings):
                             platform=action.platform,
                             docker=action.docker,
                             runAlways=action.runAlways,
+                            needs=action.needs,
                         )
                     )
                 )
@@ -533,32 +593,10 @@ class Merger(PassSettings):
                             platform=action.platform,
                             docker=action.docker,
                             runAlways=action.runAlways,
+                            needs=None,
                         )
                     )
                 )
-            if isinstance(action, TemplateAction):
-                logger.info(
-                    "📄 ",
-                    f"reading external action {absolute_path}",
-                    self.output_settings.emoji,
-                )
-                actionfile: Optional[ActionFile] = read_action_file(file=file, output_settings=self.output_settings)
-                if actionfile:
-                    external_converted: Optional[
-                        typing.Tuple[
-                            typing.List[str],
-                            typing.List[Action],
-                        ]
-                    ] = self.convert_actionfile_to_script_actions(
-                        actionfile=actionfile,
-                        absolute_path=absolute_path,
-                    )
-
-                if external_converted:
-                    original_types.extend(external_converted[0])
-                    actions.extend(external_converted[1])
-                else:
-                    return None
             return original_types, actions
 
     def pwd(self) -> str:
@@ -566,7 +604,7 @@ class Merger(PassSettings):
         Returns the current working directory of the windfile.
         :return: Current working directory of the windfile
         """
-        return os.path.dirname(os.path.abspath(self.input_settings.file_path))
+        return self.input_settings.working_directory()
 
     def merge(self) -> Optional[WindFile]:
         """
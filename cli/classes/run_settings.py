@@ -1,15 +1,27 @@
 """
 Run settings for the CI job.
 """
+from typing import Callable, Optional
+
 from classes.generated.definitions import Lifecycle
 
 
 class RunSettings:
     """
-    Run settings for the CI job.
+    Run settings for the CI job. The output of the job is printed, and additionally
+    written to log_file and handed to log_callback line by line if they are set.
     """
 
-    def __init__(self, stage: Lifecycle = Lifecycle.preparation):
+    def __init__(
+        self,
+        stage: Lifecycle = Lifecycle.preparation,
+        log_file: Optional[str] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+    ):
         self.stage = stage
+        self.log_file = log_file
+        self.log_callback = log_callback
 
     stage: Lifecycle
+    log_file: Optional[str]
+    log_callback: Optional[Callable[[str], None]]
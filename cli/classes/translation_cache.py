@@ -0,0 +1,163 @@
+"""
+On-disk cache for translated Bamboo plans. Every entry stores the raw specs of a plan together with the
+translated windfile and is keyed by the plan key and the hash of the specs, so translating an unchanged
+plan again only costs a file lookup instead of converting the specs.
+"""
+import functools
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Optional
+
+from classes.generated.windfile import WindFile
+from cli_utils import logger
+
+# bump if the translation changes, so windfiles of an older translation are not reused
+CACHE_VERSION: str = "1"
+
+# bamboo plan keys are the project key and the plan key, e.g. COURSE-EXERCISE, branch plans add another part
+PLAN_KEY_PATTERN: re.Pattern = re.compile(r"^[A-Z0-9]+(-[A-Z0-9]+)+$")
+
+ENTRY_PATTERN: re.Pattern = re.compile(r"^[0-9a-f]{64}\.json$")
+
+
+def specs_hash(code: str) -> str:
+    """
+    Returns the hash of the given specs, including the version of the translation.
+    :param code: specs of a plan as returned by Bamboo
+    :return: hex digest
+    """
+    return hashlib.sha256(f"{CACHE_VERSION}\n{code}".encode("utf-8")).hexdigest()
+
+
+class TranslationCacheEntry:
+    """
+    A cached translation of a plan.
+    """
+
+    plan_key: str
+    digest: str
+    specs: str
+    windfile: WindFile
+
+    def __init__(self, plan_key: str, digest: str, specs: str, windfile: WindFile):
+        self.plan_key = plan_key
+        self.digest = digest
+        self.specs = specs
+        self.windfile = windfile
+
+
+class TranslationCache:
+    """
+    On-disk cache for translated plans. Every entry lives in <directory>/<plan key>/<specs hash>.json,
+    only the latest translation of a plan is kept.
+    """
+
+    directory: str
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock: threading.Lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def plan_directory(self, plan_key: str) -> str:
+        """
+        Returns the directory of the entries of the given plan. The key becomes part of the path,
+        so keys that are no valid Bamboo plan keys, e.g. "..", are rejected.
+        :param plan_key: key of the plan
+        :return: path of the directory
+        """
+        if not PLAN_KEY_PATTERN.match(plan_key):
+            raise ValueError(f"{plan_key} is not a valid plan key")
+        return os.path.join(self.directory, plan_key)
+
+    def read(self, path: str) -> Optional[TranslationCacheEntry]:
+        """
+        Reads the entry at the given path.
+        :param path: path of the entry
+        :return: entry or None if it does not exist or cannot be read
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                content: dict[str, str] = json.load(file)
+            return TranslationCacheEntry(
+                plan_key=content["plan_key"],
+                digest=content["digest"],
+                specs=content["specs"],
+                windfile=WindFile.model_validate_json(content["windfile"]),
+            )
+        except (OSError, ValueError, KeyError) as error:
+            logger.debug("📦 ", f"ignoring unreadable translation cache entry {path}: {error}", False)
+            return None
+
+    def get(self, plan_key: str, code: str) -> Optional[TranslationCacheEntry]:
+        """
+        Returns the cached translation of the given specs of the given plan.
+        :param plan_key: key of the plan
+        :param code: specs of the plan
+        :return: entry or None if the specs were not translated yet
+        """
+        return self.read(os.path.join(self.plan_directory(plan_key=plan_key), f"{specs_hash(code)}.json"))
+
+    def latest(self, plan_key: str) -> Optional[TranslationCacheEntry]:
+        """
+        Returns the most recent translation of the given plan, regardless of its current specs.
+        :param plan_key: key of the plan
+        :return: entry or None if the plan was never translated
+        """
+        try:
+            entries: list[os.DirEntry] = [
+                entry for entry in os.scandir(self.plan_directory(plan_key=plan_key)) if ENTRY_PATTERN.match(entry.name)
+            ]
+        except OSError:
+            return None
+        if not entries:
+            return None
+        return self.read(max(entries, key=lambda entry: entry.stat().st_mtime).path)
+
+    def put(self, plan_key: str, code: str, windfile: WindFile) -> None:
+        """
+        Stores the translation of the given specs, older translations of the plan are removed.
+        The entry is written atomically, so concurrent translations never read a partial entry.
+        :param plan_key: key of the plan
+        :param code: specs of the plan
+        :param windfile: translated windfile
+        """
+        directory: str = self.plan_directory(plan_key=plan_key)
+        digest: str = specs_hash(code)
+        content: dict[str, str] = {
+            "plan_key": plan_key,
+            "digest": digest,
+            "specs": code,
+            "windfile": windfile.model_dump_json(),
+        }
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            file_descriptor, path = tempfile.mkstemp(dir=directory, prefix=".entry-")
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                json.dump(content, file)
+            os.replace(path, os.path.join(directory, f"{digest}.json"))
+            for entry in os.scandir(directory):
+                if ENTRY_PATTERN.match(entry.name) and entry.name != f"{digest}.json":
+                    os.remove(entry.path)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_translation_cache() -> Optional[TranslationCache]:
+    """
+    Returns the translation cache shared by all translations in this process. It is stored in
+    AEOLUS_TRANSLATION_CACHE_DIR and disabled with AEOLUS_TRANSLATION_CACHE=false.
+    :return: translation cache or None if caching is disabled
+    """
+    if os.getenv("AEOLUS_TRANSLATION_CACHE", "true").lower() != "true":
+        return None
+    cache_home: str = os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    directory: str = os.getenv("AEOLUS_TRANSLATION_CACHE_DIR", os.path.join(cache_home, "aeolus", "translations"))
+    try:
+        return TranslationCache(directory=directory)
+    except OSError as error:
+        logger.error("❌ ", f"translation cache disabled, {directory} is not usable: {error}", False)
+        return None
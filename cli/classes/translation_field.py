@@ -0,0 +1,14 @@
+"""
+Parts of a windfile that can be selected when translating a build plan.
+"""
+from enum import Enum
+
+
+class TranslationField(Enum):
+    """
+    Part of a translated windfile. The metadata is always translated, as every windfile needs it.
+    """
+
+    METADATA = "metadata"
+    ACTIONS = "actions"
+    REPOSITORIES = "repositories"
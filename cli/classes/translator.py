@@ -1,13 +1,15 @@
 """
 This file contains the translator for Bamboo. It converts the reponse of the Bamboo REST API into a Windfile.
 """
+import functools
+import os
 import re
 import typing
-from typing import Optional, Tuple, Any
+from typing import Optional, Any, Mapping, Set
 
 import yaml
 
-from classes.bamboo_client import BambooClient
+from classes.bamboo_client import BambooClient, get_bamboo_client, parse_plan_code
 from classes.bamboo_specs import (
     BambooSpecs,
     BambooPlan,
@@ -42,6 +44,8 @@ from classes.generated.windfile import WindFile
 from classes.input_settings import InputSettings
 from classes.output_settings import OutputSettings
 from classes.pass_settings import PassSettings
+from classes.translation_cache import TranslationCache, TranslationCacheEntry, shared_translation_cache
+from classes.translation_field import TranslationField
 from classes.yaml_dumper import YamlDumper
 from cli_utils import logger, utils
 
@@ -135,6 +139,21 @@ def extract_action_name(task: BambooTask) -> str:
     return task.description.replace(" ", "_").lower()
 
 
+# removes everything from a condition that cannot be part of a lifecycle, e.g. the quotes around the values
+CONDITION_PATTERN: re.Pattern = re.compile(r"[^a-zA-Z |_]")
+
+
+@functools.lru_cache(maxsize=None)
+def parse_lifecycles(condition: str) -> typing.Tuple[Lifecycle, ...]:
+    """
+    Converts the given condition of a task into the lifecycles it matches, e.g. "working_time|evaluation".
+    Plans of a Bamboo instance share only a handful of conditions, so every condition is only parsed once.
+    :param condition: value of the condition
+    :return: lifecycles the condition matches
+    """
+    return tuple(Lifecycle[entry] for entry in CONDITION_PATTERN.sub("", condition).split("|"))
+
+
 def extract_action(job: BambooJob, task: BambooTask, environment: EnvironmentSchema) -> Optional[Action]:
     """
     Converts the given task of the given Job into an Action.
@@ -148,10 +167,7 @@ def extract_action(job: BambooJob, task: BambooTask, environment: EnvironmentSch
     if task.condition is not None:
         for condition in task.condition.variables:
             for match in condition.matches:
-                regex = re.compile(r"[^a-zA-Z |_]")
-                lifecycle = condition.matches[match]
-                for entry in regex.sub("", lifecycle).split("|"):
-                    exclude.append(Lifecycle[entry])
+                exclude.extend(parse_lifecycles(condition=condition.matches[match]))
     docker: Optional[Docker] = parse_docker(docker_config=job.docker, environment=environment)
     envs: Environment = parse_env_variables(environment=environment, variables=task.environment)
     params: Parameters = parse_arguments(environment=environment, task=task)
@@ -179,6 +195,7 @@ def extract_action(job: BambooJob, task: BambooTask, environment: EnvironmentSch
                         ],
                         platform=None,
                         runAlways=task.always_execute,
+                        needs=None,
                     )
                 )
             else:
@@ -214,6 +231,7 @@ def extract_action(job: BambooJob, task: BambooTask, environment: EnvironmentSch
                 results=None,
                 platform=None,
                 runAlways=task.always_execute,
+                needs=None,
             )
         )
     return action
@@ -296,6 +314,7 @@ def add_results_to_action(junit_action: PlatformAction, actions: list[Action], r
                     results=results,
                     platform=None,
                     runAlways=junit_action.runAlways,
+                    needs=None,
                 )
             )
         )
@@ -331,7 +350,7 @@ def convert_junit_tasks_to_results(actions: list[Action], homeless_junit_actions
         add_results_to_action(junit_action=junit_action, actions=actions, results=results)
 
 
-def extract_actions(stages: dict[str, BambooStage], environment: EnvironmentSchema) -> list[Action]:
+def extract_actions(stages: Mapping[str, BambooStage], environment: EnvironmentSchema) -> list[Action]:
     """
     Converts all jobs and tasks from the given stages (from the REST API)
     into a dictionary of ScriptActions.
@@ -369,7 +388,7 @@ def extract_actions(stages: dict[str, BambooStage], environment: EnvironmentSche
 
 
 def extract_repositories(
-    stages: dict[str, BambooStage], repositories: dict[str, BambooRepository]
+    stages: Mapping[str, BambooStage], repositories: dict[str, BambooRepository]
 ) -> dict[str, Repository]:
     """
     Extracts the repositories from the given stages. So we can add them to the windfile.
@@ -388,17 +407,55 @@ def extract_repositories(
                         url=repositories[checkout.repository].url,
                         branch=repositories[checkout.repository].branch,
                         path=checkout.path,
+                        depth=None,
+                        reference=None,
+                        noTags=None,
+                        sparseCheckout=None,
                     )
                     found[checkout.repository] = repository
     return found
 
 
+def select_fields(windfile: WindFile, fields: Optional[Set[TranslationField]]) -> WindFile:
+    """
+    Removes the parts of the given windfile that are not selected.
+    :param windfile: Windfile to reduce
+    :param fields: parts of the windfile to keep, all if None
+    :return: the given windfile
+    """
+    if fields is not None:
+        if TranslationField.ACTIONS not in fields:
+            windfile.actions = []
+        if TranslationField.REPOSITORIES not in fields:
+            windfile.repositories = None
+    return windfile
+
+
+def windfile_to_yaml(windfile: WindFile) -> str:
+    """
+    Dumps the given windfile as YAML.
+    :param windfile: Windfile to dump
+    :return: YAML representation of the windfile
+    """
+    # work-around as enums do not get cleanly printed with model_dump
+    json: str = windfile.model_dump_json(exclude_none=True)
+    return yaml.dump(yaml.safe_load(json), sort_keys=False, Dumper=YamlDumper, default_flow_style=False)
+
+
 class BambooTranslator(PassSettings):
     source: Target = Target.bamboo
     client: BambooClient
     environment: EnvironmentSchema
+    cache: Optional[TranslationCache]
+    replay: bool
 
-    def __init__(self, input_settings: InputSettings, output_settings: OutputSettings, credentials: CICredentials):
+    def __init__(
+        self,
+        input_settings: InputSettings,
+        output_settings: OutputSettings,
+        credentials: CICredentials,
+        client: Optional[BambooClient] = None,
+    ):
         input_settings.target = Target.bamboo
         env: typing.Optional[EnvironmentSchema] = utils.get_ci_environment(
             target=input_settings.target, output_settings=output_settings
@@ -407,7 +464,10 @@ class BambooTranslator(PassSettings):
             raise ValueError(f"No environment found for target {input_settings.target.value}")
         self.environment = env
         super().__init__(input_settings=input_settings, output_settings=output_settings)
-        self.client = BambooClient(credentials=credentials)
+        self.client = client if client is not None else get_bamboo_client(credentials=credentials)
+        self.cache = shared_translation_cache()
+        # replaying translates from the cache only, without talking to bamboo, e.g. for tests
+        self.replay = os.getenv("AEOLUS_TRANSLATION_REPLAY", "false").lower() == "true"
 
     def replace_environment_variables(self, windfile: WindFile) -> None:
         """
@@ -427,19 +487,66 @@ class BambooTranslator(PassSettings):
                     environment=self.environment, haystack=action.root.script
                 )
 
-    def translate(self, plan_key: str) -> Optional[WindFile]:
+    def translate(self, plan_key: str, fields: Optional[Set[TranslationField]] = None) -> Optional[WindFile]:
         """
-        Translate the given build plan into a windfile.
+        Translate the given build plan into a windfile and print it.
+        :param plan_key: key of the build plan
+        :param fields: parts of the windfile to translate, all if None
         :return: Windfile
         """
-        optional: Optional[Tuple[BambooSpecs, dict[str, Any]]] = self.client.get_plan_yaml(plan_key=plan_key)
-        if optional is None:
+        windfile: Optional[WindFile] = self.to_windfile(plan_key=plan_key, fields=fields)
+        if windfile is None:
+            return None
+        logger.info("🪄", "Translated windfile", self.output_settings.emoji)
+        print(windfile_to_yaml(windfile=windfile))
+        return windfile
+
+    def to_windfile(self, plan_key: str, fields: Optional[Set[TranslationField]] = None) -> Optional[WindFile]:
+        """
+        Translate the given build plan into a windfile. If the specs of the plan did not change since
+        the last translation, the cached windfile is returned. In replay mode, the last cached
+        translation is returned without fetching the specs. Only complete translations are cached.
+        :param plan_key: key of the build plan
+        :param fields: parts of the windfile to translate, all if None
+        :return: Windfile or None if the plan has no specs
+        """
+        cached: Optional[TranslationCacheEntry]
+        if self.replay:
+            if self.cache is None:
+                raise ValueError("Replaying translations requires the translation cache")
+            cached = self.cache.latest(plan_key=plan_key)
+            if cached is None:
+                logger.error("❌", f"{plan_key} was never translated, nothing to replay", self.output_settings.emoji)
+            return select_fields(windfile=cached.windfile, fields=fields) if cached is not None else None
+        code: Optional[str] = self.client.get_plan_code(plan_key=plan_key)
+        if code is None:
             return None
-        specs: BambooSpecs = optional[0]
-        # raw: dict[str, str] = optional[1]
+        if self.cache is not None:
+            cached = self.cache.get(plan_key=plan_key, code=code)
+            if cached is not None:
+                logger.debug("📦", f"using cached translation of {plan_key}", self.output_settings.emoji)
+                return select_fields(windfile=cached.windfile, fields=fields)
+        windfile: WindFile = self.convert(plan_key=plan_key, specs=parse_plan_code(code=code)[0], fields=fields)
+        if self.cache is not None and fields is None:
+            self.cache.put(plan_key=plan_key, code=code, windfile=windfile)
+        return windfile
+
+    def convert(self, plan_key: str, specs: BambooSpecs, fields: Optional[Set[TranslationField]] = None) -> WindFile:
+        """
+        Convert the given specs of the given build plan into a windfile. The stages of the specs are only
+        converted if actions or repositories are requested.
+        :param plan_key: key of the build plan
+        :param specs: structured specs of the build plan
+        :param fields: parts of the windfile to translate, all if None
+        :return: Windfile
+        """
         plan: BambooPlan = specs.plan
-        actions: list[Action] = extract_actions(stages=specs.stages, environment=self.environment)
-        repositories: dict[str, Repository] = extract_repositories(stages=specs.stages, repositories=specs.repositories)
+        actions: list[Action] = []
+        if fields is None or TranslationField.ACTIONS in fields:
+            actions = extract_actions(stages=specs.stages, environment=self.environment)
+        repositories: Optional[dict[str, Repository]] = None
+        if fields is None or TranslationField.REPOSITORIES in fields:
+            repositories = extract_repositories(stages=specs.stages, repositories=specs.repositories)
         metadata: WindfileMetadata = WindfileMetadata(
             name=plan.name,
             description=plan.description,
@@ -456,8 +563,4 @@ class BambooTranslator(PassSettings):
             api=Api(root="v0.0.1"), metadata=metadata, actions=actions, repositories=repositories
         )
         utils.clean_up(windfile=windfile, output_settings=self.output_settings)
-        # work-around as enums do not get cleanly printed with model_dump
-        json: str = windfile.model_dump_json(exclude_none=True)
-        logger.info("🪄", "Translated windfile", self.output_settings.emoji)
-        print(yaml.dump(yaml.safe_load(json), sort_keys=False, Dumper=YamlDumper, default_flow_style=False))
         return windfile
@@ -1,7 +1,10 @@
 """
 This module contains the Validator class. This class is responsible for validating the given windfile.
 """
+import os
+import threading
 import typing
+from collections import OrderedDict
 from typing import Optional
 
 from io import TextIOWrapper
@@ -170,6 +173,64 @@ def read_action_file(file: Optional[TextIOWrapper], output_settings: OutputSetti
     return None
 
 
+class ActionFileCache:
+    """
+    In-process cache of validated action files. Entries are keyed by the absolute path of the file
+    and invalidated if the modification time or the size of the file changes. As the merger modifies
+    the actions it inlines, only deep copies of the cached action files are handed out.
+    """
+
+    max_entries: int
+    entries: OrderedDict[str, typing.Tuple[typing.Tuple[int, int], ActionFile]]
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def read(self, path: str, output_settings: OutputSettings) -> Optional[ActionFile]:
+        """
+        Returns a copy of the validated action file at the given path, the file is only
+        read and validated if it is not cached or changed since it was cached.
+        :param path: path of the action file
+        :param output_settings: OutputSettings
+        :return: ActionFile or None if the file is invalid
+        """
+        absolute_path: str = os.path.abspath(path)
+        stat: os.stat_result = os.stat(absolute_path)
+        version: typing.Tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached: Optional[typing.Tuple[typing.Tuple[int, int], ActionFile]] = self.entries.get(absolute_path)
+            if cached is not None and cached[0] == version:
+                self.entries.move_to_end(absolute_path)
+                logger.debug("📦 ", f"using cached {absolute_path}", output_settings.emoji)
+                return cached[1].model_copy(deep=True)
+        with open(absolute_path, encoding="utf-8") as file:
+            action_file: Optional[ActionFile] = read_action_file(file=file, output_settings=output_settings)
+        if action_file is None:
+            return None
+        with self._lock:
+            self.entries[absolute_path] = (version, action_file.model_copy(deep=True))
+            self.entries.move_to_end(absolute_path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return action_file
+
+
+action_file_cache: ActionFileCache = ActionFileCache()
+
+
+def read_action_file_from_path(path: str, output_settings: OutputSettings) -> Optional[ActionFile]:
+    """
+    Validates the action file at the given path. Validated action files are cached, so
+    the same action file is only read and validated once as long as it does not change.
+    :param path: path of the file to validate
+    :param output_settings: OutputSettings
+    :return: ActionFile or None
+    """
+    return action_file_cache.read(path=path, output_settings=output_settings)
+
+
 class Validator(PassSettings):
     def validate_action_file(self) -> Optional[ActionFile]:
         """
@@ -186,14 +247,17 @@ class Validator(PassSettings):
     def validate_wind_file(self) -> Optional[WindFile]:
         """
         Validates the given windfile. If the file is valid,
-        the windfile is returned.
+        the windfile is returned. A windfile that is given in memory
+        was already validated when it was created and is returned as is.
         :return: Windfile or None
         """
         logger.info("🌬️", "Validating windfile", self.output_settings.emoji)
-        windfile: Optional[WindFile] = read_windfile(
-            file=self.input_settings.file,
-            output_settings=self.output_settings,
-        )
+        windfile: Optional[WindFile] = self.input_settings.windfile
+        if windfile is None:
+            windfile = read_windfile(
+                file=self.input_settings.file,
+                output_settings=self.output_settings,
+            )
         if windfile and has_external_actions(windfile):
             logger.info(
                 "🌍",
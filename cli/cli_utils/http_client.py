@@ -0,0 +1,161 @@
+"""
+Shared HTTP helpers: pooled sessions with retries, a circuit breaker for services that may be down
+and rate limiters for servers that should not be flooded.
+"""
+import threading
+import time
+import typing
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(  # pylint: disable=too-many-arguments
+    retries: int,
+    backoff_factor: float = 0.2,
+    backoff_jitter: float = 0.2,
+    pool_size: int = 10,
+    allowed_methods: typing.Iterable[str] = Retry.DEFAULT_ALLOWED_METHODS,
+    *,
+    status_forcelist: typing.Iterable[int] = (502, 503, 504),
+) -> requests.Session:
+    """
+    Creates a session that keeps connections alive and retries failed requests
+    with an exponential, jittered backoff. Connection errors and the given status codes are retried,
+    a Retry-After header of a 429 or 503 response is respected.
+    :param retries: number of retries per request
+    :param backoff_factor: base of the exponential backoff in seconds
+    :param backoff_jitter: maximum random delay added to every backoff in seconds
+    :param pool_size: number of connections kept alive per host
+    :param allowed_methods: methods that are retried
+    :param status_forcelist: status codes that are retried
+    :return: session
+    """
+    retry: Retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        allowed_methods=frozenset(allowed_methods),
+        status_forcelist=frozenset(status_forcelist),
+        raise_on_status=False,
+    )
+    adapter: HTTPAdapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session: requests.Session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class CircuitBreaker:
+    """
+    Remembers that a service is down. After failure_threshold consecutive failures the circuit opens
+    and calls are skipped for reset_timeout seconds. Afterwards, a single call is let through to
+    check whether the service is back.
+    """
+
+    failure_threshold: int
+    reset_timeout: float
+    failures: int
+    opened_at: Optional[float]
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Checks whether a call should be made.
+        :return: True if the circuit is closed or a trial call is due, otherwise False
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            # let one call through, a failure opens the circuit for another reset_timeout
+            self.opened_at = time.monotonic()
+            return True
+
+    def record_success(self) -> None:
+        """
+        Closes the circuit.
+        """
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        """
+        Counts a failure and opens the circuit once the threshold is reached.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def is_open(self) -> bool:
+        """
+        Checks whether calls are currently skipped.
+        :return: True if the circuit is open
+        """
+        with self._lock:
+            return self.opened_at is not None
+
+
+class RateLimiter:
+    """
+    Spaces calls to a service, so at most rate calls per second are started. A rate of 0 disables the limit.
+    """
+
+    rate: float
+    next_call: float
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.next_call = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Changes the limit, calls that are already waiting keep their start.
+        :param rate: calls per second, 0 disables the limit
+        """
+        with self._lock:
+            self.rate = rate
+
+    def acquire(self) -> None:
+        """
+        Waits until the next call may be started.
+        """
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now: float = time.monotonic()
+            start: float = max(now, self.next_call)
+            self.next_call = start + 1 / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+_rate_limiters: dict[str, RateLimiter] = {}
+_rate_limiters_lock: threading.Lock = threading.Lock()
+
+
+def get_rate_limiter(server: str, rate: float) -> RateLimiter:
+    """
+    Returns the rate limiter of the given server, all callers that talk to the same server share it.
+    The limit of an existing rate limiter is changed to the given rate.
+    :param server: url of the server
+    :param rate: calls per second
+    :return: rate limiter
+    """
+    with _rate_limiters_lock:
+        if server not in _rate_limiters:
+            _rate_limiters[server] = RateLimiter(rate=rate)
+        _rate_limiters[server].set_rate(rate=rate)
+        return _rate_limiters[server]
@@ -1,6 +1,9 @@
+import functools
 import inspect
 import os
+import re
 import tempfile
+import threading
 import traceback as tb
 import typing
 from io import TextIOWrapper
@@ -27,6 +30,9 @@ from cli_utils import logger
 
 T = typing.TypeVar("T")
 
+# libyaml is considerably faster than the pure Python loader, but it is not available everywhere
+YamlLoader: typing.Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def get_content_of(file: str) -> Optional[str]:
     """
@@ -106,6 +112,45 @@ def file_exists(path: str, output_settings: OutputSettings) -> bool:
     return True
 
 
+@functools.lru_cache(maxsize=None)
+def get_type_adapter(filetype: typing.Any) -> pydantic.TypeAdapter:
+    """
+    Returns the TypeAdapter for the given type. Building the validation schema of the large
+    windfile and actionfile types is expensive, so every adapter is only built once.
+    :param filetype: Type to validate
+    :return: TypeAdapter for the given type
+    """
+    return pydantic.TypeAdapter(filetype)
+
+
+def load_yaml(content: str) -> typing.Any:
+    """
+    Parses the given YAML content, using libyaml if it is available.
+    :param content: YAML content
+    :return: Parsed content
+    """
+    return yaml.load(content, Loader=YamlLoader)  # YamlLoader is always a safe loader
+
+
+def validate_content(filetype: typing.Any, content: str) -> typing.Any:
+    """
+    Validates the given content against the given type. Content that is already JSON
+    is validated directly, everything else is parsed as YAML first.
+    :param filetype: Type to validate
+    :param content: JSON or YAML content
+    :return: Validated object
+    """
+    typevalidator: pydantic.TypeAdapter = get_type_adapter(filetype)
+    if content.lstrip().startswith("{"):
+        try:
+            return typevalidator.validate_json(content)
+        except pydantic.ValidationError as validation_error:
+            # YAML flow mappings look like JSON, but are not
+            if not any(error["type"] == "json_invalid" for error in validation_error.errors()):
+                raise
+    return typevalidator.validate_python(load_yaml(content))
+
+
 def read_file(
     filetype: T,
     file: TextIOWrapper,
@@ -120,9 +165,8 @@ def read_file(
     :return: Validated object or None
     """
     try:
-        typevalidator: pydantic.TypeAdapter = pydantic.TypeAdapter(filetype)
         content: str = file.read()
-        validated: T = typevalidator.validate_python(yaml.safe_load(content))
+        validated: T = validate_content(filetype=filetype, content=content)
         logger.info("✅ ", f"{file.name} is valid", output_settings.emoji)
         return validated
     except pydantic.ValidationError as validation_error:
@@ -133,27 +177,162 @@ def read_file(
         return None
 
 
-def get_ci_environment(target: Target, output_settings: OutputSettings) -> Optional[EnvironmentSchema]:
+class FrozenEnvironmentSchema(EnvironmentSchema):
     """
-    Returns the CI environment for the given target.
+    Immutable EnvironmentSchema, as the loaded environments are shared by all generators.
+    """
+
+    model_config = pydantic.ConfigDict(frozen=True)
+
+
+def environment_path(target: Target) -> str:
+    """
+    Returns the path of the environment definition of the given target.
     :param target: Target
-    :param output_settings: OutputSettings
-    :return: Environment
+    :return: Path to the environment definition
     """
     path: str = os.path.join(
         os.path.dirname(__file__), "..", "..", "schemas", "v0.0.1", "environment", f"{target.name}.yaml"
     )
-    path = os.path.normpath(path)
+    return os.path.normpath(path)
+
+
+def load_ci_environment(path: str, output_settings: OutputSettings) -> Optional[EnvironmentSchema]:
+    """
+    Reads and validates the CI environment definition at the given path.
+    :param path: Path to the environment definition
+    :param output_settings: OutputSettings
+    :return: Environment
+    """
     if file_exists(path, OutputSettings()):
         with open(path, "r", encoding="utf-8") as file:
             environment: type[EnvironmentSchema] | None = read_file(
                 filetype=EnvironmentSchema, file=file, output_settings=output_settings
             )
             if isinstance(environment, EnvironmentSchema):
-                return environment
+                return FrozenEnvironmentSchema(**environment.model_dump())
     return None
 
 
+class EnvironmentRegistry:
+    """
+    Process-wide registry of the CI environments. Every environment is read from disk once,
+    with hot reload enabled the definition is read again if the file changed.
+    """
+
+    hot_reload: bool
+    environments: dict[Target, typing.Tuple[int, EnvironmentSchema]]
+
+    def __init__(self, hot_reload: bool = False):
+        self.hot_reload = hot_reload
+        self.environments = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, target: Target, output_settings: OutputSettings) -> Optional[EnvironmentSchema]:
+        """
+        Returns the CI environment for the given target.
+        :param target: Target
+        :param output_settings: OutputSettings
+        :return: Environment
+        """
+        path: str = environment_path(target=target)
+        loaded: Optional[typing.Tuple[int, EnvironmentSchema]] = self.environments.get(target)
+        if loaded is not None and not self.hot_reload:
+            return loaded[1]
+        modified: int = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+        if loaded is not None and loaded[0] == modified:
+            return loaded[1]
+        with self._lock:
+            environment: Optional[EnvironmentSchema] = load_ci_environment(path=path, output_settings=output_settings)
+            if environment is None:
+                return None
+            if loaded is not None:
+                logger.info("🔄", f"Reloaded environment for {target.value}", output_settings.emoji)
+            self.environments[target] = (modified, environment)
+            return environment
+
+
+environment_registry: EnvironmentRegistry = EnvironmentRegistry(
+    hot_reload=os.getenv("AEOLUS_ENVIRONMENT_HOT_RELOAD", "false").lower() == "true"
+)
+
+
+def get_ci_environment(target: Target, output_settings: OutputSettings) -> Optional[EnvironmentSchema]:
+    """
+    Returns the CI environment for the given target.
+    The environment is only read once per process, see EnvironmentRegistry.
+    :param target: Target
+    :param output_settings: OutputSettings
+    :return: Environment
+    """
+    return environment_registry.get(target=target, output_settings=output_settings)
+
+
+class EnvironmentSubstitution:
+    """
+    Replaces all environment variables of an environment in a single scan. All variable names are
+    combined into one regex, longer names are tried first, so a name that is a prefix of another
+    name does not break the replacement of the longer one. Replaced values are never replaced again.
+    """
+
+    replacements: dict[str, str]
+    pattern: Optional[re.Pattern]
+
+    def __init__(self, variables: typing.Tuple[typing.Tuple[str, str], ...], reverse: bool):
+        self.replacements = {}
+        for key, value in variables:
+            if reverse:
+                value, key = key, value
+            if key:
+                # the first definition wins, like it did when the variables were replaced one by one
+                self.replacements.setdefault(key, value)
+        self.pattern = None
+        if self.replacements:
+            names: list[str] = sorted(self.replacements, key=len, reverse=True)
+            self.pattern = re.compile("|".join(re.escape(name) for name in names))
+
+    def substitute(self, haystack: str) -> str:
+        """
+        Replaces all environment variables in the given string.
+        :param haystack: String to replace
+        :return: Replaced string
+        """
+        if self.pattern is None:
+            return haystack
+        return self.pattern.sub(self.replace_match, haystack)
+
+    def replace_match(self, match: re.Match) -> str:
+        """
+        Returns the replacement of the given match.
+        :param match: matched environment variable
+        :return: replacement
+        """
+        return self.replacements[match.group(0)]
+
+
+@functools.lru_cache(maxsize=32)
+def compile_substitution(
+    variables: typing.Tuple[typing.Tuple[str, str], ...], reverse: bool
+) -> EnvironmentSubstitution:
+    """
+    Compiles the substitution for the given variables, every environment and direction is only compiled once.
+    :param variables: Pairs of aeolus and target environment variable names
+    :param reverse: Whether to reverse the replacement or not
+    :return: Compiled substitution
+    """
+    return EnvironmentSubstitution(variables=variables, reverse=reverse)
+
+
+def get_substitution(environment: EnvironmentSchema, reverse: bool = False) -> EnvironmentSubstitution:
+    """
+    Returns the compiled substitution for the given environment.
+    :param environment: Environment variables
+    :param reverse: Whether to reverse the replacement or not
+    :return: Compiled substitution
+    """
+    return compile_substitution(variables=tuple(environment.__dict__.items()), reverse=reverse)
+
+
 def replace_environment_variables(
     environment: EnvironmentSchema, haystack: typing.List[str], reverse: bool = False
 ) -> list[str]:
@@ -164,14 +343,8 @@ def replace_environment_variables(
     :param reverse: Whether to reverse the replacement or not
     :return: Replaced list
     """
-    result: typing.List[str] = []
-    for item in haystack:
-        for key, value in environment.__dict__.items():
-            if reverse:
-                value, key = key, value
-            item = item.replace(key, value)
-        result.append(item)
-    return result
+    substitution: EnvironmentSubstitution = get_substitution(environment=environment, reverse=reverse)
+    return [substitution.substitute(item) for item in haystack]
 
 
 def replace_environment_variables_in_dict(
@@ -186,13 +359,11 @@ def replace_environment_variables_in_dict(
     :param reverse: Whether to reverse the replacement or not
     :return: Replaced list
     """
+    substitution: EnvironmentSubstitution = get_substitution(environment=environment, reverse=reverse)
     result: dict[typing.Any, typing.Any | str | float | bool | None] = {}
     for item_key, item_value in haystack.items():
-        for key, value in environment.__dict__.items():
-            if reverse:
-                value, key = key, value
-            if isinstance(item_value, str):
-                item_value = item_value.replace(key, value)
+        if isinstance(item_value, str):
+            item_value = substitution.substitute(item_value)
         result[item_key] = item_value
     return result
 
@@ -276,11 +447,12 @@ def replace_environment_dictionary(environment: EnvironmentSchema, env: Optional
     """
     if env is None:
         return None
+    substitution: EnvironmentSubstitution = get_substitution(environment=environment)
     dictionary: Dictionary = Dictionary(root={})
     for key, value in env.root.root.items():
-        key = replace_environment_variable(environment=environment, haystack=key)
+        key = substitution.substitute(key)
         if isinstance(value, str):
-            value = replace_environment_variable(environment=environment, haystack=value)
+            value = substitution.substitute(value)
         dictionary.root[key] = value
     return Environment(root=dictionary)
 
@@ -352,6 +524,43 @@ def clean_up(windfile: WindFile, output_settings: OutputSettings) -> None:
             root_action.excludeDuring = None
 
 
+def group_into_stages(
+    steps: typing.List[typing.Tuple[str, Optional[typing.List[str]]]]
+) -> typing.List[typing.List[str]]:
+    """
+    Groups the given steps into stages, the steps of a stage do not depend on each other and can run in parallel.
+    Every step is put into the first stage after all steps it needs, a step without needs waits for the step
+    before it, so a windfile without any needs results in one stage per step.
+    :param steps: Names of the steps in their order and the names of the steps they need
+    :return: Names of the steps per stage
+    """
+    names: set[str] = {name for name, _ in steps}
+    needed_by: dict[str, typing.List[str]] = {}
+    previous: Optional[str] = None
+    for name, needs in steps:
+        if needs is None:
+            needed_by[name] = [previous] if previous is not None else []
+        else:
+            unknown: typing.List[str] = [need for need in needs if need not in names]
+            if unknown:
+                raise ValueError(f"{name} needs unknown steps: {', '.join(unknown)}")
+            needed_by[name] = needs
+        previous = name
+    levels: dict[str, int] = {}
+    remaining: typing.List[str] = [name for name, _ in steps]
+    while remaining:
+        ready: typing.List[str] = [name for name in remaining if all(need in levels for need in needed_by[name])]
+        if not ready:
+            raise ValueError(f"cyclic needs between steps: {', '.join(remaining)}")
+        for name in ready:
+            levels[name] = 1 + max((levels[need] for need in needed_by[name]), default=-1)
+        remaining = [name for name in remaining if name not in levels]
+    stages: typing.List[typing.List[str]] = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+    for name, _ in steps:
+        stages[levels[name]].append(name)
+    return stages
+
+
 class TemporaryFileWithContent:
     """
     A temporary file with content.
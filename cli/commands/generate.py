@@ -96,6 +96,12 @@ class Generate(Subcommand):
             "--run", "-r", help="Run the generated file on the CI system", choices=Lifecycle.__members__.keys()
         )
 
+        parser.add_argument(
+            "--log-file",
+            help="Additionally write the output of the run to this file",
+            type=str,
+        )
+
     def generate(self) -> None:
         """
         Generate the CI file.
@@ -0,0 +1,108 @@
+"""
+Publish-many subcommand. Publishes all windfiles of a directory or manifest to a CI system.
+"""
+import os
+import time
+import typing
+
+import argparse
+
+from classes.bulk_publisher import FAILED, BulkPublisher, PublishResult, collect_windfiles, summary_table
+from classes.ci_credentials import CICredentials
+from classes.generated.definitions import Target
+from classes.output_settings import OutputSettings
+from cli_utils import logger
+from commands.subcommand import Subcommand
+
+
+class PublishMany(Subcommand):
+    """
+    Publish-many subcommand. Merges, generates and publishes
+    many windfiles concurrently and prints a summary.
+    """
+
+    publisher: BulkPublisher
+    output_settings: OutputSettings
+
+    def __init__(self, output_settings: OutputSettings, args: typing.Any):
+        super().__init__(args)
+        self.output_settings = output_settings
+        self.publisher = BulkPublisher(
+            target=Target[self.args.target],
+            credentials=CICredentials(url=self.args.url, username=self.args.user, token=self.args.token),
+            workers=self.args.workers,
+            rate=self.args.rate,
+            emoji=output_settings.emoji,
+        )
+
+    @staticmethod
+    def add_arg_parser(parser: argparse.ArgumentParser) -> None:
+        """
+        Add arguments for this subcommand to the given parser.
+        :param parser:
+        """
+        parser.add_argument(
+            "--input",
+            "-i",
+            help="Directory with windfiles or a manifest that lists the windfiles",
+            required=True,
+            type=str,
+        )
+
+        parser.add_argument(
+            "--target",
+            "-t",
+            help="Target CI system",
+            required=True,
+            choices=[Target.jenkins.name, Target.bamboo.name],
+        )
+
+        parser.add_argument(
+            "--url",
+            help="URL of the CI Server",
+            required=True,
+            type=str,
+        )
+
+        parser.add_argument(
+            "--user",
+            help="Username to be used in the CI system",
+            type=str,
+        )
+
+        parser.add_argument(
+            "--token",
+            help="Auth token for the CI Server",
+            required=True,
+            type=str,
+        )
+
+        parser.add_argument(
+            "--workers",
+            "-w",
+            help="Number of windfiles that are published at the same time",
+            default=int(os.getenv("AEOLUS_PUBLISH_WORKERS", "4")),
+            type=int,
+        )
+
+        parser.add_argument(
+            "--rate",
+            help="Maximum number of publications per second on the CI server, 0 for no limit",
+            default=float(os.getenv("AEOLUS_PUBLISH_RATE", "0")),
+            type=float,
+        )
+
+    def publish(self) -> bool:
+        """
+        Publishes all windfiles and prints the summary.
+        :return: True if all windfiles were published or unchanged
+        """
+        paths: typing.List[str] = collect_windfiles(source=self.args.input)
+        logger.info("🚀", f"Publishing {len(paths)} windfiles", self.output_settings.emoji)
+        started: float = time.monotonic()
+        results: typing.List[PublishResult] = []
+        for result in self.publisher.publish_files(paths=paths):
+            logger.info("📦", f"{result.name}: {result.status}", self.output_settings.emoji)
+            results.append(result)
+        print(summary_table(results=results, duration=time.monotonic() - started))
+        return all(result.status != FAILED for result in results)
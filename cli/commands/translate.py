@@ -7,6 +7,7 @@ import typing
 import argparse
 
 from classes.ci_credentials import CICredentials
+from classes.translation_field import TranslationField
 from classes.translator import BambooTranslator
 from classes.input_settings import InputSettings
 from classes.output_settings import OutputSettings
@@ -34,6 +35,8 @@ class Translate(Subcommand):
         self.translator = BambooTranslator(
             input_settings=input_settings, output_settings=output_settings, credentials=credentials
         )
+        if self.args.replay:
+            self.translator.replay = True
 
     @staticmethod
     def add_arg_parser(parser: argparse.ArgumentParser) -> None:
@@ -49,7 +52,29 @@ class Translate(Subcommand):
             required=True,
             type=str,
         )
+        Translate.add_server_arguments(parser=parser)
 
+        parser.add_argument(
+            "--fields",
+            "-f",
+            help="Parts of the windfile to translate, the metadata is always translated",
+            nargs="+",
+            choices=[field.value for field in TranslationField],
+            type=str,
+        )
+
+        parser.add_argument(
+            "--replay",
+            help="Translate from the translation cache only, without connecting to the Bamboo Server",
+            action="store_true",
+        )
+
+    @staticmethod
+    def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+        """
+        Add the arguments to connect to the Bamboo Server to the given parser.
+        :param parser:
+        """
         parser.add_argument(
             "--url",
             help="URL of the Bamboo Server",
@@ -68,4 +93,7 @@ class Translate(Subcommand):
         """
         Generate the CI file.
         """
-        self.translator.translate(plan_key=plan_key)
+        fields: typing.Optional[typing.Set[TranslationField]] = (
+            {TranslationField(field) for field in self.args.fields} if self.args.fields else None
+        )
+        self.translator.translate(plan_key=plan_key, fields=fields)
@@ -0,0 +1,114 @@
+"""
+Translate-many subcommand. Translates all build plans of a Bamboo project, or the given plans, into windfiles.
+"""
+import os
+import time
+import typing
+
+import argparse
+
+from classes.bulk_translator import FAILED, BulkTranslator, TranslationResult, summary_table
+from classes.ci_credentials import CICredentials
+from classes.output_settings import OutputSettings
+from cli_utils import logger
+from commands.subcommand import Subcommand
+from commands.translate import Translate
+
+
+class TranslateMany(Subcommand):
+    """
+    Translate-many subcommand. Translates many build
+    plans concurrently into a directory of windfiles.
+    """
+
+    translator: BulkTranslator
+    output_settings: OutputSettings
+
+    def __init__(self, output_settings: OutputSettings, args: typing.Any):
+        super().__init__(args)
+        self.output_settings = output_settings
+        self.translator = BulkTranslator(
+            credentials=CICredentials(url=self.args.url, username=None, token=self.args.token),
+            output_directory=self.args.output,
+            workers=self.args.workers,
+            rate=self.args.rate,
+            retries=self.args.retries,
+            overwrite=self.args.overwrite,
+            emoji=output_settings.emoji,
+        )
+
+    @staticmethod
+    def add_arg_parser(parser: argparse.ArgumentParser) -> None:
+        """
+        Add arguments for this subcommand to the given parser.
+        :param parser:
+        """
+        plans = parser.add_mutually_exclusive_group(required=True)
+        plans.add_argument(
+            "--project",
+            "-p",
+            help="Key of the Bamboo project whose plans are translated",
+            type=str,
+        )
+        plans.add_argument(
+            "--keys",
+            "-k",
+            help="Build Plan Keys",
+            nargs="+",
+            type=str,
+        )
+
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="Directory the windfiles are written to",
+            required=True,
+            type=str,
+        )
+
+        Translate.add_server_arguments(parser=parser)
+
+        parser.add_argument(
+            "--workers",
+            "-w",
+            help="Number of plans that are translated at the same time",
+            default=int(os.getenv("AEOLUS_TRANSLATE_WORKERS", "4")),
+            type=int,
+        )
+
+        parser.add_argument(
+            "--rate",
+            help="Maximum number of requests per second to the Bamboo Server, 0 for no limit",
+            default=float(os.getenv("AEOLUS_TRANSLATE_RATE", "0")),
+            type=float,
+        )
+
+        parser.add_argument(
+            "--retries",
+            help="Number of retries of a failed request to the Bamboo Server",
+            default=int(os.getenv("AEOLUS_TRANSLATE_RETRIES", "3")),
+            type=int,
+        )
+
+        parser.add_argument(
+            "--overwrite",
+            help="Translate plans again whose windfile already exists in the output directory",
+            action="store_true",
+        )
+
+    def translate(self) -> bool:
+        """
+        Translates all plans and prints the summary.
+        :return: True if all plans were translated or skipped
+        """
+        plan_keys: typing.List[str] = (
+            self.args.keys if self.args.keys is not None else self.translator.plan_keys(project_key=self.args.project)
+        )
+        logger.info("🚀", f"Translating {len(plan_keys)} plans", self.output_settings.emoji)
+        started: float = time.monotonic()
+        results: typing.List[TranslationResult] = []
+        for result in self.translator.translate(plan_keys=plan_keys):
+            logger.info("📦", f"{result.plan_key}: {result.status}", self.output_settings.emoji)
+            results.append(result)
+        print(summary_table(results=results, duration=time.monotonic() - started))
+        return all(result.status != FAILED for result in results)
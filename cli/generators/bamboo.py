@@ -8,11 +8,18 @@ directly (most convenient)
 - we are not in a docker container and can not use the provided bamboo-generator container, so we call the java
 jar directly (slowest)
 """
+import atexit
 import base64
+import functools
+import itertools
 import json
 import os
+import queue
 import subprocess
+import threading
 import time
+import typing
+import uuid
 from typing import List, Any, Optional
 
 import requests
@@ -20,6 +27,7 @@ from docker.client import DockerClient  # type: ignore
 from docker.errors import DockerException  # type: ignore
 from docker.models.containers import Container  # type: ignore
 from docker.types.daemon import CancellableStream  # type: ignore
+from docker.utils.socket import STDERR, STDOUT, frames_iter  # type: ignore
 
 import cli_utils
 from classes.generated.definitions import Target, ScriptAction
@@ -28,6 +36,7 @@ from classes.input_settings import InputSettings
 from classes.output_settings import OutputSettings
 from classes.pass_metadata import PassMetadata
 from cli_utils import logger, utils
+from cli_utils.http_client import CircuitBreaker, create_session
 from generators.base import BaseGenerator
 
 
@@ -43,6 +52,346 @@ def docker_available() -> bool:
         return False
 
 
+class GenerationMetrics:
+    """
+    Counts how the Bamboo YAML Spec files were generated (api, docker or java) and how long it took.
+    """
+
+    counts: dict[str, int]
+    seconds: dict[str, float]
+
+    def __init__(self) -> None:
+        self.counts = {}
+        self.seconds = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, path: str, seconds: float) -> None:
+        """
+        Records a generation.
+        :param path: how the specs were generated
+        :param seconds: duration of the generation
+        """
+        with self._lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+            self.seconds[path] = self.seconds.get(path, 0.0) + seconds
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """
+        Returns the number of generations and their total duration per path.
+        :return: metrics per path
+        """
+        with self._lock:
+            return {path: {"count": count, "seconds": self.seconds[path]} for path, count in self.counts.items()}
+
+
+generation_metrics: GenerationMetrics = GenerationMetrics()
+
+# remembers that the bamboo generator api is down, so we do not wait for the connect timeout on every generation
+generator_api_breaker: CircuitBreaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("BAMBOO_GENERATOR_API_FAILURES", "3")),
+    reset_timeout=float(os.getenv("BAMBOO_GENERATOR_API_COOLDOWN", "30")),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def generator_api_session() -> requests.Session:
+    """
+    Returns the session that is used for all calls to the bamboo generator api, so connections are reused.
+    :return: session
+    """
+    return create_session(retries=int(os.getenv("BAMBOO_GENERATOR_API_RETRIES", "2")), allowed_methods=["POST"])
+
+
+@functools.lru_cache(maxsize=None)
+def generator_api_publish_session() -> requests.Session:
+    """
+    Returns the session that is used to publish plans through the bamboo generator api. Publishing is not
+    idempotent, so its requests are never retried.
+    :return: session
+    """
+    return create_session(retries=0)
+
+
+class GeneratorWorker:
+    """
+    A bamboo-generator running in worker mode. It reads one json request per line and answers with one json
+    line, its logs are forwarded to the logger. Subclasses connect the worker to a process or a container.
+    """
+
+    answers: "queue.Queue[Optional[str]]"
+
+    def __init__(self) -> None:
+        self.answers = queue.Queue()
+
+    def send(self, line: str) -> None:
+        """
+        Sends the given line to the worker.
+        :param line: line to send, including the newline
+        """
+        raise NotImplementedError("send() not implemented")
+
+    def alive(self) -> bool:
+        """
+        Checks whether the worker is still running.
+        :return: True if the worker is running
+        """
+        raise NotImplementedError("alive() not implemented")
+
+    def stop(self) -> None:
+        """
+        Stops the worker.
+        """
+        raise NotImplementedError("stop() not implemented")
+
+    def request(self, request: dict[str, Optional[str]], timeout: float) -> dict[str, Any]:
+        """
+        Sends the given request to the worker and waits for the answer.
+        :param request: request with the windfile and the optional bamboo credentials
+        :param timeout: seconds to wait for the answer
+        :return: answer of the worker
+        """
+        self.send(json.dumps(request) + "\n")
+        line: Optional[str] = self.answers.get(timeout=timeout)
+        if line is None:
+            raise BrokenPipeError("worker exited")
+        answer: dict[str, Any] = json.loads(line)
+        if answer.get("id") != request.get("id"):
+            raise ValueError(f"worker answered {answer.get('id')} instead of {request.get('id')}")
+        return answer
+
+
+class JavaWorker(GeneratorWorker):
+    """
+    A bamboo-generator jar running in worker mode as a child process.
+    """
+
+    process: subprocess.Popen
+
+    def __init__(self, command: List[str]):
+        super().__init__()
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        threading.Thread(target=self.read_answers, daemon=True).start()
+        threading.Thread(target=self.forward_logs, daemon=True).start()
+
+    def read_answers(self) -> None:
+        """
+        Collects the answers of the worker, None marks that the worker exited.
+        """
+        if self.process.stdout is not None:
+            for line in self.process.stdout:
+                self.answers.put(line)
+        self.answers.put(None)
+
+    def forward_logs(self) -> None:
+        """
+        Forwards the logs of the worker.
+        """
+        if self.process.stderr is not None:
+            for line in self.process.stderr:
+                if line.strip():
+                    logger.debug("☕️", line.rstrip(), False)
+
+    def send(self, line: str) -> None:
+        if self.process.stdin is None:
+            raise BrokenPipeError("worker has no stdin")
+        self.process.stdin.write(line)
+        self.process.stdin.flush()
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def stop(self) -> None:
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+
+
+class ContainerWorker(GeneratorWorker):
+    """
+    A long-running bamboo-generator container in worker mode. Every container gets a unique name,
+    so multiple generations can run at the same time. Requests and answers go through the attached
+    stdin and stdout of the container.
+    """
+
+    name: str
+    container: Container
+    socket: Any
+
+    def __init__(self, client: DockerClient, image: str):
+        super().__init__()
+        self.name = f"bambeolus-{uuid.uuid4().hex[:12]}"
+        self.container = client.containers.run(
+            image=image, command="--worker", name=self.name, detach=True, stdin_open=True, auto_remove=True
+        )
+        self.socket = self.container.attach_socket(params={"stdin": 1, "stdout": 1, "stderr": 1, "stream": 1})
+        threading.Thread(target=self.read_frames, daemon=True).start()
+
+    def read_frames(self) -> None:
+        """
+        Splits the multiplexed output of the container into answers (stdout) and logs (stderr).
+        """
+        buffers: dict[int, bytes] = {STDOUT: b"", STDERR: b""}
+        try:
+            for stream, data in frames_iter(self.socket, tty=False):
+                buffers[stream] = buffers.get(stream, b"") + data
+                while b"\n" in buffers[stream]:
+                    raw, buffers[stream] = buffers[stream].split(b"\n", 1)
+                    line: str = raw.decode("utf-8", errors="replace")
+                    if stream == STDOUT:
+                        self.answers.put(line)
+                    elif line.strip():
+                        logger.debug("🐳", line.rstrip(), False)
+        except OSError:
+            pass
+        self.answers.put(None)
+
+    def send(self, line: str) -> None:
+        # attach_socket returns a SocketIO wrapper, writing goes through the underlying socket
+        getattr(self.socket, "_sock", self.socket).sendall(line.encode("utf-8"))
+
+    def alive(self) -> bool:
+        try:
+            self.container.reload()
+        except DockerException:
+            return False
+        return self.container.status == "running"
+
+    def stop(self) -> None:
+        try:
+            self.socket.close()
+            self.container.kill()
+        except DockerException:
+            # the container is removed automatically once it stopped
+            pass
+
+
+class WorkerPool:
+    """
+    Keeps up to size warm bamboo-generator workers, so a generation does not pay the startup of the JVM
+    or the container. Workers are started on demand, crashed or hanging workers are replaced by new ones.
+    """
+
+    start_worker: typing.Callable[[], GeneratorWorker]
+    size: int
+    timeout: float
+    idle: "queue.LifoQueue[GeneratorWorker]"
+
+    def __init__(self, start_worker: typing.Callable[[], GeneratorWorker], size: int, timeout: float):
+        self.start_worker = start_worker
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(size)
+        self._ids: typing.Iterator[int] = itertools.count()
+
+    def take(self) -> GeneratorWorker:
+        """
+        Returns an idle worker that is still healthy or starts a new one.
+        :return: worker
+        """
+        while True:
+            try:
+                worker: GeneratorWorker = self.idle.get_nowait()
+            except queue.Empty:
+                logger.debug("🔨", "starting bamboo-generator worker", False)
+                return self.start_worker()
+            if worker.alive():
+                return worker
+            worker.stop()
+
+    def generate(self, request: dict[str, Optional[str]]) -> dict[str, Any]:
+        """
+        Hands the given request to a worker. If the worker died, the request is retried once with a new worker,
+        unless it carries bamboo credentials, as the worker might have published the plan before it died.
+        :param request: request with the windfile and the optional bamboo credentials
+        :return: answer of the worker
+        """
+        request["id"] = str(next(self._ids))
+        attempts: int = 1 if request.get("token") is not None else 2
+        with self._slots:
+            for attempt in range(attempts):
+                worker: GeneratorWorker = self.take()
+                try:
+                    answer: dict[str, Any] = worker.request(request=request, timeout=self.timeout)
+                except BrokenPipeError as error:
+                    worker.stop()
+                    if attempt == attempts - 1:
+                        raise ValueError(f"bamboo-generator worker crashed: {error}") from error
+                    continue
+                except (queue.Empty, ValueError, OSError) as error:
+                    # a hanging or confused worker is not reused
+                    worker.stop()
+                    raise ValueError(f"bamboo-generator worker failed: {error or 'timeout'}") from error
+                self.idle.put(worker)
+                return answer
+        raise ValueError("bamboo-generator worker crashed")
+
+    def close(self) -> None:
+        """
+        Stops all idle workers.
+        """
+        while True:
+            try:
+                self.idle.get_nowait().stop()
+            except queue.Empty:
+                return
+
+
+@functools.lru_cache(maxsize=None)
+def java_worker_pool() -> Optional[WorkerPool]:
+    """
+    Returns the pool of warm bamboo-generator JVMs shared in this process. It is configured with
+    BAMBOO_GENERATOR_JAVA_WORKERS (0 starts a new JVM per windfile) and BAMBOO_GENERATOR_JAVA_TIMEOUT (in seconds).
+    :return: pool or None if the pool is disabled
+    """
+    size: int = int(os.getenv("BAMBOO_GENERATOR_JAVA_WORKERS", "2"))
+    if size <= 0:
+        return None
+    pool: WorkerPool = WorkerPool(
+        start_worker=functools.partial(JavaWorker, command=["java", "-jar", "bamboo-generator.jar", "--worker"]),
+        size=size,
+        timeout=float(os.getenv("BAMBOO_GENERATOR_JAVA_TIMEOUT", "120")),
+    )
+    atexit.register(pool.close)
+    return pool
+
+
+@functools.lru_cache(maxsize=None)
+def container_worker_pool() -> Optional[WorkerPool]:
+    """
+    Returns the pool of long-running bamboo-generator containers shared in this process. It is configured with
+    BAMBOO_GENERATOR_CONTAINERS (0 starts a new container per windfile), BAMBOO_GENERATOR_IMAGE and
+    BAMBOO_GENERATOR_JAVA_TIMEOUT (in seconds).
+    :return: pool or None if the pool is disabled
+    """
+    size: int = int(os.getenv("BAMBOO_GENERATOR_CONTAINERS", "2"))
+    if size <= 0:
+        return None
+    pool: WorkerPool = WorkerPool(
+        start_worker=functools.partial(ContainerWorker, client=DockerClient.from_env(), image=bamboo_generator_image()),
+        size=size,
+        timeout=float(os.getenv("BAMBOO_GENERATOR_JAVA_TIMEOUT", "120")),
+    )
+    atexit.register(pool.close)
+    return pool
+
+
+def bamboo_generator_image() -> str:
+    """
+    Returns the image of the bamboo-generator container.
+    :return: image name
+    """
+    return os.getenv("BAMBOO_GENERATOR_IMAGE", "ghcr.io/ls1intum/aeolus/bamboo-generator:nightly")
+
+
 class BambooGenerator(BaseGenerator):
     """
     Jenkins generator. Because bamboo works differently to other CI systems,
@@ -101,40 +450,49 @@ class BambooGenerator(BaseGenerator):
 
         json_windfile: str = self.windfile.model_dump_json(exclude_none=True)
         start = time.time()
+        path: str = "api"
         self.key = self.generate_in_api(payload=json_windfile)
         if not self.key:
-            # we use base64 a base64 encoded json string, so we do not have to handle any escaping
-            escaped: str = base64.b64encode(json_windfile.encode("utf-8")).decode("utf-8")
             if docker_available():
                 logger.debug("🐳", "Docker is available, using docker container", self.output_settings.emoji)
-                self.generate_in_docker(base64_str=escaped)
+                path = "docker"
+                self.generate_in_docker(payload=json_windfile)
             else:
                 logger.debug("☕️", "Docker is not available, using java jar", self.output_settings.emoji)
-                self.generate_in_java(base64_str=escaped)
+                path = "java"
+                self.generate_in_java(payload=json_windfile)
         end = time.time()
+        generation_metrics.record(path=path, seconds=end - start)
         cli_utils.logger.info("🔨", f"Generated Bamboo YAML Spec file in {end - start}s", self.output_settings.emoji)
         return super().generate()
 
     def generate_in_api(self, payload: str) -> Optional[str]:
         """
         Generate the bamboo specs that can be used to create a plan in bamboo. We call the REST API, this is
-        faster than calling the docker container or starting the java jar.
+        faster than calling the docker container or starting the java jar. If the api was not reachable
+        recently, it is skipped until the cooldown is over.
         :param payload: json string of the windfile definition
         :return key of the generated bamboo plan
         """
+        if not generator_api_breaker.allow():
+            logger.debug("🔌", "Bamboo generator api is unreachable, skipping it", self.output_settings.emoji)
+            return None
         try:
             host: str = os.getenv("BAMBOO_GENERATOR_API_HOST", "http://localhost:8091")
             endpoint: str = f"{host}/generate"
             data: dict[str, Optional[str]] = {"windfile": payload}
+            session: requests.Session = generator_api_session()
 
             if self.output_settings.ci_credentials is not None:
                 endpoint = f"{host}/publish"
+                session = generator_api_publish_session()
                 data["url"] = self.output_settings.ci_credentials.url
                 data["token"] = self.output_settings.ci_credentials.token
                 data["username"] = self.output_settings.ci_credentials.username
 
             headers: dict[str, str] = {"Content-Type": "application/json"}
-            response = requests.post(endpoint, headers=headers, data=json.dumps(data), timeout=30)
+            response = session.post(endpoint, headers=headers, data=json.dumps(data), timeout=(5, 30))
+            generator_api_breaker.record_success()
             if response.status_code == 200:
                 logger.info("🔨", "Bamboo YAML Spec file generated", self.output_settings.emoji)
                 body: dict[str, str] = response.json()
@@ -142,15 +500,30 @@ class BambooGenerator(BaseGenerator):
                 return body["key"]
             logger.error("❌", "Bamboo YAML Spec file generation failed", self.output_settings.emoji)
             raise ValueError("Bamboo YAML Spec file generation failed")
-        except requests.exceptions.ConnectionError:
+        except requests.exceptions.ReadTimeout as exception:
+            generator_api_breaker.record_failure()
+            if self.output_settings.ci_credentials is not None:
+                # the plan may have been published already, falling back would publish it a second time
+                logger.error("❌", "Bamboo generator api did not answer the publish request", self.output_settings.emoji)
+                raise ValueError("Bamboo generator api did not answer the publish request") from exception
+            return None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            generator_api_breaker.record_failure()
             return None
 
-    def generate_in_java(self, base64_str: str) -> None:
+    def generate_in_java(self, payload: str) -> None:
         """
         Generate the bamboo specs that can be used to create a plan in bamboo. We call the java jar directly, this is
         intended for when we are in a docker container and can not use the provided bamboo-generator container.
-        :param base64_str: windfile definition as base64 encoded string
+        The windfile is handed to a warm worker of the java worker pool, if the pool is disabled,
+        a new JVM is started for the windfile.
+        :param payload: json string of the windfile definition
         """
+        pool: Optional[WorkerPool] = java_worker_pool()
+        if pool is not None:
+            self.generate_in_pool(pool=pool, payload=payload)
+            return
+        base64_str: str = base64.b64encode(payload.encode("utf-8")).decode("utf-8")
         command: List[str] = ["java", "-jar", "bamboo-generator.jar", "--base64", base64_str]
         if self.output_settings.ci_credentials is not None:
             command += [
@@ -171,20 +544,46 @@ class BambooGenerator(BaseGenerator):
         result_logs: str = process.stdout
         self.result = result_logs
 
-    def generate_in_docker(self, base64_str: str) -> None:
+    def generate_in_pool(self, pool: WorkerPool, payload: str) -> None:
+        """
+        Generate the bamboo specs with a warm worker of the given pool.
+        :param pool: pool of bamboo-generator workers
+        :param payload: json string of the windfile definition
+        """
+        request: dict[str, Optional[str]] = {"windfile": payload}
+        if self.output_settings.ci_credentials is not None:
+            request["url"] = self.output_settings.ci_credentials.url
+            request["token"] = self.output_settings.ci_credentials.token
+        answer: dict[str, Any] = pool.generate(request=request)
+        if "error" in answer:
+            logger.error("❌", f"Bamboo YAML Spec file generation failed: {answer['error']}", self.output_settings.emoji)
+            raise ValueError("Bamboo YAML Spec file generation failed")
+        logger.info("🔨", "Bamboo YAML Spec file generated", self.output_settings.emoji)
+        self.result = answer["result"]
+        self.key = answer["key"]
+
+    def generate_in_docker(self, payload: str) -> None:
         """
         Generate the bamboo specs that can be used to create a plan in bamboo. We call the docker container, this is
         intended for when we are not in a docker container and can use the provided bamboo-generator container.
-        :param base64_str: windfile definition as base64 encoded string
+        The windfile is handed to a long-running container of the container pool, if the pool is disabled,
+        a new container is started for the windfile.
+        :param payload: json string of the windfile definition
         """
+        pool: Optional[WorkerPool] = container_worker_pool()
+        if pool is not None:
+            self.generate_in_pool(pool=pool, payload=payload)
+            return
+        # we use base64 a base64 encoded json string, so we do not have to handle any escaping
+        base64_str: str = base64.b64encode(payload.encode("utf-8")).decode("utf-8")
         client: DockerClient = DockerClient.from_env()
-        container_name: str = "bambeolus"
+        container_name: str = f"bambeolus-{uuid.uuid4().hex[:12]}"
         command: str = f"--base64 {base64_str}"
         if self.output_settings.ci_credentials is not None:
             command += f" --publish --server {self.output_settings.ci_credentials.url} "
             command += f"--token {self.output_settings.ci_credentials.token}"
         client.containers.run(
-            image=os.getenv("BAMBOO_GENERATOR_IMAGE", "ghcr.io/ls1intum/aeolus/bamboo-generator:nightly"),
+            image=bamboo_generator_image(),
             command=f"{command}",
             auto_remove=False,
             name=container_name,
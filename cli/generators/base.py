@@ -11,7 +11,7 @@ from classes.generated.windfile import WindFile
 from classes.input_settings import InputSettings
 from classes.output_settings import OutputSettings
 from classes.pass_metadata import PassMetadata
-from cli_utils import utils
+from cli_utils import logger, utils
 
 
 class BaseGenerator:
@@ -33,6 +33,8 @@ class BaseGenerator:
     needs_lifecycle_parameter: bool = False
     has_multiple_steps: bool = False
     needs_subshells: bool = False
+    # whether publishing changed the job in the CI system, None for targets that cannot tell unchanged jobs apart
+    changed: typing.Optional[bool] = None
 
     def __init__(
         self, windfile: WindFile, input_settings: InputSettings, output_settings: OutputSettings, metadata: PassMetadata
@@ -54,6 +56,7 @@ class BaseGenerator:
         self.before_results = {}
         self.after_results = {}
         self.key = None
+        self.changed = None
         self.has_multiple_steps = (
             len(
                 [
@@ -123,6 +126,37 @@ class BaseGenerator:
             self.results[workdir] = []
         self.results[workdir].append(result)
 
+    def group_steps(
+        self, steps: typing.List[typing.Tuple[str, typing.Optional[typing.List[str]]]], aliases: dict[str, str]
+    ) -> typing.Optional[typing.List[typing.List[str]]]:
+        """
+        Groups the given steps into stages that can run in parallel. Parallel execution is opt-in,
+        as long as no step declares needs, the steps run one after another.
+        :param steps: names of the steps in their order and the names of the actions they need
+        :param aliases: names of the actions in the windfile mapped to the names of the generated steps
+        :return: names of the steps per stage or None if the steps run sequentially
+        """
+        if len(steps) < 2 or all(needs is None for _, needs in steps):
+            return None
+        names: typing.Set[str] = {name for name, _ in steps}
+        dependencies: typing.List[typing.Tuple[str, typing.Optional[typing.List[str]]]] = []
+        for name, needs in steps:
+            resolved: typing.Optional[typing.List[str]] = None
+            if needs is not None:
+                resolved = []
+                for need in needs:
+                    step: typing.Optional[str] = aliases.get(need)
+                    if step is None or step not in names:
+                        logger.info(
+                            "⚠️",
+                            f"{name} needs {need}, which is not executed in the main run. Ignoring...",
+                            self.output_settings.emoji,
+                        )
+                        continue
+                    resolved.append(step)
+            dependencies.append((name, resolved))
+        return utils.group_into_stages(steps=dependencies)
+
     def __needs_lifecycle_parameter(self) -> bool:
         """
         Check if the CI system needs lifecycle parameters.
@@ -8,12 +8,12 @@ from typing import List, Optional
 
 from docker.client import DockerClient  # type: ignore
 from docker.models.containers import Container  # type: ignore
-from docker.types.daemon import CancellableStream  # type: ignore
 from jinja2 import Environment, FileSystemLoader, Template
 
 from classes.generated.definitions import ScriptAction, Repository, Target
 from classes.generated.windfile import WindFile
 from classes.input_settings import InputSettings
+from classes.log_follower import FileSink, LogFollower, LogSink, stdout_sink
 from classes.output_settings import OutputSettings
 from classes.pass_metadata import PassMetadata
 from cli_utils import logger, utils
@@ -33,12 +33,15 @@ class CliGenerator(BaseGenerator):
 
     actions: List[ScriptAction] = []
 
+    aliases: dict[str, str] = {}
+
     def __init__(
         self, windfile: WindFile, input_settings: InputSettings, output_settings: OutputSettings, metadata: PassMetadata
     ):
         input_settings.target = Target.cli
         self.functions = []
         self.actions = []
+        self.aliases = {}
         super().__init__(windfile, input_settings, output_settings, metadata)
 
     def handle_step(self, name: str, step: ScriptAction, call: bool) -> None:
@@ -88,6 +91,11 @@ class CliGenerator(BaseGenerator):
             valid_funtion_name += f"_{number}"
         if call:
             self.functions.append(valid_funtion_name)
+        self.aliases[name] = valid_funtion_name
+        original_name: Optional[str] = self.metadata.get_original_name_of(name)
+        if original_name is not None:
+            # needs refer to the action in the windfile, so they wait for the last action it was inlined into
+            self.aliases[original_name] = valid_funtion_name
         step.name = valid_funtion_name
 
         if step.results:
@@ -98,6 +106,16 @@ class CliGenerator(BaseGenerator):
         self.actions.append(step)
         return None
 
+    def parallel_stages(self) -> Optional[List[List[str]]]:
+        """
+        Groups the functions into stages that can run in parallel.
+        :return: functions per stage or None if the functions run sequentially
+        """
+        steps: List[typing.Tuple[str, Optional[List[str]]]] = [
+            (action.name, action.needs) for action in self.actions if action.name in self.functions
+        ]
+        return self.group_steps(steps=steps, aliases=self.aliases)
+
     def check(self, content: str) -> bool:
         """
         Check the generated bash file for syntax errors.
@@ -144,6 +162,32 @@ class CliGenerator(BaseGenerator):
                 container_image += ":" + tag
         return container_image
 
+    def follow_logs(self, container: Container) -> None:
+        """
+        Prints the output of the running container line by line, writes it to the log file and hands it to
+        the log callback of the run settings, and reports how long every step took.
+        :param container: running container
+        """
+        if self.output_settings.run_settings is None:
+            return
+        sinks: List[LogSink] = [stdout_sink]
+        file_sink: Optional[FileSink] = None
+        if self.output_settings.run_settings.log_file is not None:
+            file_sink = FileSink(path=self.output_settings.run_settings.log_file)
+            sinks.append(file_sink)
+        if self.output_settings.run_settings.log_callback is not None:
+            sinks.append(self.output_settings.run_settings.log_callback)
+        follower: LogFollower = LogFollower(sinks=sinks)
+        try:
+            exit_code: Optional[int] = follower.follow(container=container)
+        finally:
+            if file_sink is not None:
+                file_sink.close()
+        for step, seconds in follower.timings.items():
+            logger.info("⏱️", f"{step} took {seconds:.2f}s", self.output_settings.emoji)
+        if exit_code != 0:
+            logger.error("❌", f"{container.name} exited with {exit_code}", self.output_settings.emoji)
+
     def run(self, job_id: str) -> None:
         """
         Run the generated bash script.
@@ -175,16 +219,7 @@ class CliGenerator(BaseGenerator):
                 detach=True,
             )
             container: Container = client.containers.get(container_name)
-            logs: CancellableStream = container.logs(stream=True, stdout=True, stderr=True)
-            lines: List[str] = logs.next().decode("utf-8").split("\n")
-            while container.status == "running" or lines:
-                try:
-                    for line in lines:
-                        if line:
-                            print(line)
-                    lines = logs.next().decode("utf-8").split("\n")
-                except StopIteration:
-                    break
+            self.follow_logs(container=container)
             container.remove()
             os.unlink(temp.name)
         return
@@ -198,13 +233,15 @@ class CliGenerator(BaseGenerator):
             env = Environment(loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "..", "templates")))
             self.template = env.get_template("cli.sh.j2")
 
+        stages: Optional[List[List[str]]] = self.parallel_stages()
         # Prepare your data
         data: dict[str, typing.Any] = {
-            "has_multiple_steps": self.has_multiple_steps,
+            "has_multiple_steps": self.has_multiple_steps or stages is not None,
             "initial_directory_variable": self.initial_directory_variable,
             "environment": self.windfile.environment.root.root if self.windfile.environment else {},
             "needs_lifecycle_parameter": self.needs_lifecycle_parameter,
             "needs_subshells": self.needs_subshells,
+            "parallel_stages": stages,
             "has_always_actions": self.has_always_actions(),
             "functions": self.functions,
             "steps": self.actions,
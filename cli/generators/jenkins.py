@@ -4,21 +4,37 @@ Jenkins generator. Generates a jenkins pipeline to be used in the Jenkins CI sys
 The generated pipeline is a scripted pipeline.
 """
 import os
+import re
 import typing
 from typing import Optional, List
-from xml.dom.minidom import Document, parseString, Element
 
-import jenkins  # type: ignore
 from jinja2 import Environment, FileSystemLoader, Template
 
 from classes.generated.definitions import Target, Action, ScriptAction
 from classes.generated.windfile import WindFile
 from classes.input_settings import InputSettings
+from classes.jenkins_client import JenkinsClient, get_jenkins_client
 from classes.output_settings import OutputSettings
 from classes.pass_metadata import PassMetadata
 from cli_utils import logger, utils
 from generators.base import BaseGenerator
 
+COMMIT_PATTERN: re.Pattern = re.compile(r"^[0-9a-f]{7,40}$")
+
+
+def branch_name(branch: str) -> Optional[str]:
+    """
+    Returns the name of the branch the given checkout target refers to, tags (refs/tags/...),
+    commits and patterns (e.g. */main) are not branches.
+    :param branch: branch of a repository in the windfile
+    :return: name of the branch or None if the target is not a branch
+    """
+    if branch.startswith("refs/heads/"):
+        return branch.removeprefix("refs/heads/")
+    if branch.startswith("refs/") or "*" in branch or COMMIT_PATTERN.match(branch):
+        return None
+    return branch
+
 
 class JenkinsGenerator(BaseGenerator):
     """
@@ -53,66 +69,62 @@ class JenkinsGenerator(BaseGenerator):
         """
         if self.output_settings.ci_credentials is None:
             raise ValueError("Publishing requires a CI URL and a token, with Jenkins we also need a username")
-        server = jenkins.Jenkins(
-            self.output_settings.ci_credentials.url,
-            username=self.output_settings.ci_credentials.username,
-            password=self.output_settings.ci_credentials.token,
-        )
+        client: JenkinsClient = get_jenkins_client(credentials=self.output_settings.ci_credentials)
         job_name: str = job_id.replace("-", "/")
         logger.info("🔨", f"Triggering Jenkins build for {job_name}", self.output_settings.emoji)
         if self.output_settings.run_settings is not None:
-            server.build_job(job_name, parameters={"current_lifecycle": self.output_settings.run_settings.stage})
+            client.server.build_job(job_name, parameters={"current_lifecycle": self.output_settings.run_settings.stage})
 
     def publish(self) -> None:
         """
-        Publish the pipeline to the Jenkins CI system.
+        Publish the pipeline to the Jenkins CI system. Unchanged pipelines are not published again.
         """
         if self.windfile.metadata.id is None:
             raise ValueError("Publishing requires an id")
         if self.output_settings.ci_credentials is None:
             raise ValueError("Publishing requires a CI URL and a token, with Jenkins we also need a username")
-        server = jenkins.Jenkins(
-            self.output_settings.ci_credentials.url,
-            username=self.output_settings.ci_credentials.username,
-            password=self.output_settings.ci_credentials.token,
-        )
-
-        pipeline_config: str = """
-            <flow-definition plugin="workflow-job">
-                <description/>
-                <keepDependencies>false</keepDependencies>
-                <definition class="org.jenkinsci.plugins.workflow.cps.CpsFlowDefinition" plugin="workflow-cps">
-                <script/>
-                <sandbox>true</sandbox>
-                </definition>
-                <triggers/>
-                <disabled>false</disabled>
-                <properties>
-                <hudson.security.AuthorizationMatrixProperty>
-                    <inheritanceStrategy class="org.jenkinsci.plugins.matrixauth.inheritance.InheritParentStrategy"/>
-                </hudson.security.AuthorizationMatrixProperty>
-                </properties>
-            </flow-definition>
-        """
-
-        # Create the Jenkins Pipeline Job
+        client: JenkinsClient = get_jenkins_client(credentials=self.output_settings.ci_credentials)
         job_name: str = self.windfile.metadata.id
-        if "/" in job_name:
-            path: List[str] = job_name.split("/")
-            for i in range(len(path) - 1):
-                server.create_folder(path[i], ignore_failures=True)
-        exists: bool = server.job_exists(job_name)
-
-        config_xml: Document = parseString(server.get_job_config(job_name) if exists else pipeline_config)
-
-        script: Element = config_xml.getElementsByTagName("script")[0]
-        if exists:
-            script.removeChild(script.firstChild)
-        script.appendChild(config_xml.createTextNode(super().generate()))
-
-        server.upsert_job(job_name, config_xml.toxml())
+        self.changed = client.publish(job_name=job_name, script=super().generate())
+        if not self.changed:
+            logger.info("💤", f"{job_name} is unchanged, skipping the update", self.output_settings.emoji)
         self.key = job_name
 
+    def has_independent_repositories(self) -> bool:
+        """
+        Checks whether the repositories can be checked out in parallel, which is the case
+        for multiple repositories that are checked out into separate directories.
+        :return: True if the repositories can be checked out in parallel
+        """
+        if not self.windfile.repositories or len(self.windfile.repositories) < 2:
+            return False
+        paths: List[str] = [os.path.normpath(repository.path) for repository in self.windfile.repositories.values()]
+        for path in paths:
+            if path == "." or any(other != path and other.startswith(path + os.sep) for other in paths):
+                return False
+        return len(set(paths)) == len(paths)
+
+    def parallel_stages(self, steps: List[Action]) -> Optional[List[List[typing.Any]]]:
+        """
+        Groups the given steps into stages that can run in parallel.
+        :param steps: steps of the pipeline
+        :return: steps per stage or None if the steps run sequentially
+        """
+        aliases: dict[str, str] = {}
+        for action in steps:
+            aliases[action.root.name] = action.root.name
+            original_name: Optional[str] = self.metadata.get_original_name_of(action.root.name)
+            if original_name is not None:
+                # needs refer to the action in the windfile, so they wait for the last action it was inlined into
+                aliases[original_name] = action.root.name
+        stages: Optional[List[List[str]]] = self.group_steps(
+            steps=[(action.root.name, getattr(action.root, "needs", None)) for action in steps], aliases=aliases
+        )
+        if stages is None:
+            return None
+        by_name: dict[str, typing.Any] = {action.root.name: action.root for action in steps}
+        return [[by_name[name] for name in stage] for stage in stages]
+
     def generate_using_jinja2(self) -> str:
         """
         Generate the bash script to be used as a local CI system with jinja2.
@@ -154,16 +166,25 @@ class JenkinsGenerator(BaseGenerator):
                 for result in action.root.results:
                     self.add_result(action.root.workdir, result)
 
+        steps: List[Action] = [action for action in actions if not action.root.runAlways]
         data: dict[str, typing.Any] = {
             "docker": self.windfile.metadata.docker,
             "environment": self.windfile.environment.root.root if self.windfile.environment else None,
             "needs_lifecycle_parameter": self.needs_lifecycle_parameter,
             "repositories": self.windfile.repositories if self.windfile.repositories else None,
             "has_always_actions": self.has_always_actions(),
-            "steps": [action.root for action in actions if not action.root.runAlways],
+            "steps": [action.root for action in steps],
+            "step_stages": self.parallel_stages(steps=steps),
+            "parallel_checkout": self.has_independent_repositories(),
             "always_steps": [action.root for action in actions if action.root.runAlways],
             "metadata": self.windfile.metadata,
             "repo_metadata": self.metadata.get(scope="repositories"),
+            # only branches can be fetched with a narrowed refspec, tags and commits need the default one
+            "shallow_branches": {
+                name: branch_name(repository.branch)
+                for name, repository in (self.windfile.repositories or {}).items()
+                if repository.depth and branch_name(repository.branch)
+            },
             "has_results": self.has_results(),
             "results": self.results,
         }
@@ -16,7 +16,9 @@ from classes.run_settings import RunSettings
 from cli_utils import utils
 from commands.generate import Generate
 from commands.merge import Merge
+from commands.publish_many import PublishMany
 from commands.translate import Translate
+from commands.translate_many import TranslateMany
 from commands.validate import Validate
 
 
@@ -67,8 +69,14 @@ def add_argparse() -> argparse.ArgumentParser:
     generator_parser = subparsers.add_parser(name="generate")
     Generate.add_arg_parser(parser=generator_parser)
 
+    publish_many_parser = subparsers.add_parser(name="publish-many")
+    PublishMany.add_arg_parser(parser=publish_many_parser)
+
     bamboo_translator_parser = subparsers.add_parser(name="translate")
     Translate.add_arg_parser(parser=bamboo_translator_parser)
+
+    translate_many_parser = subparsers.add_parser(name="translate-many")
+    TranslateMany.add_arg_parser(parser=translate_many_parser)
     return arg_parser
 
 
@@ -96,6 +104,12 @@ if __name__ == "__main__":
     output_settings: OutputSettings = OutputSettings(
         verbose=args.verbose, debug=args.debug, emoji=args.emoji, ci_credentials=None
     )
+    if args.command == "publish-many":
+        publisher: PublishMany = PublishMany(output_settings=output_settings, args=args)
+        sys.exit(0 if publisher.publish() else 1)
+    if args.command == "translate-many":
+        bulk_translator: TranslateMany = TranslateMany(output_settings=output_settings, args=args)
+        sys.exit(0 if bulk_translator.translate() else 1)
     file_path: str = args.key if "translate" == args.command else args.input.name
     file: typing.Optional[TextIOWrapper] = None if "translate" == args.command else args.input
     input_settings: InputSettings = InputSettings(file_path=file_path, file=file)
@@ -135,7 +149,7 @@ if __name__ == "__main__":
                 )
                 raise ValueError(f"Running in {args.target} is only supported with credentials")
             if args.target == "cli" or (args.url and args.token):
-                output_settings.run_settings = RunSettings(stage=args.run)
+                output_settings.run_settings = RunSettings(stage=args.run, log_file=args.log_file)
 
         generator: Generate = Generate(
             input_settings=input_settings,
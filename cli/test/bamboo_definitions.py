@@ -0,0 +1,72 @@
+# pylint: disable=line-too-long
+BAMBOO_SPECS: str = """---
+version: 2
+plan:
+  project-key: COURSE
+  key: EXERCISE
+  name: Exercise
+  description: Build plan of an exercise
+stages:
+- Default Stage:
+    manual: false
+    final: false
+    jobs:
+    - Default Job
+Default Job:
+  key: JOB1
+  docker:
+    image: ls1tum/artemis-maven-template:java17-20
+    volumes:
+      ${bamboo.working.directory}: ${bamboo.working.directory}
+    docker-run-arguments:
+    - --cpus=2
+  tasks:
+  - checkout:
+      path: assignment
+      repository: assignment
+      force-clean-build: true
+      description: Checkout Default Repository
+  - script:
+      interpreter: SHELL
+      scripts:
+      - ./gradlew clean test
+      working-dir: assignment
+      description: tests
+      conditions:
+      - variable:
+          matches:
+            lifecycle_stage: working_time|evaluation
+  final-tasks:
+  - test-parser:
+      type: junit
+      ignore-time: false
+      test-results: '**/test-results/test/*.xml'
+      description: JUnit Parser
+  artifact-subscriptions: []
+repositories:
+- assignment:
+    type: git
+    url: https://github.com/ls1intum/Aeolus.git
+    branch: main
+    shared-credentials: artemis_gitlab_admin_credentials
+    command-timeout-minutes: '180'
+    lfs: false
+    verbose-logs: false
+    use-shallow-clones: false
+    cache-on-agents: true
+    submodules: false
+    ssh-key-applies-to-submodules: false
+    fetch-all: false
+triggers:
+- polling:
+    period: '180'
+---
+version: 2
+plan:
+  key: COURSE-EXERCISE
+plan-permissions:
+- users:
+  - aeolus
+  permissions:
+  - view
+"""
@@ -0,0 +1,125 @@
+import logging
+import os
+import tempfile
+import unittest
+from typing import Optional
+from unittest import mock
+
+from test.actionfile_definitions import VALID_ACTIONFILE_WITH_TWO_ACTIONS
+from git import Repo
+
+from classes.action_cache import ActionCache, split_reference
+from classes.generated.definitions import TemplateAction
+from classes.input_settings import InputSettings
+from classes.merger import Merger
+from classes.output_settings import OutputSettings
+from classes.pass_metadata import PassMetadata
+
+
+class ActionCacheTests(unittest.TestCase):
+    remote: tempfile.TemporaryDirectory
+    cache_directory: tempfile.TemporaryDirectory
+    url: str
+
+    def setUp(self) -> None:
+        """
+        Set up a local repository that acts as the remote of a template action
+        """
+        logging.basicConfig(encoding="utf-8", level=logging.DEBUG, format="%(message)s")
+        # pylint: disable=consider-using-with
+        self.remote = tempfile.TemporaryDirectory()
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.url = os.path.join(self.remote.name, "action.git")
+        repo: Repo = Repo.init(self.url, initial_branch="main")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "aeolus")
+            config.set_value("user", "email", "aeolus@example.com")
+        self.commit(repo=repo, content=VALID_ACTIONFILE_WITH_TWO_ACTIONS)
+
+    def tearDown(self) -> None:
+        self.remote.cleanup()
+        self.cache_directory.cleanup()
+
+    def commit(self, repo: Repo, content: str) -> str:
+        with open(os.path.join(self.url, "action.yaml"), "w", encoding="utf-8") as file:
+            file.write(content)
+        repo.index.add(["action.yaml"])
+        return repo.index.commit("update action").hexsha
+
+    def test_split_reference(self) -> None:
+        self.assertEqual(split_reference("action"), ("action", None))
+        self.assertEqual(split_reference("action@v1"), ("action", "v1"))
+        self.assertEqual(
+            split_reference("https://github.com/ls1intum/action.git@feature/x"),
+            ("https://github.com/ls1intum/action.git", "feature/x"),
+        )
+        self.assertEqual(
+            split_reference("git@github.com:ls1intum/action.git"), ("git@github.com:ls1intum/action.git", None)
+        )
+
+    def test_second_lookup_is_a_hit(self) -> None:
+        cache: ActionCache = ActionCache(directory=self.cache_directory.name, max_size=1024 * 1024 * 1024, ttl=3600)
+        first: Optional[str] = cache.get(url=self.url, reference="main")
+        if first is None:
+            self.fail("Action could not be fetched")
+        self.assertTrue(os.path.exists(os.path.join(first, "action.yaml")))
+        # the remote is gone, so a second fetch would fail
+        self.remote.cleanup()
+        second: Optional[str] = cache.get(url=self.url, reference="main")
+        self.assertEqual(first, second)
+
+    def test_branch_is_refreshed_after_ttl(self) -> None:
+        cache: ActionCache = ActionCache(directory=self.cache_directory.name, max_size=1024 * 1024 * 1024, ttl=0)
+        first: Optional[str] = cache.get(url=self.url, reference="main")
+        updated: str = self.commit(repo=Repo(self.url), content=VALID_ACTIONFILE_WITH_TWO_ACTIONS + "\n# updated\n")
+        second: Optional[str] = cache.get(url=self.url, reference="main")
+        if first is None or second is None:
+            self.fail("Action could not be fetched")
+        self.assertNotEqual(first, second)
+        self.assertEqual(os.path.basename(second), updated)
+        with open(os.path.join(second, "action.yaml"), encoding="utf-8") as file:
+            self.assertIn("# updated", file.read())
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache: ActionCache = ActionCache(directory=self.cache_directory.name, max_size=1, ttl=0)
+        first: Optional[str] = cache.get(url=self.url)
+        self.commit(repo=Repo(self.url), content=VALID_ACTIONFILE_WITH_TWO_ACTIONS + "\n# updated\n")
+        second: Optional[str] = cache.get(url=self.url)
+        if first is None or second is None:
+            self.fail("Action could not be fetched")
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+
+    def test_entry_in_use_is_not_evicted(self) -> None:
+        cache: ActionCache = ActionCache(directory=self.cache_directory.name, max_size=1, ttl=0)
+        with cache.checkout(url=self.url) as first:
+            self.commit(repo=Repo(self.url), content=VALID_ACTIONFILE_WITH_TWO_ACTIONS + "\n# updated\n")
+            second: Optional[str] = cache.get(url=self.url)
+            if first is None or second is None:
+                self.fail("Action could not be fetched")
+            self.assertTrue(os.path.exists(os.path.join(first, "action.yaml")))
+        # once nobody uses the entries anymore, their locks are dropped
+        self.assertEqual(cache._entry_locks, {})  # pylint: disable=protected-access
+        cache.evict(keep=second)
+        self.assertFalse(os.path.exists(first))
+
+    def test_merger_pulls_a_commit_without_cache(self) -> None:
+        repo: Repo = Repo(self.url)
+        pinned: str = repo.head.commit.hexsha
+        self.commit(repo=repo, content="not an action file")
+        merger: Merger = Merger(
+            windfile=None,
+            input_settings=InputSettings(file_path=os.path.join(self.url, "windfile.yaml")),
+            output_settings=OutputSettings(),
+            metadata=PassMetadata(),
+        )
+        action: TemplateAction = TemplateAction.model_validate({"name": "pinned", "use": f"{self.url}@{pinned}"})
+        with mock.patch("classes.merger.shared_action_cache", return_value=None):
+            pulled = merger.pull_external_action(action=action)
+        if pulled is None:
+            self.fail("Action could not be pulled")
+        self.assertEqual(len(pulled[1]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
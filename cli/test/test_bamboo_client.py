@@ -0,0 +1,125 @@
+import dataclasses
+import http.server
+import json
+import threading
+import typing
+import unittest
+from test.bamboo_definitions import BAMBOO_SPECS
+
+import yaml
+
+from classes.bamboo_client import (
+    BambooApiError,
+    BambooClient,
+    create_bamboo_session,
+    get_bamboo_client,
+    parse_plan_code,
+)
+from classes.bamboo_specs import BambooSpecialTask, LazyMapping
+from classes.ci_credentials import CICredentials
+
+
+class StubBamboo(http.server.BaseHTTPRequestHandler):
+    """
+    Answers like the specs API of Bamboo. The first request fails with 503, the specs are served with an ETag.
+    """
+
+    requests: typing.List[dict[str, typing.Optional[str]]] = []
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        StubBamboo.requests.append({"path": self.path, "If-None-Match": self.headers.get("If-None-Match")})
+        if len(StubBamboo.requests) == 1:
+            self.send_response(503)
+            self.end_headers()
+        elif not self.path.startswith("/rest/api/latest/plan/COURSE-EXERCISE/specs"):
+            self.send_response(404)
+            self.end_headers()
+        elif self.headers.get("If-None-Match") == '"1"':
+            self.send_response(304)
+            self.end_headers()
+        else:
+            body: bytes = json.dumps({"spec": {"code": BAMBOO_SPECS}}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("ETag", '"1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: typing.Any) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+
+class BambooClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        StubBamboo.requests = []
+        self.server: http.server.ThreadingHTTPServer = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubBamboo)
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.client: BambooClient = BambooClient(
+            credentials=CICredentials(url=f"http://127.0.0.1:{self.server.server_port}", username=None, token="token"),
+            session=create_bamboo_session(retries=2),
+        )
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retries_and_reuses_unchanged_specs(self) -> None:
+        first = self.client.get_plan_yaml(plan_key="COURSE-EXERCISE")
+        second = self.client.get_plan_yaml(plan_key="COURSE-EXERCISE")
+        assert first is not None and second is not None
+        self.assertEqual(first[0].plan.key, "EXERCISE")
+        self.assertEqual(second[0].plan.name, "Exercise")
+        self.assertEqual([request["If-None-Match"] for request in StubBamboo.requests], [None, None, '"1"'])
+
+    def test_forgets_least_recently_used_specs(self) -> None:
+        self.client.max_documents = 1
+        self.client.get_json(path="plan/COURSE-EXERCISE/specs", params={"format": "YAML"})
+        self.client.get_json(path="plan/COURSE-EXERCISE/specs", params={"format": "YAML", "page": 2})
+        self.assertEqual(len(self.client.documents), 1)
+        self.assertIn("page", next(iter(self.client.documents)))
+
+    def test_shares_client_per_server_and_user(self) -> None:
+        credentials: CICredentials = CICredentials(url="http://127.0.0.1:1", username=None, token="token")
+        client: BambooClient = get_bamboo_client(credentials=credentials)
+        self.assertIs(
+            get_bamboo_client(credentials=CICredentials(url=credentials.url, username=None, token="token")), client
+        )
+        self.assertIsNot(
+            get_bamboo_client(credentials=CICredentials(url=credentials.url, username=None, token="other")), client
+        )
+
+    def test_parses_specs_once_without_changing_them(self) -> None:
+        specs, raw = parse_plan_code(code=BAMBOO_SPECS)
+        self.assertEqual(raw, yaml.safe_load(BAMBOO_SPECS.split("\n---\n", maxsplit=1)[0]))
+        tasks = specs.stages["Default Stage"].jobs["Default Job"].tasks
+        self.assertEqual(len(tasks), 3)
+        assert isinstance(tasks[-1], BambooSpecialTask)
+        self.assertTrue(tasks[-1].always_execute)
+
+    def test_specs_are_slotted_and_frozen(self) -> None:
+        specs, _ = parse_plan_code(code=BAMBOO_SPECS)
+        self.assertFalse(hasattr(specs.plan, "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            specs.plan.name = "changed"  # type: ignore
+
+    def test_converts_stages_on_access(self) -> None:
+        specs, _ = parse_plan_code(code=BAMBOO_SPECS)
+        assert isinstance(specs.stages, LazyMapping)
+        self.assertEqual(list(specs.stages), ["Default Stage"])
+        self.assertEqual(specs.stages.materialized(), 0)
+        jobs = specs.stages["Default Stage"].jobs
+        self.assertEqual(specs.stages.materialized(), 1)
+        assert isinstance(jobs, LazyMapping)
+        self.assertEqual(list(jobs), ["Default Job"])
+        self.assertEqual(jobs.materialized(), 0)
+        self.assertEqual(jobs["Default Job"].key, "JOB1")
+        self.assertEqual(jobs.materialized(), 1)
+
+    def test_raises_on_unexpected_status(self) -> None:
+        with self.assertRaises(BambooApiError) as context:
+            self.client.get_plan_yaml(plan_key="COURSE-MISSING")
+        self.assertEqual(context.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
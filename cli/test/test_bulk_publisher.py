@@ -0,0 +1,90 @@
+import os
+import tempfile
+import typing
+import unittest
+from unittest import mock
+
+from classes.bulk_publisher import (
+    FAILED,
+    PUBLISHED,
+    SUBMITTED,
+    BulkPublisher,
+    PublishResult,
+    collect_windfiles,
+    summary_table,
+)
+from classes.ci_credentials import CICredentials
+from classes.generated.definitions import Target
+from classes.generated.windfile import WindFile
+from classes.input_settings import InputSettings
+from generators.bamboo import BambooGenerator
+
+
+class BulkPublisherTests(unittest.TestCase):
+    def test_collects_windfiles_of_a_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "exercise"))
+            for name in ["b.yaml", "a.yml", "README.md", os.path.join("exercise", "windfile.yaml")]:
+                with open(os.path.join(directory, name), "w", encoding="utf-8") as file:
+                    file.write("")
+            found: typing.List[str] = collect_windfiles(source=directory)
+            self.assertEqual(
+                [os.path.relpath(path, directory) for path in found],
+                ["a.yml", "b.yaml", os.path.join("exercise", "windfile.yaml")],
+            )
+
+    def test_collects_windfiles_of_a_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            manifest: str = os.path.join(directory, "manifest.txt")
+            with open(manifest, "w", encoding="utf-8") as file:
+                file.write("first/windfile.yaml\n\nsecond/windfile.yaml\n")
+            self.assertEqual(
+                collect_windfiles(source=manifest),
+                [os.path.join(directory, "first/windfile.yaml"), os.path.join(directory, "second/windfile.yaml")],
+            )
+
+    def test_reports_failures(self) -> None:
+        publisher: BulkPublisher = BulkPublisher(
+            target=Target.jenkins,
+            credentials=CICredentials(url="http://localhost:1", username="aeolus", token="token"),
+            workers=2,
+            rate=0,
+        )
+        results: typing.List[PublishResult] = list(publisher.publish_files(paths=["does-not-exist.yaml"]))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].status, FAILED)
+
+    def test_reports_bamboo_plans_as_submitted(self) -> None:
+        publisher: BulkPublisher = BulkPublisher(
+            target=Target.bamboo,
+            credentials=CICredentials(url="http://localhost:1", username=None, token="token"),
+            workers=1,
+            rate=0,
+        )
+        windfile: WindFile = WindFile.model_validate(
+            {
+                "api": "v0.0.1",
+                "metadata": {"name": "a", "id": "COURSE-A", "description": "a", "author": "a"},
+                "actions": [{"name": "a", "script": "echo a"}],
+            }
+        )
+        with mock.patch.object(BambooGenerator, "generate", return_value=""):
+            results: typing.List[PublishResult] = list(
+                publisher.publish(items=[("a", InputSettings(file_path="a.yaml", windfile=windfile))])
+            )
+        self.assertEqual([result.status for result in results], [SUBMITTED])
+
+    def test_summary_table(self) -> None:
+        results: typing.List[PublishResult] = [
+            PublishResult(name="a.yaml", status=PUBLISHED, duration=1.0, key="COURSE/a"),
+            PublishResult(name="b.yaml", status=FAILED, duration=0.5, detail="no id"),
+            PublishResult(name="c.yaml", status=SUBMITTED, duration=0.7, key="COURSE-C"),
+        ]
+        table: str = summary_table(results=results, duration=1.2)
+        self.assertIn("COURSE/a", table)
+        self.assertIn("no id", table)
+        self.assertTrue(table.endswith("1 published, 0 unchanged, 1 submitted, 1 failed in 1.20s"))
+
+
+if __name__ == "__main__":
+    unittest.main()
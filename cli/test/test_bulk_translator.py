@@ -0,0 +1,62 @@
+import os
+import tempfile
+import typing
+import unittest
+from typing import Optional
+
+from test.windfile_definitions import VALID_WINDFILE_INTERNAL_ACTION
+
+from classes.bulk_translator import FAILED, SKIPPED, TRANSLATED, BulkTranslator, TranslationResult
+from classes.ci_credentials import CICredentials
+from classes.generated.windfile import WindFile
+from cli_utils.utils import validate_content
+
+
+class BulkTranslatorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.translated: typing.List[str] = []
+
+    def to_windfile(self, plan_key: str, fields: typing.Any = None) -> Optional[WindFile]:
+        self.assertIsNone(fields)
+        self.translated.append(plan_key)
+        if plan_key == "BROKEN-PLAN":
+            raise ValueError("could not get plan")
+        return validate_content(filetype=WindFile, content=VALID_WINDFILE_INTERNAL_ACTION)
+
+    def translate(self, directory: str, plan_keys: typing.List[str]) -> dict[str, str]:
+        translator: BulkTranslator = BulkTranslator(
+            credentials=CICredentials(url="http://localhost:1", username=None, token="token"),
+            output_directory=directory,
+            workers=2,
+            rate=0,
+            retries=0,
+        )
+        translator.translator.to_windfile = self.to_windfile  # type: ignore
+        results: typing.List[TranslationResult] = list(translator.translate(plan_keys=plan_keys))
+        return {result.plan_key: result.status for result in results}
+
+    def test_writes_windfiles_and_reports_failures(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            statuses: dict[str, str] = self.translate(directory, ["COURSE-PLAN", "BROKEN-PLAN", "COURSE-PLAN"])
+            self.assertEqual(statuses, {"COURSE-PLAN": TRANSLATED, "BROKEN-PLAN": FAILED})
+            self.assertEqual(os.listdir(directory), ["COURSE-PLAN.yaml"])
+            with open(os.path.join(directory, "COURSE-PLAN.yaml"), "r", encoding="utf-8") as file:
+                self.assertIn("internal-action", file.read())
+
+    def test_resumes_interrupted_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            self.translate(directory, ["COURSE-PLAN", "BROKEN-PLAN"])
+            self.translated.clear()
+            statuses: dict[str, str] = self.translate(directory, ["COURSE-PLAN", "BROKEN-PLAN"])
+            self.assertEqual(statuses, {"COURSE-PLAN": SKIPPED, "BROKEN-PLAN": FAILED})
+            self.assertEqual(self.translated, ["BROKEN-PLAN"])
+
+    def test_rejects_plan_keys_that_are_no_file_names(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            statuses: dict[str, str] = self.translate(directory, ["../COURSE-PLAN", "COURSE-PLAN"])
+            self.assertEqual(statuses, {"../COURSE-PLAN": FAILED, "COURSE-PLAN": TRANSLATED})
+            self.assertEqual(self.translated, ["COURSE-PLAN"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,17 +6,20 @@ from test.windfile_definitions import (
     VALID_WINDFILE_WITH_ENV_VARIABLES_AND_DOCKER,
     VALID_WINDFILE_WITH_MULTIPLE_REPOSITORIES,
 )
+from pydantic import ValidationError
+
 from generators.bamboo import BambooGenerator
 from generators.base import BaseGenerator
 from generators.cli import CliGenerator
 from generators.jenkins import JenkinsGenerator
+from classes.generated.definitions import Target
 from classes.generated.environment import EnvironmentSchema
 from classes.generated.windfile import WindFile
 from classes.input_settings import InputSettings
 from classes.merger import Merger
 from classes.pass_metadata import PassMetadata
 from classes.output_settings import OutputSettings
-from cli_utils.utils import TemporaryFileWithContent
+from cli_utils.utils import TemporaryFileWithContent, EnvironmentRegistry, replace_environment_variable
 
 
 class EnvironmentReplacementTests(unittest.TestCase):
@@ -44,6 +47,39 @@ class EnvironmentReplacementTests(unittest.TestCase):
     def test_set_repository_env_variables_cli(self) -> None:
         self.generate_and_check_if_repository_variables_are_set(generator=CliGenerator)
 
+    def test_environment_is_loaded_once(self) -> None:
+        registry: EnvironmentRegistry = EnvironmentRegistry()
+        first: Optional[EnvironmentSchema] = registry.get(target=Target.jenkins, output_settings=self.output_settings)
+        second: Optional[EnvironmentSchema] = registry.get(target=Target.jenkins, output_settings=self.output_settings)
+        if first is None:
+            self.fail("Environment is None")
+        self.assertIs(first, second)
+        with self.assertRaises(ValidationError):
+            setattr(first, "WORKDIR", "changed")
+
+    def test_replacement_does_not_depend_on_the_order(self) -> None:
+        environment: EnvironmentSchema = EnvironmentSchema(
+            JOB_NAME="bamboo.plan",
+            JOB_ID="JOB_NAME",
+            JOB_URI="bamboo.buildResultKey",
+            JOB_URL="bamboo.buildResultsUrl",
+            RUNNER_NAME="bamboo.agentId",
+            BRANCH_NAME="bamboo.planBranch",
+            WORKDIR="bamboo.working.directory",
+            TMPDIR="bamboo.tmp.directory",
+            REPOSITORY_URL="bamboo.planRepository.repositoryUrl",
+        )
+        # BRANCH_NAME must not become JOB_NAMEBranch, even though JOB_NAME is defined first
+        self.assertEqual(
+            replace_environment_variable(environment=environment, haystack="${bamboo.planBranch}", reverse=True),
+            "${BRANCH_NAME}",
+        )
+        # replaced values are not replaced again, JOB_ID is JOB_NAME, not bamboo.plan
+        self.assertEqual(
+            replace_environment_variable(environment=environment, haystack="$JOB_ID $JOB_NAME"),
+            "$JOB_NAME $bamboo.plan",
+        )
+
     def generate_and_check_if_all_env_variables_are_replaced(
         self, generator: Union[Type[JenkinsGenerator] | Type[CliGenerator] | Type[BambooGenerator]]
     ) -> None:
@@ -1,10 +1,16 @@
 import logging
+import os
+import subprocess
 import unittest
 from typing import Optional
 
 from test.windfile_definitions import (
     VALID_WINDFILE_INTERNAL_ACTION,
     WINDFILE_WITH_ALWAYS_ACTION,
+    WINDFILE_WITH_FAILING_PARALLEL_ACTION,
+    WINDFILE_WITH_NEEDS,
+    WINDFILE_WITH_REPOSITORIES_AND_NEEDS,
+    WINDFILE_WITH_SHALLOW_REPOSITORY,
     WINDFILE_WITH_WORKDIR_ACTION,
 )
 from classes.generated.definitions import Target
@@ -132,6 +138,69 @@ class GenerateTests(unittest.TestCase):
             self.assertTrue(result.count('cd "/aeolus"') == 1)
             self.assertIn("export AEOLUS_INITIAL_DIRECTORY=${PWD}", result)
             self.assertTrue(result.count('cd "${AEOLUS_INITIAL_DIRECTORY}"') == len(windfile.actions))
+            # every step runs in a subshell instead of sourcing the script again
+            self.assertIn("( internalaction )", result)
+            self.assertNotIn("bash -c", result)
+            self.assertNotIn("aeolus_sourcing", result)
+
+    def test_generate_cli_script_with_parallel_stages(self) -> None:
+        with TemporaryFileWithContent(WINDFILE_WITH_NEEDS) as file:
+            metadata: PassMetadata = PassMetadata()
+            merger: Merger = Merger(
+                windfile=None,
+                input_settings=InputSettings(file=file, file_path=file.name, target=Target.cli),
+                output_settings=self.output_settings,
+                metadata=metadata,
+            )
+            windfile: Optional[WindFile] = merger.merge()
+            self.assertIsNotNone(windfile)
+            if windfile is None:
+                self.fail("Windfile is None")
+            cli: CliGenerator = CliGenerator(
+                input_settings=InputSettings(file=file, file_path=file.name, target=Target.cli),
+                output_settings=self.output_settings,
+                windfile=windfile,
+                metadata=metadata,
+            )
+            result: str = cli.generate()
+            self.assertEqual(cli.parallel_stages(), [["build", "lint"], ["test", "docs"], ["report"]])
+            self.assertIn("aeolus_run_parallel build lint", result)
+            self.assertIn("aeolus_run_parallel test docs", result)
+            self.assertIn("trap \"echo '⚙️ finished ${1}'\" EXIT", result)
+            self.assertIn("trap final_aeolus_post_action EXIT", result)
+            self.assertTrue(cli.check(content=result))
+
+    def test_failing_parallel_step_stops_the_other_steps(self) -> None:
+        with TemporaryFileWithContent(WINDFILE_WITH_FAILING_PARALLEL_ACTION) as file:
+            metadata: PassMetadata = PassMetadata()
+            merger: Merger = Merger(
+                windfile=None,
+                input_settings=InputSettings(file=file, file_path=file.name, target=Target.cli),
+                output_settings=self.output_settings,
+                metadata=metadata,
+            )
+            windfile: Optional[WindFile] = merger.merge()
+            self.assertIsNotNone(windfile)
+            if windfile is None:
+                self.fail("Windfile is None")
+            cli: CliGenerator = CliGenerator(
+                input_settings=InputSettings(file=file, file_path=file.name, target=Target.cli),
+                output_settings=self.output_settings,
+                windfile=windfile,
+                metadata=metadata,
+            )
+            result: str = cli.generate()
+        with TemporaryFileWithContent(result) as script:
+            process: subprocess.CompletedProcess = subprocess.run(
+                ["bash", script.name],
+                env={**os.environ, "AEOLUS_PARALLELISM": "2"},
+                capture_output=True,
+                timeout=20,
+                check=False,
+            )
+        self.assertEqual(process.returncode, 3)
+        processes: str = subprocess.run(["ps", "-eo", "args"], capture_output=True, text=True, check=True).stdout
+        self.assertNotIn("sleep 31.4159", processes.splitlines())
 
     def test_generate_jenkinsfile_with_workdir(self) -> None:
         with TemporaryFileWithContent(WINDFILE_WITH_WORKDIR_ACTION) as file:
@@ -155,3 +224,85 @@ class GenerateTests(unittest.TestCase):
             result: str = jenkins.generate()
             self.assertIn("dir('/aeolus') {", result)
             self.assertTrue(result.count("dir('/aeolus') {") == 1)
+
+    def test_generate_jenkinsfile_with_parallel_stages(self) -> None:
+        with TemporaryFileWithContent(WINDFILE_WITH_REPOSITORIES_AND_NEEDS) as file:
+            metadata: PassMetadata = PassMetadata()
+            merger: Merger = Merger(
+                windfile=None,
+                input_settings=InputSettings(file=file, file_path=file.name),
+                output_settings=self.output_settings,
+                metadata=metadata,
+            )
+            windfile: Optional[WindFile] = merger.merge()
+            self.assertIsNotNone(windfile)
+            if windfile is None:
+                self.fail("Windfile is None")
+            jenkins: JenkinsGenerator = JenkinsGenerator(
+                input_settings=InputSettings(file=file, file_path=file.name),
+                output_settings=self.output_settings,
+                windfile=windfile,
+                metadata=metadata,
+            )
+            result: str = jenkins.generate()
+            # one block for the checkouts and one for test and lint
+            self.assertEqual(result.count("parallel {"), 2)
+            self.assertIn("stage('checkout') {", result)
+            self.assertIn("stage('test, lint') {", result)
+            self.assertTrue(result.index("stage('build') {") < result.index("stage('test, lint') {"))
+            self.assertTrue(result.count("{") == result.count("}"))
+
+    def test_generate_jenkinsfile_with_shallow_checkout(self) -> None:
+        with TemporaryFileWithContent(WINDFILE_WITH_SHALLOW_REPOSITORY) as file:
+            metadata: PassMetadata = PassMetadata()
+            merger: Merger = Merger(
+                windfile=None,
+                input_settings=InputSettings(file=file, file_path=file.name),
+                output_settings=self.output_settings,
+                metadata=metadata,
+            )
+            windfile: Optional[WindFile] = merger.merge()
+            self.assertIsNotNone(windfile)
+            if windfile is None:
+                self.fail("Windfile is None")
+            jenkins: JenkinsGenerator = JenkinsGenerator(
+                input_settings=InputSettings(file=file, file_path=file.name),
+                output_settings=self.output_settings,
+                windfile=windfile,
+                metadata=metadata,
+            )
+            result: str = jenkins.generate()
+            self.assertIn("depth: 1,", result)
+            self.assertIn("noTags: true", result)
+            self.assertIn("reference: '/var/cache/git/aeolus.git',", result)
+            self.assertIn("[path: 'cli'],", result)
+            self.assertIn("refspec: '+refs/heads/develop:refs/remotes/aeolus/develop',", result)
+            self.assertTrue(result.count("[") == result.count("]"))
+
+    def test_generate_jenkinsfile_with_shallow_tag_checkout(self) -> None:
+        windfile_content: str = WINDFILE_WITH_SHALLOW_REPOSITORY.replace("branch: develop", "branch: refs/tags/v1.0")
+        with TemporaryFileWithContent(windfile_content.replace("            noTags: true\n", "")) as file:
+            metadata: PassMetadata = PassMetadata()
+            merger: Merger = Merger(
+                windfile=None,
+                input_settings=InputSettings(file=file, file_path=file.name),
+                output_settings=self.output_settings,
+                metadata=metadata,
+            )
+            windfile: Optional[WindFile] = merger.merge()
+            self.assertIsNotNone(windfile)
+            if windfile is None:
+                self.fail("Windfile is None")
+            jenkins: JenkinsGenerator = JenkinsGenerator(
+                input_settings=InputSettings(file=file, file_path=file.name),
+                output_settings=self.output_settings,
+                windfile=windfile,
+                metadata=metadata,
+            )
+            result: str = jenkins.generate()
+            self.assertIn("depth: 1,", result)
+            self.assertNotIn("refspec", result)
+            self.assertNotIn("honorRefspec", result)
+            self.assertNotIn("noTags", result)
+            self.assertIn("reference: '/var/cache/git/aeolus.git'\n", result)
+            self.assertTrue(result.count("[") == result.count("]"))
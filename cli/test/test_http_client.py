@@ -0,0 +1,47 @@
+import time
+import unittest
+
+from cli_utils.http_client import CircuitBreaker, RateLimiter, get_rate_limiter
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_opens_after_threshold(self) -> None:
+        breaker: CircuitBreaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open())
+        self.assertFalse(breaker.allow())
+
+    def test_single_trial_after_timeout(self) -> None:
+        breaker: CircuitBreaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        # only one trial call until the outcome is known
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertFalse(breaker.is_open())
+        self.assertTrue(breaker.allow())
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_spaces_calls(self) -> None:
+        limiter: RateLimiter = RateLimiter(rate=20)
+        started: float = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        # the first call starts right away, the others wait 50ms each
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    def test_shared_limiter_uses_the_latest_rate(self) -> None:
+        first: RateLimiter = get_rate_limiter(server="http://rate-limited.example.com", rate=1)
+        second: RateLimiter = get_rate_limiter(server="http://rate-limited.example.com", rate=20)
+        self.assertIs(first, second)
+        self.assertEqual(second.rate, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import typing
+import unittest
+
+import jenkins  # type: ignore
+
+from classes.jenkins_client import JenkinsClient
+
+
+class FakeJenkins:
+    """
+    Records the calls of the client instead of talking to a Jenkins server.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: dict[str, str] = {}
+        self.folders: typing.Set[str] = set()
+        self.calls: typing.List[str] = []
+
+    def create_folder(self, folder_name: str, ignore_failures: bool = False) -> None:
+        self.calls.append(f"create_folder {folder_name} {ignore_failures}")
+        self.folders.add(folder_name)
+
+    def job_exists(self, name: str) -> bool:
+        self.calls.append(f"job_exists {name}")
+        return name in self.jobs
+
+    def get_job_config(self, name: str) -> str:
+        self.calls.append(f"get_job_config {name}")
+        return self.jobs[name]
+
+    def create_job(self, name: str, config_xml: str) -> None:
+        self.calls.append(f"create_job {name}")
+        if "/" in name and name.rsplit("/", 1)[0] not in self.folders:
+            raise jenkins.NotFoundException(f"folder of {name} does not exist")
+        self.jobs[name] = config_xml
+
+    def reconfig_job(self, name: str, config_xml: str) -> None:
+        self.calls.append(f"reconfig_job {name}")
+        self.jobs[name] = config_xml
+
+
+class JenkinsClientTests(unittest.TestCase):
+    def test_creates_nested_folders_once(self) -> None:
+        server: FakeJenkins = FakeJenkins()
+        client: JenkinsClient = JenkinsClient(server=server)
+        client.publish(job_name="course/exercise/plan", script="pipeline {}")
+        client.publish(job_name="course/exercise/other", script="pipeline {}")
+        folders: typing.List[str] = [call for call in server.calls if call.startswith("create_folder")]
+        self.assertEqual(folders, ["create_folder course True", "create_folder course/exercise True"])
+
+    def test_skips_unchanged_pipelines(self) -> None:
+        server: FakeJenkins = FakeJenkins()
+        client: JenkinsClient = JenkinsClient(server=server)
+        self.assertTrue(client.publish(job_name="plan", script="pipeline { a }"))
+        calls: int = len(server.calls)
+        self.assertFalse(client.publish(job_name="plan", script="pipeline { a }"))
+        self.assertEqual(len(server.calls), calls)
+        self.assertTrue(client.publish(job_name="plan", script="pipeline { b }"))
+        self.assertIn("reconfig_job plan", server.calls)
+        self.assertIn("pipeline { b }", server.jobs["plan"])
+
+    def test_compares_the_script_of_existing_jobs(self) -> None:
+        server: FakeJenkins = FakeJenkins()
+        JenkinsClient(server=server).publish(job_name="plan", script="pipeline { a }")
+        # a new client does not know the hash, but the script on the server is the same
+        client: JenkinsClient = JenkinsClient(server=server)
+        self.assertFalse(client.publish(job_name="plan", script="pipeline { a }"))
+        self.assertNotIn("reconfig_job plan", server.calls)
+
+    def test_checks_the_server_again_after_the_ttl(self) -> None:
+        server: FakeJenkins = FakeJenkins()
+        client: JenkinsClient = JenkinsClient(server=server, ttl=0)
+        client.publish(job_name="course/plan", script="pipeline { a }")
+        del server.jobs["course/plan"]
+        self.assertTrue(client.publish(job_name="course/plan", script="pipeline { a }"))
+        self.assertEqual(server.calls.count("create_job course/plan"), 2)
+        self.assertEqual(server.calls.count("create_folder course True"), 2)
+
+    def test_creates_deleted_folders_again(self) -> None:
+        server: FakeJenkins = FakeJenkins()
+        client: JenkinsClient = JenkinsClient(server=server)
+        client.publish(job_name="course/plan", script="pipeline { a }")
+        server.folders.clear()
+        with self.assertRaises(jenkins.JenkinsException):
+            client.publish(job_name="course/other", script="pipeline { a }")
+        self.assertTrue(client.publish(job_name="course/other", script="pipeline { a }"))
+        self.assertIn("course/other", server.jobs)
+
+
+if __name__ == "__main__":
+    unittest.main()
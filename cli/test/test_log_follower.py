@@ -0,0 +1,64 @@
+import unittest
+from typing import Any, Iterator, List
+from unittest import mock
+
+from classes.log_follower import LogFollower
+
+
+class FakeContainer:
+    chunks: List[bytes]
+
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+
+    def logs(self, **_: Any) -> Iterator[bytes]:
+        return iter(self.chunks)
+
+    def wait(self) -> dict[str, int]:
+        return {"StatusCode": 3}
+
+
+class LogFollowerTests(unittest.TestCase):
+    lines: List[str]
+    follower: LogFollower
+
+    def setUp(self) -> None:
+        self.lines = []
+        self.follower = LogFollower(sinks=[self.lines.append])
+
+    def test_lines_split_across_chunks(self) -> None:
+        encoded: bytes = "⚙️ executing build\nhello wörld\nlast".encode("utf-8")
+        # split inside the emoji and inside the umlaut
+        for start, end in [(0, 2), (2, 20), (20, 27), (27, len(encoded))]:
+            self.follower.feed(encoded[start:end])
+        self.assertEqual(self.lines, ["⚙️ executing build", "hello wörld"])
+        self.follower.flush()
+        self.assertEqual(self.lines, ["⚙️ executing build", "hello wörld", "last"])
+
+    def test_steps_are_timed(self) -> None:
+        container: FakeContainer = FakeContainer(
+            chunks=[b"setup\n", "⚙️ executing build\n".encode("utf-8"), "⚙️ executing test\nok\n".encode("utf-8")]
+        )
+        exit_code = self.follower.follow(container=container)
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(list(self.follower.timings.keys()), ["build", "test"])
+        self.assertEqual(self.lines[-1], "ok")
+
+    def test_parallel_steps_are_timed_by_their_end_markers(self) -> None:
+        lines: List[str] = [
+            "⚙️ executing build",
+            "⚙️ executing lint",
+            "⚙️ finished lint",
+            "building",
+            "⚙️ finished build",
+            "⚙️ executing report",
+        ]
+        # the clock is read for every marker and once more when flushing
+        with mock.patch("classes.log_follower.time.monotonic", side_effect=[0.0, 1.0, 2.0, 5.0, 6.0, 8.0]):
+            self.follower.feed(("\n".join(lines) + "\n").encode("utf-8"))
+            self.follower.flush()
+        self.assertEqual(self.follower.timings, {"lint": 1.0, "build": 5.0, "report": 2.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
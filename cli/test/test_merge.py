@@ -1,7 +1,7 @@
 import logging
 import os
 import unittest
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 from typing import Optional
 
 from test.actionfile_definitions import VALID_ACTIONFILE_WITH_TWO_ACTIONS
@@ -15,6 +15,7 @@ from classes.generated.definitions import FileAction, PlatformAction, TemplateAc
 from classes.generated.windfile import WindFile
 from classes.input_settings import InputSettings
 from classes.merger import Merger
+from classes.validator import read_windfile
 from classes.pass_metadata import PassMetadata
 from classes.output_settings import OutputSettings
 from cli_utils.utils import TemporaryFileWithContent
@@ -167,6 +168,28 @@ class MergeTests(unittest.TestCase):
                     self.fail("Action is not an instance of ScriptAction, but should be")
         os.unlink(bash_file.name)
 
+    def test_merge_in_memory_windfile_with_relative_file_action(self) -> None:
+        with TemporaryDirectory() as base_directory:
+            with open(os.path.join(base_directory, "action.sh"), "w", encoding="utf-8") as bash_file:
+                bash_file.write("echo in memory")
+            with TemporaryFileWithContent(
+                content=VALID_WINDFILE_WITH_FILEACTION.replace("[FILE_ACTION_FILE]", "action.sh")
+            ) as windfile_file:
+                parsed: Optional[WindFile] = read_windfile(file=windfile_file, output_settings=self.output_settings)
+            merger: Merger = Merger(
+                windfile=None,
+                input_settings=InputSettings(file_path="windfile.yaml", windfile=parsed, base_directory=base_directory),
+                output_settings=self.output_settings,
+                metadata=PassMetadata(),
+            )
+            windfile: Optional[WindFile] = merger.merge()
+        if windfile is None:
+            self.fail("Windfile is None")
+        action: FileAction | ScriptAction | PlatformAction | TemplateAction = windfile.actions[0].root
+        if not isinstance(action, ScriptAction):
+            self.fail("Action is not an instance of ScriptAction, but should be")
+        self.assertEqual(action.script, "echo in memory")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import typing
+import unittest
+from typing import Optional
+from unittest import mock
+
+from test.bamboo_definitions import BAMBOO_SPECS
+
+from classes.bamboo_client import BambooClient
+from classes.ci_credentials import CICredentials
+from classes.generated.windfile import WindFile
+from classes.input_settings import InputSettings
+from classes.output_settings import OutputSettings
+from classes.translation_cache import TranslationCache
+from classes.translation_field import TranslationField
+from classes.translator import BambooTranslator, windfile_to_yaml
+
+
+class TranslationCacheTests(unittest.TestCase):
+    cache_directory: tempfile.TemporaryDirectory
+
+    def setUp(self) -> None:
+        self.cache_directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.code: str = BAMBOO_SPECS
+        credentials: CICredentials = CICredentials(url="http://localhost:1", username=None, token="token")
+        client: BambooClient = BambooClient(credentials=credentials)
+        client.get_plan_code = mock.Mock(side_effect=lambda plan_key: self.code)  # type: ignore
+        self.translator: BambooTranslator = BambooTranslator(
+            input_settings=InputSettings(file_path="none"),
+            output_settings=OutputSettings(),
+            credentials=credentials,
+            client=client,
+        )
+        self.translator.cache = TranslationCache(directory=self.cache_directory.name)
+        self.conversions: typing.List[str] = []
+        convert = self.translator.convert
+
+        def counting_convert(plan_key: str, specs: typing.Any, fields: typing.Any = None) -> WindFile:
+            self.conversions.append(plan_key)
+            return convert(plan_key=plan_key, specs=specs, fields=fields)
+
+        self.translator.convert = counting_convert  # type: ignore
+
+    def tearDown(self) -> None:
+        self.cache_directory.cleanup()
+
+    def test_reuses_translation_of_unchanged_specs(self) -> None:
+        first: Optional[WindFile] = self.translator.to_windfile(plan_key="COURSE-EXERCISE")
+        second: Optional[WindFile] = self.translator.to_windfile(plan_key="COURSE-EXERCISE")
+        assert first is not None and second is not None
+        self.assertEqual(self.conversions, ["COURSE-EXERCISE"])
+        self.assertEqual(windfile_to_yaml(windfile=first), windfile_to_yaml(windfile=second))
+
+    def test_translates_changed_specs_again(self) -> None:
+        self.translator.to_windfile(plan_key="COURSE-EXERCISE")
+        self.code = BAMBOO_SPECS.replace("./gradlew clean test", "./gradlew test")
+        windfile: Optional[WindFile] = self.translator.to_windfile(plan_key="COURSE-EXERCISE")
+        assert windfile is not None
+        self.assertEqual(self.conversions, ["COURSE-EXERCISE", "COURSE-EXERCISE"])
+        self.assertIn("./gradlew test", windfile_to_yaml(windfile=windfile))
+
+    def test_translates_selected_fields(self) -> None:
+        windfile: Optional[WindFile] = self.translator.to_windfile(
+            plan_key="COURSE-EXERCISE", fields={TranslationField.METADATA}
+        )
+        assert windfile is not None
+        self.assertEqual(windfile.metadata.name, "Exercise")
+        self.assertEqual(windfile.actions, [])
+        self.assertIsNone(windfile.repositories)
+        assert self.translator.cache is not None
+        self.assertIsNone(self.translator.cache.latest(plan_key="COURSE-EXERCISE"))
+        self.translator.to_windfile(plan_key="COURSE-EXERCISE")
+        windfile = self.translator.to_windfile(plan_key="COURSE-EXERCISE", fields={TranslationField.REPOSITORIES})
+        assert windfile is not None
+        self.assertEqual(windfile.actions, [])
+        self.assertIsNotNone(windfile.repositories)
+        self.assertEqual(len(self.conversions), 2)
+
+    def test_replays_without_fetching(self) -> None:
+        self.translator.to_windfile(plan_key="COURSE-EXERCISE")
+        self.translator.replay = True
+        self.code = "not reachable"
+        windfile: Optional[WindFile] = self.translator.to_windfile(plan_key="COURSE-EXERCISE")
+        assert windfile is not None
+        self.assertEqual(windfile.metadata.name, "Exercise")
+        self.assertIsNone(self.translator.to_windfile(plan_key="COURSE-OTHER"))
+        self.assertEqual(self.translator.client.get_plan_code.call_count, 1)  # type: ignore
+
+    def test_rejects_plan_keys_outside_the_cache(self) -> None:
+        cache: TranslationCache = TranslationCache(directory=os.path.join(self.cache_directory.name, "cache"))
+        victim: str = os.path.join(self.cache_directory.name, "victim.json")
+        with open(victim, "w", encoding="utf-8") as file:
+            file.write("{}")
+        windfile: Optional[WindFile] = self.translator.to_windfile(plan_key="COURSE-EXERCISE")
+        assert windfile is not None
+        for plan_key in ["..", "../COURSE-EXERCISE", "course-exercise"]:
+            with self.assertRaises(ValueError):
+                cache.put(plan_key=plan_key, code=self.code, windfile=windfile)
+        self.assertTrue(os.path.exists(victim))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,8 +15,8 @@ from classes.generated.windfile import WindFile
 from classes.input_settings import InputSettings
 from classes.pass_metadata import PassMetadata
 from classes.output_settings import OutputSettings
-from classes.validator import Validator, read_action_file
-from cli_utils.utils import TemporaryFileWithContent
+from classes.validator import Validator, read_action_file, ActionFileCache
+from cli_utils.utils import TemporaryFileWithContent, validate_content
 
 
 class ValidateTests(unittest.TestCase):
@@ -67,6 +67,42 @@ class ValidateTests(unittest.TestCase):
             action_file: Optional[ActionFile] = read_action_file(file=file, output_settings=self.output_settings)
             self.assertIsNone(action_file)
 
+    def test_cached_actionfile_is_not_modified_by_callers(self) -> None:
+        cache: ActionFileCache = ActionFileCache(max_entries=1)
+        with TemporaryFileWithContent(content=VALID_ACTIONFILE_WITH_TWO_ACTIONS) as file:
+            first: Optional[ActionFile] = cache.read(path=file.name, output_settings=self.output_settings)
+            if first is None:
+                self.fail("Actionfile is None")
+            first.steps.pop()
+            second: Optional[ActionFile] = cache.read(path=file.name, output_settings=self.output_settings)
+            if second is None:
+                self.fail("Actionfile is None")
+            self.assertEqual(len(second.steps), 2)
+            self.assertIsNot(first, second)
+
+    def test_changed_actionfile_is_read_again(self) -> None:
+        cache: ActionFileCache = ActionFileCache(max_entries=1)
+        with TemporaryFileWithContent(content=VALID_ACTIONFILE_WITH_TWO_ACTIONS) as file:
+            first: Optional[ActionFile] = cache.read(path=file.name, output_settings=self.output_settings)
+            self.assertIsNotNone(first)
+            file.seek(0)
+            file.truncate()
+            file.write(INVALID_ACTIONFILE_WITH_ONE_ACTION)
+            file.flush()
+            second: Optional[ActionFile] = cache.read(path=file.name, output_settings=self.output_settings)
+            self.assertIsNone(second)
+
+    def test_validate_json_and_yaml_flow_content(self) -> None:
+        as_json: str = (
+            '{"api": "v0.0.1", "metadata": {"name": "json", "description": "json windfile"},'
+            ' "actions": [{"name": "hello", "script": "echo hello"}]}'
+        )
+        # YAML flow mappings look like JSON but need the YAML parser
+        as_flow: str = as_json.replace('"', "")
+        for content in [as_json, as_flow]:
+            windfile: WindFile = validate_content(filetype=WindFile, content=content)
+            self.assertEqual(windfile.metadata.name, "json")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,91 @@
+import functools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from typing import Any, List, Optional
+
+from generators.bamboo import JavaWorker, WorkerPool
+
+# speaks the protocol of the bamboo-generator worker mode, "crash" exits the worker after counting the request
+FAKE_WORKER: str = """
+import json, os, sys
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["windfile"] == "crash":
+        with open(request.get("url", os.devnull), "a") as requests:
+            requests.write(line)
+        sys.exit(1)
+    print(json.dumps({"id": request["id"], "result": request["windfile"], "key": str(os.getpid())}), flush=True)
+"""
+
+
+class WorkerPoolTests(unittest.TestCase):
+    pool: WorkerPool
+
+    def setUp(self) -> None:
+        command: List[str] = [sys.executable, "-c", FAKE_WORKER]
+        self.pool = WorkerPool(start_worker=functools.partial(JavaWorker, command=command), size=1, timeout=10)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def test_worker_is_reused(self) -> None:
+        first: dict[str, Any] = self.pool.generate(request={"windfile": "first"})
+        second: dict[str, Any] = self.pool.generate(request={"windfile": "second"})
+        self.assertEqual(first["result"], "first")
+        self.assertEqual(second["result"], "second")
+        self.assertEqual(first["key"], second["key"])
+
+    def test_crashed_worker_is_replaced(self) -> None:
+        first: dict[str, Any] = self.pool.generate(request={"windfile": "first"})
+        with self.assertRaises(ValueError):
+            self.pool.generate(request={"windfile": "crash"})
+        second: dict[str, Any] = self.pool.generate(request={"windfile": "second"})
+        self.assertEqual(second["result"], "second")
+        self.assertNotEqual(first["key"], second["key"])
+
+    def test_requests_with_credentials_are_not_retried(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            received: str = os.path.join(directory, "received")
+            with self.assertRaises(ValueError):
+                self.pool.generate(request={"windfile": "crash", "url": received, "token": "token"})
+            with open(received, "r", encoding="utf-8") as file:
+                self.assertEqual(len(file.readlines()), 1)
+            with self.assertRaises(ValueError):
+                self.pool.generate(request={"windfile": "crash", "url": received})
+            with open(received, "r", encoding="utf-8") as file:
+                self.assertEqual(len(file.readlines()), 3)
+
+
+# path of a built bamboo-generator jar, e.g. bamboo-generator/build/libs/bamboo-generator-0.0.1-all.jar
+GENERATOR_JAR: Optional[str] = os.getenv("BAMBOO_GENERATOR_JAR")
+
+
+@unittest.skipUnless(GENERATOR_JAR and shutil.which("java"), "needs java and BAMBOO_GENERATOR_JAR")
+class JavaWorkerTests(unittest.TestCase):
+    def test_generates_with_a_real_jvm(self) -> None:
+        pool: WorkerPool = WorkerPool(
+            start_worker=functools.partial(JavaWorker, command=["java", "-jar", str(GENERATOR_JAR), "--worker"]),
+            size=1,
+            timeout=120,
+        )
+        windfile: dict[str, Any] = {
+            "api": "v0.0.1",
+            "metadata": {"name": "example", "id": "EXAMPLE-PLAN", "description": "example", "author": "aeolus"},
+            "actions": [{"name": "hello", "script": "echo hello"}],
+        }
+        try:
+            first: dict[str, Any] = pool.generate(request={"windfile": json.dumps(windfile)})
+            second: dict[str, Any] = pool.generate(request={"windfile": "not a windfile"})
+        finally:
+            pool.close()
+        self.assertNotIn("error", first)
+        self.assertIn("echo hello", first["result"])
+        self.assertIn("error", second)
+
+
+if __name__ == "__main__":
+    unittest.main()
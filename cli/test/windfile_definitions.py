@@ -176,3 +176,94 @@ WINDFILE_WITH_WORKDIR_ACTION: str = """
             script: echo "This is an internal action"
             runAlways: true
         """
+
+WINDFILE_WITH_NEEDS: str = """
+        api: v0.0.1
+        metadata:
+          name: test windfile
+          description: This is a windfile with independent actions
+          author: Test Author
+        actions:
+          - name: build
+            script: echo "build"
+          - name: lint
+            script: echo "lint"
+            needs: []
+          - name: test
+            script: echo "test"
+            needs:
+              - build
+          - name: docs
+            script: echo "docs"
+            needs:
+              - build
+          - name: report
+            script: echo "report"
+          - name: always-action
+            script: echo "This is an internal action"
+            runAlways: true
+        """
+
+WINDFILE_WITH_FAILING_PARALLEL_ACTION: str = """
+        api: v0.0.1
+        metadata:
+          name: test windfile
+          description: This is a windfile with a failing action next to a long running one
+          author: Test Author
+        actions:
+          - name: slow
+            script: sleep 31.4159
+          - name: failing
+            script: sleep 0.5; exit 3
+            needs: []
+        """
+
+WINDFILE_WITH_REPOSITORIES_AND_NEEDS: str = """
+        api: v0.0.1
+        metadata:
+          name: test windfile
+          description: This is a windfile with multiple repositories and independent actions
+          author: Test Author
+        repositories:
+          tests:
+            url: https://github.com/ls1intum/Aeolus.git
+            branch: develop
+            path: tests
+          assignment:
+            url: https://github.com/ls1intum/Aeolus.git
+            branch: develop
+            path: assignment
+        actions:
+          - name: build
+            script: echo "build"
+          - name: test
+            script: echo "test"
+            needs:
+              - build
+          - name: lint
+            script: echo "lint"
+            needs:
+              - build
+        """
+
+WINDFILE_WITH_SHALLOW_REPOSITORY: str = """
+        api: v0.0.1
+        metadata:
+          name: test windfile
+          description: This is a windfile with a shallow checkout
+          author: Test Author
+        repositories:
+          aeolus:
+            url: https://github.com/ls1intum/Aeolus.git
+            branch: develop
+            path: aeolus
+            depth: 1
+            noTags: true
+            reference: /var/cache/git/aeolus.git
+            sparseCheckout:
+              - cli
+              - schemas
+        actions:
+          - name: internal-action
+            script: echo "This is an internal action"
+        """